@@ -0,0 +1,47 @@
+import time
+from collections import deque
+from datetime import datetime
+from pathlib import Path
+
+REPORTS_DIR = Path(__file__).parent / "reports"
+
+
+# Keeps only the last `max_lines` messages on screen and spills everything to a
+# file under app/reports, so each UI refresh costs the same however long the run.
+class ActivityLog:
+    def __init__(self, max_lines=200, refresh_interval=0.25, spill_dir=REPORTS_DIR):
+        self.lines = deque(maxlen=max_lines)
+        self.refresh_interval = refresh_interval
+        self.total_lines = 0
+        self._last_refresh = 0.0
+        self._dirty = False
+
+        spill_dir = Path(spill_dir)
+        spill_dir.mkdir(parents=True, exist_ok=True)
+        self.spill_path = spill_dir / f"agent_activity_{datetime.now():%Y%m%d_%H%M%S_%f}.log"
+        self._spill = self.spill_path.open("w", encoding="utf-8")
+
+    def append(self, line):
+        self.lines.append(line)
+        self.total_lines += 1
+        self._dirty = True
+        self._spill.write(line + "\n")
+
+    def render(self):
+        hidden = self.total_lines - len(self.lines)
+        visible = "\n\n".join(self.lines)
+        if hidden > 0:
+            return f"_… {hidden} earlier entries in `{self.spill_path.name}`_\n\n{visible}"
+        return visible
+
+    def should_refresh(self, force=False):
+        now = time.monotonic()
+        if not self._dirty or (not force and now - self._last_refresh < self.refresh_interval):
+            return False
+        self._last_refresh = now
+        self._dirty = False
+        return True
+
+    def close(self):
+        if not self._spill.closed:
+            self._spill.close()
@@ -0,0 +1,66 @@
+# Providers/sec of the async validation pipeline at different per-source
+# concurrency limits, using the stub sources with simulated latency. With
+# --scheduled the sources go through the LookupScheduler (coalescing, batching,
+# and pacing for sources that declare a rate limit; the stubs declare none, and
+# --rate-limit gives every stub one) and the effective calls per provider are
+# reported too.
+#
+#   cd app && python -m benchmarks.pipeline_throughput --providers 2000 [--scheduled]
+import argparse
+import asyncio
+import time
+
+from lookup_scheduler import LookupScheduler, default_limits
+from pipeline import run_pipeline
+from sources import default_sources, scheduled_sources
+
+COLUMNS = ["provider_id", "first_name", "last_name", "specialty", "phone", "email",
+           "address", "city", "state", "zip", "npi_number", "license_number"]
+
+
+def make_records(count):
+    return [{col: f"{col}-{index}" for col in COLUMNS} for index in range(count)]
+
+
+async def measure(records, concurrency, latency, scheduled, rate_limit=None):
+    sources = default_sources(latency=latency, concurrency=concurrency, seed=7)
+    for source in sources:
+        source.rate_limit = rate_limit
+    scheduler = None
+    if scheduled:
+        scheduler = LookupScheduler(default_limits(sources))
+        sources = scheduled_sources(sources, scheduler)
+    started = time.perf_counter()
+    count = 0
+    async for _ in run_pipeline(records, sources):
+        count += 1
+    rate = count / (time.perf_counter() - started)
+    if scheduler is None:
+        calls = sum(1 for record in records for source in sources if any(source.handles(col) for col in record))
+        return rate, {"calls_per_provider": calls / count, "avg_queue_ms": 0.0}
+    return rate, scheduler.summary(count)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--providers", type=int, default=2000)
+    parser.add_argument("--levels", default="1,4,16,64,256")
+    parser.add_argument("--min-latency", type=float, default=0.02)
+    parser.add_argument("--max-latency", type=float, default=0.08)
+    parser.add_argument("--scheduled", action="store_true")
+    parser.add_argument("--rate-limit", type=float, nargs=2, metavar=("PER_SECOND", "BURST"))
+    args = parser.parse_args()
+
+    records = make_records(args.providers)
+    latency = (args.min_latency, args.max_latency)
+    print(f"{args.providers} providers, {len(COLUMNS)} columns, source latency {latency[0]*1000:.0f}-{latency[1]*1000:.0f}ms")
+    for level in (int(value) for value in args.levels.split(",")):
+        rate, calls = asyncio.run(measure(records, level, latency, args.scheduled, args.rate_limit))
+        print(
+            f"per-source concurrency {level:>4}: {rate:9.1f} providers/sec, "
+            f"{calls['calls_per_provider']:.2f} calls/provider, queueing {calls['avg_queue_ms']:.1f}ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,49 @@
+import numpy as np
+import pandas as pd
+
+MISSING_MARKERS = ["", "N/A"]
+
+
+def _as_text(frame):
+    # str(value) for every cell; pandas' string dtype keeps NaN missing through
+    # astype(str), so spell it out the way str(nan) does.
+    return frame.astype(str).fillna("nan")
+
+
+def change_mask(before, after):
+    # Same comparison the per-cell loop used (str(before) != str(after)), done
+    # column-wise on the aligned frames.
+    return pd.DataFrame(
+        _as_text(before).to_numpy() != _as_text(after).to_numpy(),
+        index=before.index,
+        columns=before.columns,
+    )
+
+
+def compute_quality_metrics(before, mask):
+    changed = mask.to_numpy()
+    stripped = _as_text(before).apply(lambda col: col.str.strip()).to_numpy()
+    was_missing = before.isna().to_numpy() | np.isin(stripped, MISSING_MARKERS)
+
+    filled = changed & was_missing
+    corrected = changed & ~was_missing
+    names = before.columns.str.lower()
+    phone = names.str.contains("phone", regex=False)
+    address = names.str.contains("address", regex=False) & ~phone
+    other = ~(phone | address)
+
+    return {
+        "phone_corrected": int(corrected[:, phone].sum()),
+        "address_updated": int(corrected[:, address].sum()),
+        "missing_filled": int(filled.sum()),
+        "other_updates": int(corrected[:, other].sum()),
+    }
+
+
+def updated_directory(before, after, mask):
+    # Unchanged cells keep their original values (and column dtypes).
+    return before.mask(mask, after)
+
+
+def directory_csv(before, after, mask):
+    return updated_directory(before, after, mask).to_csv(index=False).encode("utf-8")
@@ -0,0 +1,242 @@
+import asyncio
+import concurrent.futures
+import json
+import sqlite3
+import threading
+import time
+from collections import defaultdict
+from pathlib import Path
+
+DATA_DIR = Path(__file__).parent / "data"
+
+HOUR = 3600
+DAY = 24 * HOUR
+
+# How long a lookup stays fresh, per source. Registry data changes slowly;
+# websites and license status less so.
+DEFAULT_TTLS = {
+    "NPI Registry": 7 * DAY,
+    "State License Board": DAY,
+    "Google Maps": 30 * DAY,
+    "Provider Website": DAY,
+    "Payer Records": DAY,
+}
+DEFAULT_TTL = DAY
+NEGATIVE_TTL = HOUR
+STALE_WINDOW = DAY
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS lookups (
+    source TEXT NOT NULL,
+    key TEXT NOT NULL,
+    found INTEGER NOT NULL,
+    value TEXT,
+    fetched_at REAL NOT NULL,
+    fresh_until REAL NOT NULL,
+    stale_until REAL NOT NULL,
+    PRIMARY KEY (source, key)
+)
+"""
+
+COUNTERS = ("hits", "negative_hits", "stale_hits", "misses", "fetches", "fetched_keys", "errors")
+
+
+# SQLite-backed cache of external lookups, shared by every run and every owner.
+# `fetch_many(keys)` returns {key: value}; keys it leaves out (or maps to None)
+# are not-found and cached for the shorter negative TTL. Found entries past
+# their TTL but inside the stale window are served as-is while a background
+# refresh runs. Refreshes run on the cache's own long-lived event loop thread,
+# not on the caller's loop, so they finish even after the run that triggered
+# them has returned and its loop is closed.
+class LookupCache:
+    def __init__(self, path=DATA_DIR / "lookup_cache.sqlite3", ttls=None, default_ttl=DEFAULT_TTL,
+                 negative_ttl=NEGATIVE_TTL, stale_window=STALE_WINDOW, clock=time.time):
+        self.ttls = DEFAULT_TTLS if ttls is None else ttls
+        self.default_ttl = default_ttl
+        self.negative_ttl = negative_ttl
+        self.stale_window = stale_window
+        self.clock = clock
+        # Counters and `_refreshing` are shared with the refresh thread; both
+        # are only touched under `_lock`.
+        self.counters = defaultdict(lambda: dict.fromkeys(COUNTERS, 0))
+        self._refreshing = {}
+        self._lock = threading.Lock()
+        self._loop = None
+        self._loop_thread = None
+
+        if path != ":memory:":
+            Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(SCHEMA)
+        self.purge()
+
+    def ttl_for(self, source):
+        return self.ttls.get(source, self.default_ttl)
+
+    def _count(self, source, **increments):
+        with self._lock:
+            counters = self.counters[source]
+            for name, amount in increments.items():
+                counters[name] += amount
+
+    def _refresh_loop(self):
+        with self._lock:
+            if self._loop is None:
+                self._loop = asyncio.new_event_loop()
+                self._loop_thread = threading.Thread(
+                    target=self._loop.run_forever, name="lookup-cache-refresh", daemon=True
+                )
+                self._loop_thread.start()
+            return self._loop
+
+    def _read(self, source, keys):
+        entries = {}
+        with self._lock:
+            for start in range(0, len(keys), 500):
+                chunk = keys[start:start + 500]
+                rows = self._conn.execute(
+                    f"SELECT key, found, value, fresh_until, stale_until FROM lookups "
+                    f"WHERE source = ? AND key IN ({','.join('?' * len(chunk))})",
+                    (source, *chunk),
+                )
+                for key, found, value, fresh_until, stale_until in rows:
+                    entries[key] = (json.loads(value) if found else None, fresh_until, stale_until)
+        return entries
+
+    def _write(self, source, results):
+        now = self.clock()
+        rows = []
+        for key, value in results.items():
+            # Not-found entries are never served stale: a newly registered
+            # provider should show up as soon as the negative TTL lapses.
+            if value is None:
+                fresh_until = stale_until = now + self.negative_ttl
+            else:
+                fresh_until = now + self.ttl_for(source)
+                stale_until = fresh_until + self.stale_window
+            rows.append((source, key, int(value is not None), json.dumps(value), now, fresh_until, stale_until))
+        with self._lock:
+            self._conn.execute("BEGIN")
+            self._conn.executemany("INSERT OR REPLACE INTO lookups VALUES (?, ?, ?, ?, ?, ?, ?)", rows)
+            self._conn.execute("COMMIT")
+
+    async def _fetch(self, source, keys, fetch_many):
+        self._count(source, fetches=1, fetched_keys=len(keys))
+        try:
+            found = await fetch_many(keys)
+        except Exception:
+            self._count(source, errors=1)
+            raise
+        results = {key: found.get(key) for key in keys}
+        self._write(source, results)
+        return results
+
+    async def _refresh(self, source, keys, fetch_many):
+        try:
+            await self._fetch(source, keys, fetch_many)
+        except Exception:
+            pass  # the stale entries stay until the next successful refresh
+        finally:
+            with self._lock:
+                for key in keys:
+                    self._refreshing.pop((source, key), None)
+
+    async def get_many(self, source, keys, fetch_many, refresh_many=None):
+        # `refresh_many` (default `fetch_many`) is what background refreshes
+        # call; it runs on the cache's refresh loop, so it must not be tied to
+        # the caller's event loop.
+        keys = list(dict.fromkeys(keys))
+        now = self.clock()
+        results = {}
+        missing = []
+        stale = []
+        hits = {"hits": 0, "negative_hits": 0, "stale_hits": 0}
+        entries = self._read(source, keys)
+        for key in keys:
+            entry = entries.get(key)
+            if entry is None:
+                missing.append(key)
+                continue
+            value, fresh_until, stale_until = entry
+            if now < fresh_until:
+                hits["negative_hits" if value is None else "hits"] += 1
+            elif now < stale_until:
+                hits["stale_hits"] += 1
+                stale.append(key)
+            else:
+                missing.append(key)
+                continue
+            results[key] = value
+        self._count(source, misses=len(missing), **hits)
+
+        if missing:
+            results.update(await self._fetch(source, missing, fetch_many))
+
+        if stale:
+            self._start_refresh(source, stale, refresh_many or fetch_many)
+        return results
+
+    def _start_refresh(self, source, keys, fetch_many):
+        loop = self._refresh_loop()
+        with self._lock:
+            keys = [key for key in keys if (source, key) not in self._refreshing]
+            if not keys:
+                return
+            future = concurrent.futures.Future()
+            for key in keys:
+                self._refreshing[(source, key)] = future
+        # Registered before it is scheduled, so the refresh's own cleanup
+        # cannot run ahead of the registration.
+        scheduled = asyncio.run_coroutine_threadsafe(self._refresh(source, keys, fetch_many), loop)
+        scheduled.add_done_callback(lambda done: future.set_result(None))
+
+    def wait_for_refreshes(self, timeout=None):
+        with self._lock:
+            pending = set(self._refreshing.values())
+        concurrent.futures.wait(pending, timeout=timeout)
+
+    async def get(self, source, key, fetch):
+        async def fetch_many(keys):
+            return {key: await fetch(key)}
+
+        return (await self.get_many(source, [key], fetch_many))[key]
+
+    def stats(self, since=None):
+        # Per-source counters and hit rate; pass an earlier snapshot as `since`
+        # to get the numbers for just the lookups made after it.
+        with self._lock:
+            snapshot = {source: dict(counters) for source, counters in self.counters.items()}
+        report = {}
+        for source, counters in snapshot.items():
+            if since and source in since:
+                counters = {name: counters[name] - since[source][name] for name in COUNTERS}
+            lookups = counters["hits"] + counters["negative_hits"] + counters["stale_hits"] + counters["misses"]
+            served = lookups - counters["misses"]
+            report[source] = {**counters, "lookups": lookups, "hit_rate": served / lookups if lookups else 0.0}
+        return report
+
+    @staticmethod
+    def hit_rate(stats):
+        lookups = sum(entry["lookups"] for entry in stats.values())
+        served = sum(entry["lookups"] - entry["misses"] for entry in stats.values())
+        return served / lookups if lookups else 0.0
+
+    def reset_stats(self):
+        with self._lock:
+            self.counters.clear()
+
+    def purge(self):
+        with self._lock:
+            self._conn.execute("DELETE FROM lookups WHERE stale_until < ?", (self.clock(),))
+
+    def close(self):
+        with self._lock:
+            loop, thread = self._loop, self._loop_thread
+            self._loop = self._loop_thread = None
+        if loop is not None:
+            loop.call_soon_threadsafe(loop.stop)
+            thread.join()
+            loop.close()
+        self._conn.close()
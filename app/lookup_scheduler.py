@@ -0,0 +1,205 @@
+import asyncio
+import random
+import threading
+import time
+from collections import defaultdict
+
+from sources import SourceUnavailable, lookup_key
+
+COUNTERS = ("requests", "coalesced", "calls", "dispatched", "retries", "failures", "queue_seconds",
+            "max_queue_seconds", "throttle_seconds")
+
+
+# Thread-safe token bucket. Tokens are reserved under a lock and the caller
+# sleeps off any deficit on its own event loop, so one bucket can pace every
+# run in the process even though each run has its own loop.
+class TokenBucket:
+    def __init__(self, rate, burst=1, clock=time.monotonic):
+        self.rate = rate
+        self.burst = burst
+        self.clock = clock
+        self._tokens = float(burst)
+        self._updated = clock()
+        self._lock = threading.Lock()
+
+    def reserve(self):
+        with self._lock:
+            now = self.clock()
+            self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= 1
+            return max(0.0, -self._tokens / self.rate)
+
+    async def acquire(self):
+        wait = self.reserve()
+        if wait:
+            await asyncio.sleep(wait)
+        return wait
+
+
+# One bucket per source that declares its API's rate limit. Sources without
+# one (the local stubs, or an API with no published limit) are not throttled.
+def default_limits(sources):
+    return {source.name: TokenBucket(*source.rate_limit) for source in sources if source.rate_limit}
+
+
+# Sits between the pipeline and the sources. Concurrent lookups of the same
+# (source, column, value) share one future; sources with a bulk endpoint get
+# lookups packed into batches of up to `batch_size`, flushed when full or after
+# `batch_window` seconds; every call takes a token from the source's bucket and
+# is retried with exponential backoff on SourceUnavailable.
+#
+# A scheduler belongs to one event loop (one validation run); token buckets
+# can be shared between schedulers.
+class LookupScheduler:
+    def __init__(self, limits=None, batch_window=0.01, max_retries=3, backoff=0.1, max_backoff=5.0,
+                 clock=time.monotonic):
+        self.limits = limits or {}
+        self.batch_window = batch_window
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.clock = clock
+        self.counters = defaultdict(lambda: dict.fromkeys(COUNTERS, 0))
+        self._inflight = {}
+        self._pending = defaultdict(list)
+        self._timers = {}
+        self._slots = {}
+        self._tasks = set()
+
+    async def lookup(self, source, record, columns):
+        loop = asyncio.get_running_loop()
+        counters = self.counters[source.name]
+        counters["requests"] += len(columns)
+        futures = {}
+        new = []
+        for col in columns:
+            key = (source.name, lookup_key(col, record.get(col)))
+            future = self._inflight.get(key)
+            if future is None:
+                future = self._inflight[key] = loop.create_future()
+                new.append((key, record, col, future, self.clock()))
+            else:
+                counters["coalesced"] += 1
+            futures[col] = future
+
+        if new and source.batch_size > 1:
+            pending = self._pending[source.name]
+            pending.extend(new)
+            if len(pending) >= source.batch_size:
+                self._flush(source)
+            elif source.name not in self._timers:
+                self._timers[source.name] = loop.call_later(self.batch_window, self._flush, source)
+        elif new:
+            self._spawn(source, new)
+
+        checks = await asyncio.gather(*futures.values())
+        return dict(zip(futures, checks))
+
+    def _flush(self, source):
+        timer = self._timers.pop(source.name, None)
+        if timer is not None:
+            timer.cancel()
+        pending = self._pending.pop(source.name, [])
+        for start in range(0, len(pending), source.batch_size):
+            self._spawn(source, pending[start:start + source.batch_size])
+
+    def _spawn(self, source, items):
+        task = asyncio.ensure_future(self._dispatch(source, items))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _call(self, source, items):
+        requests = {}
+        for _, record, col, _, _ in items:
+            requests.setdefault(id(record), (record, []))[1].append(col)
+        requests = list(requests.values())
+        if source.batch_size > 1:
+            results = await source.verify_batch(requests)
+        else:
+            results = [await source.verify(record, columns) for record, columns in requests]
+        return {
+            (id(record), col): check
+            for (record, _), checks in zip(requests, results)
+            for col, check in checks.items()
+        }
+
+    async def _dispatch(self, source, items):
+        counters = self.counters[source.name]
+        bucket = self.limits.get(source.name)
+        slots = self._slots.setdefault(source.name, asyncio.Semaphore(source.concurrency))
+        try:
+            async with slots:
+                for attempt in range(self.max_retries + 1):
+                    if bucket is not None:
+                        counters["throttle_seconds"] += await bucket.acquire()
+                    if attempt == 0:
+                        started = self.clock()
+                        for *_, submitted in items:
+                            waited = started - submitted
+                            counters["queue_seconds"] += waited
+                            counters["max_queue_seconds"] = max(counters["max_queue_seconds"], waited)
+                        counters["dispatched"] += len(items)
+                    counters["calls"] += 1
+                    try:
+                        checks = await self._call(source, items)
+                        break
+                    except SourceUnavailable as exc:
+                        if attempt == self.max_retries:
+                            raise
+                        counters["retries"] += 1
+                        delay = exc.retry_after
+                        if delay is None:
+                            delay = min(self.max_backoff, self.backoff * 2 ** attempt) * random.uniform(0.5, 1.0)
+                        await asyncio.sleep(delay)
+        except Exception as exc:
+            counters["failures"] += 1
+            for _, _, _, future, _ in items:
+                if not future.done():
+                    future.set_exception(exc)
+        else:
+            # A source that leaves a column out of its answer fails just that
+            # lookup; every future must be resolved or its callers wait forever.
+            missing = 0
+            for _, record, col, future, _ in items:
+                if future.done():
+                    continue
+                check = checks.get((id(record), col))
+                if check is None:
+                    missing += 1
+                    future.set_exception(LookupError(f"{source.name} returned no check for {col!r}"))
+                else:
+                    future.set_result(check)
+            if missing:
+                counters["failures"] += 1
+        finally:
+            for key, *_ in items:
+                self._inflight.pop(key, None)
+
+    def stats(self, providers=None):
+        report = {}
+        for name, counters in self.counters.items():
+            entry = dict(counters)
+            entry["avg_batch"] = counters["dispatched"] / counters["calls"] if counters["calls"] else 0.0
+            entry["avg_queue_ms"] = (
+                counters["queue_seconds"] / counters["dispatched"] * 1000 if counters["dispatched"] else 0.0
+            )
+            entry["max_queue_ms"] = counters["max_queue_seconds"] * 1000
+            if providers:
+                entry["calls_per_provider"] = counters["calls"] / providers
+            report[name] = entry
+        return report
+
+    def summary(self, providers):
+        stats = self.stats().values()
+        calls = sum(entry["calls"] for entry in stats)
+        dispatched = sum(entry["dispatched"] for entry in stats)
+        queued = sum(entry["queue_seconds"] for entry in stats)
+        return {
+            "calls": calls,
+            "calls_per_provider": calls / providers if providers else 0.0,
+            "avg_queue_ms": queued / dispatched * 1000 if dispatched else 0.0,
+            "max_queue_ms": max((entry["max_queue_ms"] for entry in stats), default=0.0),
+            "coalesced": sum(entry["coalesced"] for entry in stats),
+            "retries": sum(entry["retries"] for entry in stats),
+        }
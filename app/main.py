@@ -1,7 +1,26 @@
+import hashlib
+import io
+
 import streamlit as st
 import pandas as pd
-import random
-import time
+
+from activity_log import ActivityLog
+from diff_engine import change_mask, compute_quality_metrics, directory_csv
+from lookup_cache import LookupCache
+from lookup_scheduler import LookupScheduler, default_limits
+from pipeline import iter_pipeline
+from results_store import ResultsStore
+from results_view import RISK_ORDER, SORT_OPTIONS, build_results_table, page_slice, query_results
+from sources import cached_sources, default_sources, scheduled_sources
+from validation_report import ReportJobs
+
+LOG_VISIBLE_LINES = 200
+LOG_REFRESH_SECONDS = 0.25
+PIPELINE_MAX_IN_FLIGHT = 64
+PAGE_SIZE_OPTIONS = [25, 50, 100]
+ATTENTION_LIST_LIMIT = 20
+
+results_store = ResultsStore()
 
 # --- Page Configuration ---
 st.set_page_config(
@@ -97,132 +116,179 @@ st.markdown("""
 
 source_icons = {
     "NPI Registry": "🏛️",
+    "State License Board": "🪪",
     "Google Maps": "🗺️",
     "Provider Website": "🌐",
     "Scanned PDF": "📄",
     "Payer Records": "📄",
 }
 
-def convert_to_csv(provider_data):
-    # Extract the 'after' data from each provider
-    after_data = [p['details']['after'] for p in provider_data]
-    df = pd.DataFrame(after_data)
-    return df.to_csv(index=False).encode('utf-8')
+@st.cache_resource
+def get_lookup_cache():
+    # Shared by every session, so repeat lookups skip the external sources.
+    return LookupCache()
+
+@st.cache_resource
+def get_rate_limits():
+    # Token buckets are process-wide so concurrent sessions share each source's limit.
+    return default_limits(default_sources())
+
+@st.cache_resource
+def get_refresh_scheduler():
+    # Background cache refreshes run on the lookup cache's own event loop, so
+    # they go through a scheduler of their own rather than a run's, sharing the
+    # same rate limits.
+    return LookupScheduler(get_rate_limits())
+
+@st.cache_resource
+def get_report_jobs():
+    # One registry per server process, so a report keeps rendering across reruns.
+    return ReportJobs()
+
+@st.cache_data(show_spinner=False, max_entries=8)
+def load_dataset(dataset_hash, _content):
+    # Keyed by the upload's content hash; the raw bytes are not hashed again.
+    return pd.read_csv(io.BytesIO(_content))
+
+@st.cache_data(show_spinner=False, max_entries=8)
+def load_saved_results(dataset_hash):
+    return results_store.load(dataset_hash)
+
+def set_results(validated_providers, quality_metrics, before_df, after_df):
+    st.session_state.quality_metrics = quality_metrics
+    st.session_state.validated_data = validated_providers
+    st.session_state.before_df = before_df
+    st.session_state.after_df = after_df
+    st.session_state.change_mask = change_mask(before_df, after_df)
+    st.session_state.results_table = build_results_table(validated_providers)
+    st.session_state.results_page = 1
+
+def start_report(meta, force=False):
+    st.session_state.results_meta = meta
+    get_report_jobs().start(
+        meta,
+        st.session_state.validated_data,
+        st.session_state.results_table,
+        st.session_state.before_df,
+        st.session_state.after_df,
+        st.session_state.change_mask,
+        force=force,
+    )
+
+def render_report_download():
+    meta = st.session_state.results_meta
+    dataset_hash = meta["dataset_hash"]
+    report_jobs = get_report_jobs()
+    status = report_jobs.status(dataset_hash)
+    if status is None:
+        # No job and no file (the server restarted or the reports folder was
+        # cleared): render it again from the results held in this session.
+        start_report(meta)
+        status = report_jobs.status(dataset_hash)
+    if status == "ready":
+        # The file is read when the button is clicked, not on every rerun.
+        st.download_button(
+            label="Download Validation Report (HTML)",
+            data=report_jobs.path(dataset_hash).read_bytes,
+            file_name="validation_report.html",
+            mime="text/html",
+            use_container_width=True
+        )
+    elif status == "failed":
+        st.error(f"Report generation failed: {report_jobs.error(dataset_hash)}")
+    elif status == "running":
+        poll_report_status(dataset_hash)
+    else:
+        st.error("The validation report could not be started. Run the validation again.")
+
+@st.fragment(run_every=2)
+def poll_report_status(dataset_hash):
+    # Only this placeholder reruns while the report renders; the page reruns
+    # once, when it is ready (or the job is gone).
+    if get_report_jobs().status(dataset_hash) != "running":
+        st.rerun()
+    st.button("Generating Validation Report…", disabled=True, use_container_width=True)
 
 def simulate_ai_validation(df):
     validated_providers = []
-    sources = list(source_icons.keys())
-    
+    lookup_cache = get_lookup_cache()
+    cache_before = lookup_cache.stats()
+    scheduler = LookupScheduler(get_rate_limits())
+    raw_sources = default_sources()
+    sources = cached_sources(
+        scheduled_sources(raw_sources, scheduler),
+        lookup_cache,
+        scheduled_sources(raw_sources, get_refresh_scheduler()),
+    )
+    total = len(df)
+
     yield "high_level", "🤖 Agent Initializing..."
-    time.sleep(1)
+    yield "high_level", f"🔍 Validating provider data across {len(sources)} sources..."
+
+    # Before/after are kept as two aligned frames; results only patch changed cells.
+    before_df = df.reset_index(drop=True)
+    after_columns = {col: before_df[col].to_numpy(dtype=object, copy=True) for col in before_df.columns}
+
+    records = before_df.to_dict(orient="records")
+    for provider_data in iter_pipeline(records, sources, max_in_flight=PIPELINE_MAX_IN_FLIGHT):
+        for col, value in provider_data["details"].pop("changes").items():
+            after_columns[col][provider_data["row"]] = value
+        validated_providers.append(provider_data)
+        provider_name = provider_data["provider_name"]
+        used = " ".join(source_icons.get(name, "") + name for name in provider_data["details"]["sources_used"])
+        yield "detailed", f"✨ **Enrichment Agent:** Checked {provider_name} against {used}."
+        yield "detailed", f"✅ **QA Agent:** Quality check passed for {provider_name} with score {provider_data['confidence_score']:.0%}."
+        yield "progress", len(validated_providers) / total
+
+    after_df = pd.DataFrame(after_columns, index=before_df.index)
+    quality = compute_quality_metrics(before_df, change_mask(before_df, after_df))
+
+    cache_stats = lookup_cache.stats(since=cache_before)
+    fetched = sum(entry["fetches"] for entry in cache_stats.values())
+    yield "high_level", f"🗄️ Lookup cache served {LookupCache.hit_rate(cache_stats):.0%} of lookups ({fetched} cache misses fetched)."
+    schedule = scheduler.summary(total)
+    yield "high_level", (
+        f"📡 {schedule['calls']} source calls ({schedule['calls_per_provider']:.2f} per provider), "
+        f"average queueing {schedule['avg_queue_ms']:.0f} ms, {schedule['coalesced']} lookups coalesced, "
+        f"{schedule['retries']} retries."
+    )
+    yield "high_level", "📈 Aggregating results and generating dashboard..."
+    
+    set_results(validated_providers, quality, before_df, after_df)
     
-    yield "high_level", "🔍 Validating provider data across sources..."
-    time.sleep(1)
+    yield "high_level", "🎉 Process Complete!"
 
-    detailed_logs = []
 
-    for i, row in df.iterrows():
-        provider_name = row.get("provider_name", f"Provider {i+1}")
-        detailed_logs.append(f"🕵️‍♀️ **Validator Agent:** Analyzing {provider_name}...")
-        yield "detailed", "\n\n".join(detailed_logs)
+def render_provider_details(provider):
+    st.markdown(f"#### Deep Dive: {provider['provider_name']}")
+    col1, col2 = st.columns(2)
+    with col1:
+        st.markdown("##### Data Comparison (Before vs. After)")
         
-        original_data = row.to_dict()
-        validated_data = {}
-        score_explanation = []
-        confidence_score = 100
-        invalid_count = 0
-        updated_count = 0
+        comparison_df = pd.DataFrame({
+            'Before': st.session_state.before_df.iloc[provider['row']],
+            'AI Validated (After)': st.session_state.after_df.iloc[provider['row']],
+        }).fillna('N/A').astype(str)
         
-        # Simulate Specialty and Primary Issue for UI
-        specialties = ["Cardiology", "Pediatrics", "Orthopedics", "Neurology", "Oncology"]
-        issues = ["Address Mismatch", "NPI Invalid", "License Expired", "Phone Disconnected", "Website Down"]
+        st.table(comparison_df)
         
-        for col, value in original_data.items():
-            rand = random.random()
-            source = random.choice(sources)
-            
-            if rand < 0.7:
-                status = "verified"
-                score_explanation.append(f"✓ '{col}' successfully verified via {source}.")
-            elif rand < 0.9:
-                status = "updated"
-                value = f"{value} (updated)"
-                score_explanation.append(f"~ '{col}' was updated based on {source}.")
-                confidence_score -= 5
-                updated_count += 1
-            else:
-                status = "invalid"
-                value = "N/A"
-                error_reason = f"✗ '{col}' is invalid or missing"
-                score_explanation.append(f"{error_reason} (last checked: {source}).")
-                confidence_score -= 10
-                invalid_count += 1
-            validated_data[col] = {"value": value, "status": status, "source": source}
+    with col2:
+        st.markdown("##### Validation Reasoning")
+        st.info(provider['details']['validation_reasoning'])
         
-        detailed_logs.append(f"✨ **Enrichment Agent:** Finding additional data for {provider_name}...")
-        yield "detailed", "\n\n".join(detailed_logs)
-        time.sleep(0.05)
-
-        risk_level = "Low"
-        primary_issue = "None"
-        if invalid_count > 1 or confidence_score < 80:
-            risk_level = "High"
-            primary_issue = random.choice(issues)
-        elif invalid_count > 0 or updated_count > 2:
-            risk_level = "Medium"
-            primary_issue = random.choice(issues)
-
-        provider_data = {
-            "id": f"prov_{i+1}",
-            "provider_name": provider_name,
-            "specialty": random.choice(specialties),
-            "validation_status": risk_level,
-            "confidence_score": max(0, confidence_score) / 100,
-            "primary_issue": primary_issue,
-            "details": {
-                "before": original_data,
-                "after": {k: v['value'] for k, v in validated_data.items()},
-                "sources_used": random.sample(sources, k=random.randint(2,4)),
-                "validation_reasoning": "\n".join(score_explanation)
-            }
-        }
-        validated_providers.append(provider_data)
-        detailed_logs.append(f"✅ **QA Agent:** Quality check passed for {provider_name} with score {provider_data['confidence_score']:.0%}.")
-        yield "detailed", "\n\n".join(detailed_logs)
-        time.sleep(0.05)
-
-    phone_corrected_count = 0
-    address_updated_count = 0
-    missing_filled_count = 0
-    other_updates = 0
-
-    for provider in validated_providers:
-        before = provider['details']['before']
-        after = provider['details']['after']
-        for col in before:
-            if str(before[col]) != str(after[col]):
-                if pd.isna(before[col]) or str(before[col]).strip() == "N/A" or str(before[col]).strip() == "":
-                    missing_filled_count += 1
-                elif "phone" in col.lower():
-                    phone_corrected_count += 1
-                elif "address" in col.lower():
-                    address_updated_count += 1
-                else:
-                    other_updates += 1
-    
-    st.session_state.quality_metrics = {
-        "phone_corrected": phone_corrected_count,
-        "address_updated": address_updated_count,
-        "missing_filled": missing_filled_count,
-        "other_updates": other_updates
-    }
+        st.markdown("##### Data Sources Used")
+        source_tags = " ".join([f"`{s}`" for s in provider['details']['sources_used']])
+        st.markdown(source_tags)
 
-    yield "high_level", "📈 Aggregating results and generating dashboard..."
-    time.sleep(1)
-    
-    st.session_state.validated_data = validated_providers
-    
-    yield "high_level", "🎉 Process Complete!"
+    if provider['validation_status'] in ["High", "Medium"]:
+        st.markdown("##### Manual Review Actions")
+        action_cols = st.columns(3)
+        with action_cols[0]:
+            st.button("🟢 Mark as Verified", key=f"verify_{provider['id']}", use_container_width=True)
+        with action_cols[1]:
+            st.button("🔴 Send for Manual Review", key=f"review_{provider['id']}", use_container_width=True)
+        with action_cols[2]:
+            st.button("📧 Send Verification Email", key=f"email_{provider['id']}", use_container_width=True)
 
 
 # --- UI Rendering ---
@@ -233,29 +299,73 @@ st.markdown("An operations console for healthcare payers to instantly review AI-
 uploaded_file = st.file_uploader("Upload your provider directory (CSV)", type="csv")
 
 if uploaded_file is not None:
-    data = pd.read_csv(uploaded_file)
-    st.write("Provider data uploaded successfully! Click Start to begin.")
+    content = uploaded_file.getvalue()
+    dataset_hash = hashlib.sha256(content).hexdigest()
+    data = load_dataset(dataset_hash, content)
+
+    if st.session_state.get("dataset_hash") != dataset_hash:
+        st.session_state.dataset_hash = dataset_hash
+        saved = load_saved_results(dataset_hash)
+        if saved is not None:
+            saved_meta, saved_providers, saved_before, saved_after = saved
+            set_results(saved_providers, saved_meta["quality_metrics"], saved_before, saved_after)
+            st.session_state.saved_meta = saved_meta
+            start_report(saved_meta)
+        else:
+            st.session_state.pop("validated_data", None)
+            st.session_state.pop("saved_meta", None)
+
+    saved_meta = st.session_state.get("saved_meta")
+    if saved_meta:
+        st.info(f"This dataset was already validated on {saved_meta['validated_at']}. Showing the saved results; click Start to validate it again.")
+    else:
+        st.write("Provider data uploaded successfully! Click Start to begin.")
     
     if st.button("Start Validation", type="primary"):
         # --- Live Agent Activity Log ---
         st.header("🤖 Live Agent Activity Log")
         high_level_log_placeholder = st.empty()
+        progress_placeholder = st.progress(0.0)
         high_level_messages = []
         
         with st.expander("View Detailed Logs"):
             detailed_log_placeholder = st.empty()
 
-        for level, message in simulate_ai_validation(data):
-            if level == "high_level":
-                high_level_messages.append(message)
-                high_level_log_placeholder.markdown("\n\n".join(f"- {m}" for m in high_level_messages))
-            else: # detailed
-                detailed_log_placeholder.markdown(message)
+        activity_log = ActivityLog(max_lines=LOG_VISIBLE_LINES, refresh_interval=LOG_REFRESH_SECONDS)
+        try:
+            for level, message in simulate_ai_validation(data):
+                if level == "high_level":
+                    high_level_messages.append(message)
+                    high_level_log_placeholder.markdown("\n\n".join(f"- {m}" for m in high_level_messages))
+                elif level == "progress":
+                    if activity_log.should_refresh():
+                        progress_placeholder.progress(message)
+                        detailed_log_placeholder.markdown(activity_log.render())
+                else: # detailed
+                    activity_log.append(message)
+        finally:
+            activity_log.close()
+        progress_placeholder.progress(1.0)
+        if activity_log.should_refresh(force=True):
+            detailed_log_placeholder.markdown(activity_log.render())
+        st.caption(f"Full agent activity log saved to `app/reports/{activity_log.spill_path.name}`.")
         
+        meta = results_store.save(
+            dataset_hash,
+            st.session_state.validated_data,
+            st.session_state.quality_metrics,
+            st.session_state.before_df,
+            st.session_state.after_df,
+            uploaded_file.name,
+        )
+        load_saved_results.clear()
+        start_report(meta, force=True)
+        st.session_state.pop("saved_meta", None)
         st.success("Validation process complete!")
-        st.markdown("---")
 
-        provider_data = st.session_state.get('validated_data', [])
+    provider_data = st.session_state.get('validated_data', [])
+    if provider_data:
+        st.markdown("---")
 
         # --- 1. Executive Summary KPI Panel ---
         st.header("Executive Summary")
@@ -277,7 +387,7 @@ if uploaded_file is not None:
         download_cols = st.columns(2)
 
         with download_cols[0]:
-            csv_data = convert_to_csv(provider_data)
+            csv_data = directory_csv(st.session_state.before_df, st.session_state.after_df, st.session_state.change_mask)
             st.download_button(
                 label="Download Updated Directory (CSV)",
                 data=csv_data,
@@ -287,14 +397,7 @@ if uploaded_file is not None:
             )
 
         with download_cols[1]:
-            pdf_mock_data = b"This is a mock PDF report."
-            st.download_button(
-                label="Download Validation Report (PDF)",
-                data=pdf_mock_data,
-                file_name="validation_report.pdf",
-                mime="application/pdf",
-                use_container_width=True
-            )
+            render_report_download()
 
         st.markdown("---")
 
@@ -310,88 +413,59 @@ if uploaded_file is not None:
 
         st.markdown("---")
 
+        results_table = st.session_state.results_table
+
         # --- New Section: Providers Requiring Immediate Attention ---
         st.header("🔥 Providers Requiring Immediate Attention")
 
-        attention_providers = [p for p in provider_data if p['validation_status'] in ['High', 'Medium']]
-        risk_sort_order_attention = {"High": 0, "Medium": 1}
-        sorted_attention_providers = sorted(
-            attention_providers,
-            key=lambda p: (risk_sort_order_attention[p['validation_status']], p['confidence_score'])
-        )
-
-        if not sorted_attention_providers:
+        attention = query_results(results_table, risk_levels=["High", "Medium"])
+        if attention.empty:
             st.info("No providers require immediate attention at this time.")
         else:
-            for provider in sorted_attention_providers:
-                st.write(f"- **{provider['provider_name']}** (Risk: {provider['validation_status']}, Confidence: {provider['confidence_score']:.1%})")
+            for row in attention.head(ATTENTION_LIST_LIMIT).to_dict("records"):
+                st.write(f"- **{row['Provider Name']}** (Risk: {row['Risk Level']}, Confidence: {row['Confidence Score']:.1%})")
+            if len(attention) > ATTENTION_LIST_LIMIT:
+                st.caption(f"…and {len(attention) - ATTENTION_LIST_LIMIT} more. Filter the results grid by risk level to see them all.")
 
         st.markdown("---")
 
-        # --- 2. Smart, Compact Table ---
+        # --- 2. Paginated Results Grid ---
         st.header("Provider Validation Results")
-        st.markdown(
-            """
-            <div class="table-header">
-                <div>Provider Name</div>
-                <div>Specialty</div>
-                <div>Risk Level</div>
-                <div>Confidence Score</div>
-            </div>
-            """,
-            unsafe_allow_html=True
+
+        filter_cols = st.columns((2, 2, 1.5, 1))
+        search = filter_cols[0].text_input("Search name or specialty", key="results_search")
+        risk_filter = filter_cols[1].multiselect("Risk level", list(RISK_ORDER), key="results_risk")
+        sort_by = filter_cols[2].selectbox("Sort by", SORT_OPTIONS, key="results_sort")
+        page_size = filter_cols[3].selectbox("Rows per page", PAGE_SIZE_OPTIONS, key="results_page_size")
+
+        view = query_results(results_table, search, risk_filter, sort_by)
+        page_count = max(1, -(-len(view) // page_size))
+        if st.session_state.get("results_page", 1) > page_count:
+            st.session_state.results_page = page_count
+        page = st.number_input(f"Page (of {page_count})", min_value=1, max_value=page_count, step=1, key="results_page")
+        page_rows = page_slice(view, page, page_size)
+
+        st.caption(f"Showing {len(page_rows)} of {len(view)} matching providers ({len(results_table)} total). Select a row to see its details.")
+        selection = st.dataframe(
+            page_rows,
+            hide_index=True,
+            use_container_width=True,
+            on_select="rerun",
+            selection_mode="single-row",
+            key="results_grid",
+            column_config={
+                "id": None,
+                "Confidence Score": st.column_config.ProgressColumn(
+                    "Confidence Score", min_value=0.0, max_value=1.0, format="percent"
+                ),
+            },
         )
 
-        risk_order = {"High": 0, "Medium": 1, "Low": 2}
-        sorted_data = sorted(provider_data, key=lambda p: risk_order[p['validation_status']])
-
-        def get_status_badge(status):
-            return f'<span class="badge badge-{status}">{status}</span>'
-
-        for provider in sorted_data:
-            # Use st.columns to create the row
-            cols = st.columns((2, 1.5, 1, 2))
-            cols[0].markdown(f"**{provider['provider_name']}**")
-            cols[1].markdown(provider['specialty'])
-            cols[2].markdown(get_status_badge(provider['validation_status']), unsafe_allow_html=True)
-            
-            with cols[3]:
-                st.progress(provider['confidence_score'])
-                st.write(f"{provider['confidence_score']:.1%}")
-                if provider['validation_status'] in ["High", "Medium"]:
-                    st.caption(f"Reason: {provider['primary_issue']}")
-
-            # The expander is now for details only, placed below the row
-            with st.expander("View Details"):
-                st.markdown("#### Deep Dive: Validation Details")
-                col1, col2 = st.columns(2)
-                with col1:
-                    st.markdown("##### Data Comparison (Before vs. After)")
-                    
-                    before_df = pd.DataFrame.from_dict(provider['details']['before'], orient='index', columns=['Before'])
-                    after_df = pd.DataFrame.from_dict(provider['details']['after'], orient='index', columns=['AI Validated (After)'])
-                    comparison_df = before_df.join(after_df, how='outer').fillna('N/A')
-                    
-                    st.table(comparison_df)
-                    
-                with col2:
-                    st.markdown("##### Validation Reasoning")
-                    st.info(provider['details']['validation_reasoning'])
-                    
-                    st.markdown("##### Data Sources Used")
-                    source_tags = " ".join([f"`{s}`" for s in provider['details']['sources_used']])
-                    st.markdown(source_tags)
-
-                if provider['validation_status'] in ["High", "Medium"]:
-                    st.markdown("##### Manual Review Actions")
-                    action_cols = st.columns(3)
-                    with action_cols[0]:
-                        st.button("🟢 Mark as Verified", key=f"verify_{provider['id']}", use_container_width=True)
-                    with action_cols[1]:
-                        st.button("🔴 Send for Manual Review", key=f"review_{provider['id']}", use_container_width=True)
-                    with action_cols[2]:
-                        st.button("📧 Send Verification Email", key=f"email_{provider['id']}", use_container_width=True)
-            st.markdown("---") # Add a separator between providers
+        selected_rows = selection.selection.rows
+        if selected_rows and selected_rows[0] < len(page_rows):
+            provider_id = page_rows.iloc[selected_rows[0]]["id"]
+            provider = next(p for p in provider_data if p["id"] == provider_id)
+            render_provider_details(provider)
 
 st.sidebar.header("✅ Redesign Benefits")
 st.sidebar.markdown(
@@ -0,0 +1,135 @@
+import asyncio
+import queue
+import random
+import threading
+
+from sources import assign_columns
+
+SPECIALTIES = ["Cardiology", "Pediatrics", "Orthopedics", "Neurology", "Oncology"]
+ISSUES = ["Address Mismatch", "NPI Invalid", "License Expired", "Phone Disconnected", "Website Down"]
+
+
+def _score_provider(index, record, checks, sources_used):
+    provider_name = record.get("provider_name", f"Provider {index+1}")
+    confidence_score = 100
+    invalid_count = 0
+    updated_count = 0
+    score_explanation = []
+
+    for col in record:
+        check = checks[col]
+        if check["status"] == "verified":
+            score_explanation.append(f"✓ '{col}' successfully verified via {check['source']}.")
+        elif check["status"] == "updated":
+            score_explanation.append(f"~ '{col}' was updated based on {check['source']}.")
+            confidence_score -= 5
+            updated_count += 1
+        else:
+            score_explanation.append(f"✗ '{col}' is invalid or missing (last checked: {check['source']}).")
+            confidence_score -= 10
+            invalid_count += 1
+
+    risk_level = "Low"
+    primary_issue = "None"
+    if invalid_count > 1 or confidence_score < 80:
+        risk_level = "High"
+        primary_issue = random.choice(ISSUES)
+    elif invalid_count > 0 or updated_count > 2:
+        risk_level = "Medium"
+        primary_issue = random.choice(ISSUES)
+
+    return {
+        "id": f"prov_{index+1}",
+        "provider_name": provider_name,
+        "specialty": random.choice(SPECIALTIES),
+        "validation_status": risk_level,
+        "confidence_score": max(0, confidence_score) / 100,
+        "primary_issue": primary_issue,
+        "row": index,
+        "details": {
+            "changes": {col: check["value"] for col, check in checks.items() if check["status"] != "verified"},
+            "sources_used": sources_used,
+            "validation_reasoning": "\n".join(score_explanation),
+        },
+    }
+
+
+async def _validate_provider(index, record, sources, limits):
+    assignments = assign_columns(record.keys(), sources)
+
+    async def run_source(source):
+        async with limits[source.name]:
+            return await source.verify(record, assignments[source.name])
+
+    active = [source for source in sources if assignments[source.name]]
+    results = await asyncio.gather(*(run_source(source) for source in active))
+    checks = {}
+    for result in results:
+        checks.update(result)
+    return _score_provider(index, record, checks, [source.name for source in active])
+
+
+async def run_pipeline(records, sources, max_in_flight=None):
+    """Validate `records` (a list of dicts) against `sources`, yielding each
+    provider result as soon as it completes."""
+    limits = {source.name: asyncio.Semaphore(source.concurrency) for source in sources}
+    max_in_flight = max_in_flight or max(1, sum(source.concurrency for source in sources))
+    pending = set()
+    records = iter(enumerate(records))
+
+    def refill():
+        for index, record in records:
+            pending.add(asyncio.ensure_future(_validate_provider(index, record, sources, limits)))
+            if len(pending) >= max_in_flight:
+                break
+
+    refill()
+    while pending:
+        done, _ = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+        for task in done:
+            pending.discard(task)
+        refill()
+        for task in done:
+            yield task.result()
+
+
+_DONE = object()
+
+
+def iter_pipeline(records, sources, max_in_flight=None):
+    """Synchronous wrapper for the Streamlit script thread: runs the pipeline on
+    its own event loop in a worker thread and yields results as they arrive."""
+    results = queue.Queue(maxsize=1024)
+    stop = threading.Event()
+
+    async def produce():
+        async for result in run_pipeline(records, sources, max_in_flight):
+            if stop.is_set():
+                break
+            await asyncio.to_thread(results.put, result)
+
+    def worker():
+        try:
+            asyncio.run(produce())
+        except BaseException as exc:
+            results.put(exc)
+        else:
+            results.put(_DONE)
+
+    thread = threading.Thread(target=worker, name="validation-pipeline", daemon=True)
+    thread.start()
+    try:
+        while True:
+            item = results.get()
+            if item is _DONE:
+                break
+            if isinstance(item, BaseException):
+                raise item
+            yield item
+    finally:
+        stop.set()
+        while thread.is_alive():
+            try:
+                results.get_nowait()
+            except queue.Empty:
+                thread.join(timeout=0.05)
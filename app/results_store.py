@@ -0,0 +1,55 @@
+import json
+import os
+import pickle
+from datetime import datetime
+from pathlib import Path
+
+DATA_DIR = Path(__file__).parent / "data"
+
+
+# On-disk store of validation results keyed by the SHA-256 of the uploaded
+# file, so a known dataset can be reopened without re-validating.
+class ResultsStore:
+    def __init__(self, root=DATA_DIR):
+        self.root = Path(root)
+
+    def _dir(self, dataset_hash):
+        return self.root / dataset_hash
+
+    def _write_atomic(self, path, payload):
+        tmp_path = path.with_suffix(path.suffix + ".tmp")
+        with open(tmp_path, "wb") as handle:
+            handle.write(payload)
+        os.replace(tmp_path, path)
+
+    def save(self, dataset_hash, validated_data, quality_metrics, before_df, after_df, source_name=None):
+        target = self._dir(dataset_hash)
+        target.mkdir(parents=True, exist_ok=True)
+        payload = {"providers": validated_data, "before": before_df, "after": after_df}
+        self._write_atomic(target / "results.pkl", pickle.dumps(payload, protocol=pickle.HIGHEST_PROTOCOL))
+        meta = {
+            "dataset_hash": dataset_hash,
+            "source_name": source_name,
+            "providers": len(validated_data),
+            "quality_metrics": quality_metrics,
+            "validated_at": datetime.now().isoformat(timespec="seconds"),
+        }
+        # meta.json is written last: its presence marks a complete entry.
+        self._write_atomic(target / "meta.json", json.dumps(meta, indent=2).encode("utf-8"))
+        return meta
+
+    def load_meta(self, dataset_hash):
+        meta_path = self._dir(dataset_hash) / "meta.json"
+        if not meta_path.exists():
+            return None
+        return json.loads(meta_path.read_text(encoding="utf-8"))
+
+    def load(self, dataset_hash):
+        meta = self.load_meta(dataset_hash)
+        if meta is None:
+            return None
+        with open(self._dir(dataset_hash) / "results.pkl", "rb") as handle:
+            payload = pickle.load(handle)
+        if not isinstance(payload, dict):
+            return None
+        return meta, payload["providers"], payload["before"], payload["after"]
@@ -0,0 +1,44 @@
+import pandas as pd
+
+RISK_ORDER = {"High": 0, "Medium": 1, "Low": 2}
+SORT_OPTIONS = ["Risk Level", "Confidence (low → high)", "Confidence (high → low)", "Provider Name"]
+
+
+def build_results_table(provider_data):
+    return pd.DataFrame(
+        {
+            "id": [p["id"] for p in provider_data],
+            "Provider Name": [str(p["provider_name"]) for p in provider_data],
+            "Specialty": [p["specialty"] for p in provider_data],
+            "Risk Level": [p["validation_status"] for p in provider_data],
+            "Confidence Score": [p["confidence_score"] for p in provider_data],
+            "Primary Issue": [p["primary_issue"] for p in provider_data],
+        }
+    )
+
+
+def query_results(table, search="", risk_levels=None, sort_by="Risk Level"):
+    # Filtering and sorting run on the full table here so the grid widget only
+    # ever receives the rows of the current page.
+    mask = pd.Series(True, index=table.index)
+    if risk_levels:
+        mask &= table["Risk Level"].isin(risk_levels)
+    needle = search.strip().lower()
+    if needle:
+        haystack = table["Provider Name"].str.lower() + " " + table["Specialty"].str.lower()
+        mask &= haystack.str.contains(needle, regex=False)
+    view = table[mask]
+
+    if sort_by == "Provider Name":
+        return view.sort_values("Provider Name", kind="stable")
+    if sort_by == "Confidence (low → high)":
+        return view.sort_values("Confidence Score", kind="stable")
+    if sort_by == "Confidence (high → low)":
+        return view.sort_values("Confidence Score", ascending=False, kind="stable")
+    order = view["Risk Level"].map(RISK_ORDER)
+    return view.assign(_risk=order).sort_values(["_risk", "Confidence Score"], kind="stable").drop(columns="_risk")
+
+
+def page_slice(view, page, page_size):
+    start = (page - 1) * page_size
+    return view.iloc[start:start + page_size]
@@ -0,0 +1,169 @@
+import asyncio
+import random
+from abc import ABC, abstractmethod
+
+
+class SourceUnavailable(Exception):
+    """Raised by an adapter for a transient failure (timeout, 429, 5xx) that is
+    worth retrying, optionally after the source's requested delay."""
+
+    def __init__(self, message="source unavailable", retry_after=None):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+# A source adapter verifies the columns it is responsible for and returns, per
+# column, a {"value", "status", "source"} check. Real adapters (HTTP clients for
+# the NPI registry, a state license board API, ...) subclass SourceAdapter and
+# implement `verify`; the stubs below simulate latency and outcomes locally.
+# Sources with a bulk endpoint set `batch_size` and implement `verify_batch`,
+# which takes [(record, columns), ...] and returns one checks dict per request.
+# Sources whose API publishes a rate limit set `rate_limit` to
+# (calls per second, burst) and are paced by the LookupScheduler.
+class SourceAdapter(ABC):
+    name = "Source"
+    keywords = ()
+    concurrency = 8
+    batch_size = 1
+    rate_limit = None
+
+    def handles(self, column):
+        column = column.lower()
+        return any(keyword in column for keyword in self.keywords)
+
+    @abstractmethod
+    async def verify(self, record, columns):
+        ...
+
+    async def verify_batch(self, requests):
+        return [await self.verify(record, columns) for record, columns in requests]
+
+
+class StubSource(SourceAdapter):
+    def __init__(self, name, keywords=(), concurrency=8, latency=(0.02, 0.08), rng=None, batch_size=1,
+                 rate_limit=None):
+        self.name = name
+        self.keywords = tuple(keywords)
+        self.concurrency = concurrency
+        self.latency = latency
+        self.rng = rng or random.Random()
+        self.batch_size = batch_size
+        self.rate_limit = rate_limit
+
+    async def verify(self, record, columns):
+        await asyncio.sleep(self.rng.uniform(*self.latency))
+        return self._checks(record, columns)
+
+    async def verify_batch(self, requests):
+        # One round trip for the whole batch.
+        await asyncio.sleep(self.rng.uniform(*self.latency))
+        return [self._checks(record, columns) for record, columns in requests]
+
+    def _checks(self, record, columns):
+        checks = {}
+        for col in columns:
+            value = record.get(col)
+            rand = self.rng.random()
+            if rand < 0.7:
+                checks[col] = {"value": value, "status": "verified", "source": self.name}
+            elif rand < 0.9:
+                checks[col] = {"value": f"{value} (updated)", "status": "updated", "source": self.name}
+            else:
+                checks[col] = {"value": "N/A", "status": "invalid", "source": self.name}
+        return checks
+
+
+class FallbackStubSource(StubSource):
+    def handles(self, column):
+        return True
+
+
+def default_sources(latency=(0.02, 0.08), concurrency=8, seed=None):
+    rng = random.Random(seed)
+    return [
+        StubSource("NPI Registry", ("npi", "taxonomy"), concurrency, latency, rng, batch_size=50),
+        StubSource("State License Board", ("license",), concurrency, latency, rng),
+        StubSource("Google Maps", ("address", "city", "state", "zip"), concurrency, latency, rng),
+        StubSource("Provider Website", ("phone", "email", "website", "specialty"), concurrency, latency, rng),
+        FallbackStubSource("Payer Records", (), concurrency, latency, rng, batch_size=100),
+    ]
+
+
+def assign_columns(columns, sources):
+    # Each column is checked by the first source that handles it.
+    assignments = {source.name: [] for source in sources}
+    for col in columns:
+        for source in sources:
+            if source.handles(col):
+                assignments[source.name].append(col)
+                break
+    return assignments
+
+
+def lookup_key(column, value):
+    return f"{column.strip().lower()}={str(value).strip().lower()}"
+
+
+# Serves a source's per-column checks from a LookupCache. A check the source
+# reports as invalid is a not-found and is negatively cached. Stale entries are
+# refreshed through `refresh_source` (default: `source`) on the cache's own
+# event loop, so it must not be tied to the run's loop the way a
+# ScheduledSource is.
+class CachedSource(SourceAdapter):
+    def __init__(self, source, cache, refresh_source=None):
+        self.source = source
+        self.cache = cache
+        self.refresh_source = refresh_source or source
+        self.name = source.name
+        self.keywords = source.keywords
+        self.concurrency = source.concurrency
+
+    def handles(self, column):
+        return self.source.handles(column)
+
+    async def verify(self, record, columns):
+        keys = {col: lookup_key(col, record.get(col)) for col in columns}
+
+        def fetcher(source):
+            async def fetch_many(missing):
+                missing = set(missing)
+                wanted = [col for col, key in keys.items() if key in missing]
+                checks = await source.verify(record, wanted)
+                return {keys[col]: check for col, check in checks.items() if check["status"] != "invalid"}
+
+            return fetch_many
+
+        found = await self.cache.get_many(
+            self.name, keys.values(), fetcher(self.source), fetcher(self.refresh_source)
+        )
+        return {
+            col: found[key] if found[key] is not None else {"value": "N/A", "status": "invalid", "source": self.name}
+            for col, key in keys.items()
+        }
+
+
+def cached_sources(sources, cache, refresh_sources=None):
+    refresh_sources = refresh_sources or [None] * len(sources)
+    return [CachedSource(source, cache, refresh) for source, refresh in zip(sources, refresh_sources)]
+
+
+# Routes a source's lookups through a LookupScheduler, which coalesces, batches
+# and rate-limits them. The scheduler enforces the source's call concurrency,
+# so the pipeline may keep up to a full batch per call slot outstanding.
+class ScheduledSource(SourceAdapter):
+    def __init__(self, source, scheduler):
+        self.source = source
+        self.scheduler = scheduler
+        self.name = source.name
+        self.keywords = source.keywords
+        self.concurrency = source.concurrency * source.batch_size
+
+    def handles(self, column):
+        return self.source.handles(column)
+
+    async def verify(self, record, columns):
+        return await self.scheduler.lookup(self.source, record, columns)
+
+
+def scheduled_sources(sources, scheduler):
+    return [ScheduledSource(source, scheduler) for source in sources]
@@ -0,0 +1,6 @@
+import sys
+from pathlib import Path
+
+# The console's modules import each other as top-level modules (streamlit runs
+# app/main.py as a script), so the tests put app/ on the path the same way.
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
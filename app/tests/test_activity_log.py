@@ -0,0 +1,38 @@
+from activity_log import ActivityLog
+
+
+def test_only_the_last_lines_are_rendered_and_everything_is_spilled(tmp_path):
+    log = ActivityLog(max_lines=3, spill_dir=tmp_path)
+    for index in range(10):
+        log.append(f"line {index}")
+    log.close()
+
+    assert list(log.lines) == ["line 7", "line 8", "line 9"]
+    assert log.total_lines == 10
+    rendered = log.render()
+    assert rendered.startswith(f"_… 7 earlier entries in `{log.spill_path.name}`_")
+    assert rendered.endswith("line 7\n\nline 8\n\nline 9")
+    assert log.spill_path.parent == tmp_path
+    assert log.spill_path.read_text(encoding="utf-8").splitlines() == [f"line {index}" for index in range(10)]
+
+
+def test_short_logs_render_without_a_spill_note(tmp_path):
+    log = ActivityLog(max_lines=3, spill_dir=tmp_path)
+    log.append("only line")
+    log.close()
+
+    assert log.render() == "only line"
+
+
+def test_refreshes_are_throttled_until_forced(tmp_path):
+    log = ActivityLog(refresh_interval=60, spill_dir=tmp_path)
+    assert not log.should_refresh(force=True)  # nothing new to show
+
+    log.append("first")
+    assert log.should_refresh()
+    log.append("second")
+    assert not log.should_refresh()  # inside the interval
+    assert log.should_refresh(force=True)
+    assert not log.should_refresh(force=True)
+    log.close()
+    log.close()
@@ -0,0 +1,63 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from benchmarks.diff_engine import loop_metrics, make_frames
+from diff_engine import change_mask, compute_quality_metrics, directory_csv, updated_directory
+
+
+def loop_directory(before, after):
+    # The per-cell export the change mask replaced: take the new value wherever
+    # its text differs.
+    rows = []
+    for before_row, after_row in zip(before.to_dict("records"), after.to_dict("records")):
+        rows.append({
+            col: after_row[col] if str(before_row[col]) != str(after_row[col]) else before_row[col]
+            for col in before_row
+        })
+    return pd.DataFrame(rows, columns=before.columns)
+
+
+@pytest.mark.parametrize("seed", [1, 7, 42])
+def test_vectorized_metrics_match_the_row_loop(seed):
+    before, after = make_frames(2_000, seed=seed)
+    mask = change_mask(before, after)
+
+    assert compute_quality_metrics(before, mask) == loop_metrics(before, after)
+    assert int(mask.to_numpy().sum()) == sum(
+        str(old) != str(new)
+        for before_row, after_row in zip(before.to_dict("records"), after.to_dict("records"))
+        for old, new in zip(before_row.values(), after_row.values())
+    )
+
+
+def test_edge_cases_match_the_row_loop():
+    before = pd.DataFrame({
+        "Phone": ["555", " N/A ", None, "555"],
+        "Mailing Address": ["1 Main St", "", "2 Elm St", np.nan],
+        "Phone Address": ["a", "b", "c", "d"],
+        "zip": [10001, 10002, 10003, 10004],
+        "license": [np.nan, "L1", "L2", "L3"],
+    })
+    after = before.astype(object)
+    after.loc[0, "Phone"] = "5551234567"
+    after.loc[1, "Phone"] = "5559876543"
+    after.loc[2, "Phone"] = "N/A"
+    after.loc[1, "Mailing Address"] = "3 Oak St"
+    after.loc[2, "Mailing Address"] = "2 Elm Street"
+    after.loc[0, "Phone Address"] = "z"
+    after.loc[3, "zip"] = "10004"  # same text, different type: not a change
+    after.loc[0, "license"] = "L0"
+
+    mask = change_mask(before, after)
+    assert compute_quality_metrics(before, mask) == loop_metrics(before, after)
+    assert not mask.loc[3, "zip"]
+
+
+def test_exported_directory_matches_the_row_loop():
+    before, after = make_frames(500, seed=3)
+    mask = change_mask(before, after)
+    expected = loop_directory(before, after)
+
+    assert updated_directory(before, after, mask).astype(str).equals(expected.astype(str))
+    assert directory_csv(before, after, mask) == expected.to_csv(index=False).encode("utf-8")
@@ -0,0 +1,184 @@
+import asyncio
+import json
+import threading
+import urllib.error
+import urllib.request
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from lookup_cache import LookupCache
+from sources import CachedSource, StubSource
+
+REGISTRY = {"1234567890": {"name": "Dr. Ada Smith", "status": "active"}}
+
+
+class StubRegistry:
+    """Local stand-in for an NPI-style registry: GET /npi/<number>, 404 if unknown."""
+
+    def __init__(self):
+        self.requests = []
+        registry = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                registry.requests.append(self.path)
+                entry = REGISTRY.get(self.path.rsplit("/", 1)[-1])
+                body = json.dumps(entry or {"error": "not found"}).encode()
+                self.send_response(200 if entry else 404)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}/npi"
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+
+    def _get(self, number):
+        try:
+            with urllib.request.urlopen(f"{self.url}/{number}", timeout=5) as response:
+                return json.loads(response.read())
+        except urllib.error.HTTPError as exc:
+            if exc.code == 404:
+                return None
+            raise
+
+    async def fetch_many(self, numbers):
+        found = await asyncio.gather(*(asyncio.to_thread(self._get, number) for number in numbers))
+        return {number: entry for number, entry in zip(numbers, found) if entry is not None}
+
+    def close(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1_000_000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def registry():
+    registry = StubRegistry()
+    yield registry
+    registry.close()
+
+
+def make_cache(path, clock):
+    return LookupCache(path, ttls={"NPI": 100}, negative_ttl=10, stale_window=50, clock=clock)
+
+
+def test_hits_and_negative_caching(tmp_path, registry):
+    cache = make_cache(tmp_path / "cache.sqlite3", Clock())
+
+    async def scenario():
+        first = await cache.get_many("NPI", ["1234567890", "0000000000"], registry.fetch_many)
+        second = await cache.get_many("NPI", ["1234567890", "0000000000"], registry.fetch_many)
+        return first, second
+
+    first, second = asyncio.run(scenario())
+    assert first == second == {"1234567890": REGISTRY["1234567890"], "0000000000": None}
+    assert len(registry.requests) == 2
+
+    stats = cache.stats()["NPI"]
+    assert (stats["misses"], stats["hits"], stats["negative_hits"], stats["fetches"]) == (2, 1, 1, 1)
+    assert stats["hit_rate"] == 0.5
+
+
+def test_ttls_and_stale_while_revalidate(tmp_path, registry):
+    clock = Clock()
+    cache = make_cache(tmp_path / "cache.sqlite3", clock)
+
+    async def scenario():
+        await cache.get_many("NPI", ["1234567890", "0000000000"], registry.fetch_many)
+
+        # Past the negative TTL only: the not-found is looked up again.
+        clock.now += 20
+        await cache.get_many("NPI", ["1234567890", "0000000000"], registry.fetch_many)
+        assert len(registry.requests) == 3
+
+        # Past the positive TTL but inside the stale window: served stale, refreshed behind.
+        clock.now += 100
+        stale = await cache.get_many("NPI", ["1234567890"], registry.fetch_many)
+        assert stale == {"1234567890": REGISTRY["1234567890"]}
+        await asyncio.to_thread(cache.wait_for_refreshes, 5)
+        assert len(registry.requests) == 4
+
+        # The refresh reset the TTL, so this is a plain hit.
+        await cache.get_many("NPI", ["1234567890"], registry.fetch_many)
+        assert len(registry.requests) == 4
+
+        # Past TTL and stale window: a synchronous miss.
+        clock.now += 1000
+        await cache.get_many("NPI", ["1234567890"], registry.fetch_many)
+        assert len(registry.requests) == 5
+
+    asyncio.run(scenario())
+    stats = cache.stats()["NPI"]
+    assert stats["stale_hits"] == 1
+    assert (stats["fetches"], stats["fetched_keys"]) == (4, 5)
+
+
+def test_entries_persist_across_instances(tmp_path, registry):
+    path = tmp_path / "cache.sqlite3"
+    clock = Clock()
+    asyncio.run(make_cache(path, clock).get_many("NPI", ["1234567890"], registry.fetch_many))
+
+    reopened = make_cache(path, clock)
+    since = reopened.stats()
+    assert asyncio.run(reopened.get_many("NPI", ["1234567890"], registry.fetch_many)) == {
+        "1234567890": REGISTRY["1234567890"]
+    }
+    assert len(registry.requests) == 1
+    assert LookupCache.hit_rate(reopened.stats(since=since)) == 1.0
+
+
+def test_cached_source_only_calls_the_source_for_misses(tmp_path):
+    calls = []
+
+    class CountingSource(StubSource):
+        async def verify(self, record, columns):
+            calls.append(list(columns))
+            return {col: {"value": record[col], "status": "verified", "source": self.name} for col in columns}
+
+    cache = make_cache(tmp_path / "cache.sqlite3", Clock())
+    source = CachedSource(CountingSource("NPI", ("npi",)), cache)
+    record = {"npi": "1234567890", "npi_taxonomy": "207RC0000X"}
+
+    async def scenario():
+        first = await source.verify(record, ["npi", "npi_taxonomy"])
+        second = await source.verify({**record, "npi_taxonomy": "208000000X"}, ["npi", "npi_taxonomy"])
+        return first, second
+
+    first, second = asyncio.run(scenario())
+    assert first["npi"] == second["npi"] == {"value": "1234567890", "status": "verified", "source": "NPI"}
+    assert calls == [["npi", "npi_taxonomy"], ["npi_taxonomy"]]
+
+
+def test_stale_refreshes_outlive_the_run_that_started_them(tmp_path, registry):
+    clock = Clock()
+    cache = make_cache(tmp_path / "cache.sqlite3", clock)
+    asyncio.run(cache.get_many("NPI", ["1234567890"], registry.fetch_many))
+    clock.now += 120
+
+    async def slow_fetch_many(numbers):
+        await asyncio.sleep(0.1)
+        return await registry.fetch_many(numbers)
+
+    # The run returns (and its loop closes) before the refresh finishes.
+    asyncio.run(cache.get_many("NPI", ["1234567890"], slow_fetch_many))
+    cache.wait_for_refreshes(timeout=5)
+
+    assert len(registry.requests) == 2
+    assert cache.stats()["NPI"]["errors"] == 0
+    asyncio.run(cache.get_many("NPI", ["1234567890"], registry.fetch_many))
+    assert cache.stats()["NPI"]["hits"] == 1
+    cache.close()
@@ -0,0 +1,137 @@
+import asyncio
+import time
+
+import pytest
+
+from lookup_scheduler import LookupScheduler, TokenBucket, default_limits
+from sources import ScheduledSource, SourceAdapter, SourceUnavailable, default_sources
+
+
+class StandInSource(SourceAdapter):
+    """Local stand-in for a registry: records every call, optionally fails the
+    first `failures` calls with a retryable error."""
+
+    def __init__(self, name="Registry", batch_size=1, latency=0.01, failures=0, concurrency=8):
+        self.name = name
+        self.keywords = ("npi",)
+        self.batch_size = batch_size
+        self.latency = latency
+        self.failures = failures
+        self.concurrency = concurrency
+        self.calls = []
+
+    async def _respond(self, requests):
+        self.calls.append([(record["npi"], tuple(columns)) for record, columns in requests])
+        await asyncio.sleep(self.latency)
+        if self.failures:
+            self.failures -= 1
+            raise SourceUnavailable("503 from registry")
+        return [
+            {col: {"value": record[col], "status": "verified", "source": self.name} for col in columns}
+            for record, columns in requests
+        ]
+
+    async def verify(self, record, columns):
+        return (await self._respond([(record, columns)]))[0]
+
+    async def verify_batch(self, requests):
+        return await self._respond(requests)
+
+
+def run_lookups(scheduler, source, records):
+    scheduled = ScheduledSource(source, scheduler)
+
+    async def scenario():
+        return await asyncio.gather(*(scheduled.verify(record, ["npi"]) for record in records))
+
+    return asyncio.run(scenario())
+
+
+def test_concurrent_lookups_for_the_same_key_are_coalesced():
+    source = StandInSource()
+    scheduler = LookupScheduler()
+    results = run_lookups(scheduler, source, [{"npi": "1234567890"} for _ in range(10)])
+
+    assert len(source.calls) == 1
+    assert all(result["npi"]["value"] == "1234567890" for result in results)
+    stats = scheduler.stats(providers=10)["Registry"]
+    assert (stats["requests"], stats["coalesced"], stats["calls"]) == (10, 9, 1)
+    assert stats["calls_per_provider"] == pytest.approx(0.1)
+
+
+def test_lookups_are_packed_into_batches():
+    source = StandInSource(batch_size=25)
+    scheduler = LookupScheduler(batch_window=0.05)
+    records = [{"npi": f"{index:010d}"} for index in range(60)]
+    results = run_lookups(scheduler, source, records)
+
+    assert [len(call) for call in source.calls] == [25, 25, 10]
+    assert [result["npi"]["value"] for result in results] == [record["npi"] for record in records]
+    stats = scheduler.stats()["Registry"]
+    assert stats["avg_batch"] == 20
+    assert stats["max_queue_ms"] >= 40  # the last partial batch waited out the window
+    assert scheduler.summary(providers=60)["calls_per_provider"] == pytest.approx(0.05)
+
+
+def test_token_bucket_paces_calls():
+    source = StandInSource(latency=0)
+    scheduler = LookupScheduler(limits={"Registry": TokenBucket(rate=50, burst=1)})
+    started = time.monotonic()
+    run_lookups(scheduler, source, [{"npi": f"{index:010d}"} for index in range(6)])
+
+    assert time.monotonic() - started >= 0.09
+    assert scheduler.stats()["Registry"]["throttle_seconds"] > 0
+
+
+def test_only_sources_that_declare_a_rate_limit_are_paced():
+    assert default_limits(default_sources()) == {}
+
+    source = StandInSource()
+    source.rate_limit = (50, 5)
+    limits = default_limits([source, StandInSource(name="Unlimited")])
+    assert list(limits) == ["Registry"]
+    assert (limits["Registry"].rate, limits["Registry"].burst) == (50, 5)
+
+
+def test_retryable_failures_back_off_and_retry():
+    source = StandInSource(failures=2)
+    scheduler = LookupScheduler(backoff=0.01)
+    (result,) = run_lookups(scheduler, source, [{"npi": "1234567890"}])
+
+    assert result["npi"]["status"] == "verified"
+    assert len(source.calls) == 3
+    assert scheduler.stats()["Registry"]["retries"] == 2
+
+
+def test_failures_surface_after_max_retries():
+    source = StandInSource(failures=10)
+    scheduler = LookupScheduler(max_retries=2, backoff=0.01)
+    with pytest.raises(SourceUnavailable):
+        run_lookups(scheduler, source, [{"npi": "1234567890"}, {"npi": "1234567890"}])
+
+    assert len(source.calls) == 3
+    stats = scheduler.stats()["Registry"]
+    assert (stats["retries"], stats["failures"]) == (2, 1)
+
+
+def test_a_lookup_missing_from_the_response_fails_alone():
+    class PartialSource(StandInSource):
+        async def _respond(self, requests):
+            results = await super()._respond(requests)
+            return [{} if record["npi"] == "0000000001" else checks for (record, _), checks in zip(requests, results)]
+
+    source = PartialSource(batch_size=10)
+    scheduler = LookupScheduler(batch_window=0.01)
+    scheduled = ScheduledSource(source, scheduler)
+    records = [{"npi": f"{index:010d}"} for index in range(3)]
+
+    async def scenario():
+        lookups = (scheduled.verify(record, ["npi"]) for record in records)
+        return await asyncio.wait_for(asyncio.gather(*lookups, return_exceptions=True), 5)
+
+    first, second, third = asyncio.run(scenario())
+    assert first["npi"]["value"] == "0000000000"
+    assert isinstance(second, LookupError)
+    assert third["npi"]["value"] == "0000000002"
+    assert scheduler.stats()["Registry"]["failures"] == 1
+    assert not scheduler._inflight
@@ -0,0 +1,115 @@
+import asyncio
+import threading
+
+import pytest
+
+from pipeline import iter_pipeline, run_pipeline
+from sources import SourceAdapter, SourceUnavailable
+
+
+class CountingSource(SourceAdapter):
+    """Local stand-in source that tracks how many of its calls overlap and can
+    fail the call for one record."""
+
+    def __init__(self, name, keywords, concurrency=2, latency=0.005, fail_on=None):
+        self.name = name
+        self.keywords = keywords
+        self.concurrency = concurrency
+        self.latency = latency
+        self.fail_on = fail_on
+        self.active = 0
+        self.peak = 0
+
+    async def verify(self, record, columns):
+        self.active += 1
+        self.peak = max(self.peak, self.active)
+        try:
+            await asyncio.sleep(self.latency)
+            if record.get("npi") == self.fail_on:
+                raise SourceUnavailable("registry down")
+            return {col: {"value": record[col], "status": "verified", "source": self.name} for col in columns}
+        finally:
+            self.active -= 1
+
+
+def make_records(count):
+    return [{"npi": f"{index:010d}", "phone": f"555{index:07d}"} for index in range(count)]
+
+
+def collect(records, sources, max_in_flight=None):
+    async def scenario():
+        return [result async for result in run_pipeline(records, sources, max_in_flight)]
+
+    return asyncio.run(asyncio.wait_for(scenario(), 10))
+
+
+def consume_in_thread(iterator, limit=None):
+    # Guards against a pipeline that never finishes: the test fails instead of hanging.
+    outcome = {"results": []}
+
+    def consume():
+        try:
+            for result in iterator:
+                outcome["results"].append(result)
+                if limit is not None and len(outcome["results"]) == limit:
+                    break
+        except Exception as exc:
+            outcome["error"] = exc
+        finally:
+            iterator.close()
+
+    thread = threading.Thread(target=consume, daemon=True)
+    thread.start()
+    thread.join(10)
+    assert not thread.is_alive(), "pipeline did not finish"
+    return outcome
+
+
+def test_every_record_is_delivered_once_within_the_concurrency_limits():
+    registry = CountingSource("Registry", ("npi",), concurrency=3)
+    website = CountingSource("Website", ("phone",), concurrency=2)
+    results = collect(make_records(40), [registry, website], max_in_flight=8)
+
+    assert sorted(result["row"] for result in results) == list(range(40))
+    assert all(result["details"]["sources_used"] == ["Registry", "Website"] for result in results)
+    assert 1 < registry.peak <= 3
+    assert 1 < website.peak <= 2
+
+
+def test_providers_in_flight_are_capped():
+    source = CountingSource("Registry", ("npi", "phone"), concurrency=100)
+    collect(make_records(30), [source], max_in_flight=4)
+
+    assert source.peak == 4
+
+
+def test_a_failing_lookup_stops_the_run_with_its_error():
+    source = CountingSource("Registry", ("npi", "phone"), concurrency=4, fail_on=f"{5:010d}")
+
+    with pytest.raises(SourceUnavailable, match="registry down"):
+        collect(make_records(20), [source])
+
+
+def test_the_thread_bridge_delivers_every_result():
+    source = CountingSource("Registry", ("npi", "phone"), concurrency=4)
+    outcome = consume_in_thread(iter_pipeline(make_records(25), [source]))
+
+    assert "error" not in outcome
+    assert sorted(result["row"] for result in outcome["results"]) == list(range(25))
+
+
+def test_the_thread_bridge_reraises_a_failure_in_the_caller():
+    source = CountingSource("Registry", ("npi", "phone"), concurrency=4, fail_on=f"{5:010d}")
+    outcome = consume_in_thread(iter_pipeline(make_records(20), [source]))
+
+    assert isinstance(outcome["error"], SourceUnavailable)
+
+
+def test_the_thread_bridge_stops_when_the_caller_stops_reading():
+    source = CountingSource("Registry", ("npi", "phone"), concurrency=4)
+    before = {thread.ident for thread in threading.enumerate()}
+    outcome = consume_in_thread(iter_pipeline(make_records(500), [source]), limit=3)
+
+    assert len(outcome["results"]) == 3
+    workers = [t for t in threading.enumerate() if t.name == "validation-pipeline" and t.ident not in before]
+    assert workers == []
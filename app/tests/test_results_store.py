@@ -0,0 +1,52 @@
+import json
+
+import pandas as pd
+
+from results_store import ResultsStore
+
+PROVIDERS = [{"id": "prov_1", "provider_name": "Dr. Ada Smith", "details": {"changes": {"phone": "5551234567"}}}]
+METRICS = {"phone_corrected": 1, "address_updated": 0}
+
+
+def frames():
+    before = pd.DataFrame({"name": ["Dr. Ada Smith"], "phone": ["555-123"]})
+    after = pd.DataFrame({"name": ["Dr. Ada Smith"], "phone": ["5551234567"]})
+    return before, after
+
+
+def test_results_round_trip_through_pickle_and_meta(tmp_path):
+    store = ResultsStore(tmp_path)
+    before, after = frames()
+    saved = store.save("abc123", PROVIDERS, METRICS, before, after, source_name="providers.csv")
+
+    meta, providers, loaded_before, loaded_after = store.load("abc123")
+    assert meta == saved == store.load_meta("abc123")
+    assert (meta["dataset_hash"], meta["source_name"], meta["providers"]) == ("abc123", "providers.csv", 1)
+    assert meta["quality_metrics"] == METRICS
+    assert providers == PROVIDERS
+    pd.testing.assert_frame_equal(loaded_before, before)
+    pd.testing.assert_frame_equal(loaded_after, after)
+    assert json.loads((tmp_path / "abc123" / "meta.json").read_text(encoding="utf-8")) == meta
+    assert sorted(path.name for path in (tmp_path / "abc123").iterdir()) == ["meta.json", "results.pkl"]
+
+
+def test_unknown_or_incomplete_entries_are_misses(tmp_path):
+    store = ResultsStore(tmp_path)
+    assert store.load("missing") is None
+
+    # A save interrupted before meta.json was written leaves no usable entry.
+    (tmp_path / "partial").mkdir()
+    (tmp_path / "partial" / "results.pkl").write_bytes(b"")
+    assert store.load_meta("partial") is None
+    assert store.load("partial") is None
+
+
+def test_saving_again_replaces_the_entry(tmp_path):
+    store = ResultsStore(tmp_path)
+    before, after = frames()
+    store.save("abc123", PROVIDERS, METRICS, before, after)
+    store.save("abc123", PROVIDERS * 2, {}, before, after)
+
+    meta, providers, _, _ = store.load("abc123")
+    assert (meta["providers"], meta["source_name"], meta["quality_metrics"]) == (2, None, {})
+    assert len(providers) == 2
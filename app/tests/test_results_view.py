@@ -0,0 +1,51 @@
+from results_view import build_results_table, page_slice, query_results
+
+
+def provider(index, name, specialty, risk, confidence):
+    return {
+        "id": f"prov_{index}",
+        "provider_name": name,
+        "specialty": specialty,
+        "validation_status": risk,
+        "confidence_score": confidence,
+        "primary_issue": "None",
+    }
+
+
+TABLE = build_results_table(
+    [
+        provider(1, "Dr. Ada Smith", "Cardiology", "Low", 0.95),
+        provider(2, "Dr. Ben Jones", "Pediatrics", "High", 0.60),
+        provider(3, "Dr. Cara Diaz", "Cardiology", "Medium", 0.85),
+        provider(4, "Dr. Dan Wu", "Neurology", "High", 0.40),
+        provider(5, "Dr. Eve Park", "Oncology", "Low", 0.90),
+    ]
+)
+
+
+def ids(view):
+    return list(view["id"])
+
+
+def test_default_order_is_risk_then_lowest_confidence():
+    assert ids(query_results(TABLE)) == ["prov_4", "prov_2", "prov_3", "prov_5", "prov_1"]
+
+
+def test_search_matches_name_or_specialty_case_insensitively():
+    assert ids(query_results(TABLE, search="  CARDIO ")) == ["prov_3", "prov_1"]
+    assert ids(query_results(TABLE, search="wu")) == ["prov_4"]
+    assert query_results(TABLE, search="dr. z").empty
+
+
+def test_risk_filter_combines_with_search_and_sort():
+    view = query_results(TABLE, risk_levels=["High", "Low"], sort_by="Confidence (high → low)")
+    assert ids(view) == ["prov_1", "prov_5", "prov_2", "prov_4"]
+    assert ids(query_results(TABLE, search="dr.", risk_levels=["Medium"])) == ["prov_3"]
+    assert ids(query_results(TABLE, sort_by="Provider Name")) == [f"prov_{index}" for index in range(1, 6)]
+
+
+def test_pages_cover_the_view_without_overlap():
+    view = query_results(TABLE, sort_by="Confidence (low → high)")
+    pages = [ids(page_slice(view, page, 2)) for page in (1, 2, 3, 4)]
+
+    assert pages == [["prov_4", "prov_2"], ["prov_3", "prov_5"], ["prov_1"], []]
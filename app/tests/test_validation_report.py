@@ -0,0 +1,113 @@
+import threading
+
+import pandas as pd
+import pytest
+
+import validation_report
+from diff_engine import change_mask
+from results_view import build_results_table
+from validation_report import ReportJobs
+
+PROVIDERS = [
+    {
+        "id": f"prov_{index + 1}",
+        "provider_name": f"Dr. Provider {index + 1}",
+        "specialty": "Cardiology",
+        "validation_status": risk,
+        "confidence_score": confidence,
+        "primary_issue": "None",
+        "row": index,
+        "details": {"sources_used": ["NPI Registry"]},
+    }
+    for index, (risk, confidence) in enumerate([("High", 0.6), ("Low", 0.95), ("Medium", 0.8)])
+]
+
+
+def report_inputs(dataset_hash="abc123"):
+    before = pd.DataFrame({"phone": ["555-1", "555-2", "555-3"]})
+    after = pd.DataFrame({"phone": ["5550000001", "555-2", "555-3"]})
+    meta = {"dataset_hash": dataset_hash, "source_name": "providers.csv", "validated_at": "2026-01-01T00:00:00"}
+    return meta, PROVIDERS, build_results_table(PROVIDERS), before, after, change_mask(before, after)
+
+
+@pytest.fixture
+def renders(monkeypatch):
+    """Counts report renders; setting `gate` holds each render until it is set."""
+    state = {"count": 0, "gate": None}
+    write_report = validation_report.write_report
+
+    def counting_write(path, sections):
+        state["count"] += 1
+        if state["gate"] is not None:
+            state["gate"].wait(5)
+        return write_report(path, sections)
+
+    monkeypatch.setattr(validation_report, "write_report", counting_write)
+    return state
+
+
+def wait_until_done(jobs, dataset_hash):
+    thread = jobs._threads.get(dataset_hash)
+    if thread is not None:
+        thread.join(5)
+        assert not thread.is_alive()
+
+
+def test_a_report_is_rendered_once_and_then_served_from_disk(tmp_path, renders):
+    jobs = ReportJobs(tmp_path)
+    assert jobs.status("abc123") is None
+
+    jobs.start(*report_inputs())
+    wait_until_done(jobs, "abc123")
+    assert jobs.status("abc123") == "ready"
+    html = jobs.path("abc123").read_text(encoding="utf-8")
+    assert "Dr. Provider 1" in html and "phone: 555-1 → 5550000001" in html
+    assert not list(tmp_path.glob("**/*.tmp"))
+
+    jobs.start(*report_inputs())
+    ReportJobs(tmp_path).start(*report_inputs())  # a new session finds it on disk too
+    wait_until_done(jobs, "abc123")
+    assert renders["count"] == 1
+
+
+def test_forcing_while_rendering_queues_exactly_one_rerender(tmp_path, renders):
+    jobs = ReportJobs(tmp_path)
+    renders["gate"] = threading.Event()
+    jobs.start(*report_inputs())
+    assert jobs.status("abc123") == "running"
+
+    jobs.start(*report_inputs(), force=True)
+    jobs.start(*report_inputs(), force=True)
+    renders["gate"].set()
+    wait_until_done(jobs, "abc123")
+
+    assert renders["count"] == 2
+    assert jobs.status("abc123") == "ready"
+
+
+def test_forcing_a_finished_report_renders_it_again(tmp_path, renders):
+    jobs = ReportJobs(tmp_path)
+    jobs.start(*report_inputs())
+    wait_until_done(jobs, "abc123")
+    jobs.start(*report_inputs(), force=True)
+    wait_until_done(jobs, "abc123")
+
+    assert renders["count"] == 2
+    assert jobs.status("abc123") == "ready"
+
+
+def test_a_failed_render_is_reported_and_leaves_no_report(tmp_path, renders):
+    jobs = ReportJobs(tmp_path)
+    meta, providers, table, before, after, mask = report_inputs()
+    providers = [{**provider, "details": {}} for provider in providers]  # no sources_used
+    jobs.start(meta, providers, table, before, after, mask)
+    wait_until_done(jobs, "abc123")
+
+    assert jobs.status("abc123") == "failed"
+    assert isinstance(jobs.error("abc123"), KeyError)
+    assert not jobs.path("abc123").exists()
+
+    jobs.start(*report_inputs(), force=True)
+    wait_until_done(jobs, "abc123")
+    assert jobs.status("abc123") == "ready"
+    assert jobs.error("abc123") is None
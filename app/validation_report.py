@@ -0,0 +1,227 @@
+import html
+import os
+import threading
+from datetime import datetime
+from pathlib import Path
+
+import numpy as np
+
+from results_view import RISK_ORDER, query_results
+
+REPORTS_DIR = Path(__file__).parent / "reports"
+REPORT_FILENAME = "validation_report.html"
+SECTION_ROWS = 1000
+
+RISK_COLORS = {"High": "#C62828", "Medium": "#F9A825", "Low": "#2E7D32"}
+QUALITY_LABELS = {
+    "phone_corrected": "Phone numbers corrected",
+    "address_updated": "Addresses updated",
+    "missing_filled": "Missing fields filled",
+    "other_updates": "Other updates",
+}
+
+STYLE = """
+body { font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif; color: #333; margin: 2rem; }
+h1, h2, h3 { color: #0E2A47; }
+table { border-collapse: collapse; width: 100%; font-size: 0.85em; margin-bottom: 1rem; }
+th, td { border-bottom: 1px solid #E3E6E8; padding: 4px 8px; text-align: left; vertical-align: top; }
+th { background: #F8F9FA; }
+.kpis { display: flex; gap: 1rem; flex-wrap: wrap; }
+.kpi { background: #F8F9FA; border: 1px solid #E3E6E8; border-radius: 0.5rem; padding: 10px 16px; }
+.kpi b { display: block; font-size: 1.4em; color: #0E2A47; }
+.charts { display: flex; gap: 2rem; flex-wrap: wrap; }
+.changes { color: #555; }
+@media print { body { margin: 0; } h2 { page-break-before: always; } }
+"""
+
+
+def _escape(value):
+    return html.escape(str(value))
+
+
+def bar_chart_svg(title, items, width=420, bar_height=22):
+    # items: (label, value, color) tuples, drawn as horizontal bars.
+    label_width = 170
+    peak = max((value for _, value, _ in items), default=0) or 1
+    height = 30 + len(items) * (bar_height + 8)
+    parts = [
+        f'<svg xmlns="http://www.w3.org/2000/svg" width="{width}" height="{height}" role="img">',
+        f'<text x="0" y="16" font-size="14" font-weight="bold" fill="#0E2A47">{_escape(title)}</text>',
+    ]
+    for position, (label, value, color) in enumerate(items):
+        y = 30 + position * (bar_height + 8)
+        length = (width - label_width - 60) * value / peak
+        parts.append(f'<text x="0" y="{y + 15}" font-size="12">{_escape(label)}</text>')
+        parts.append(f'<rect x="{label_width}" y="{y}" width="{length:.1f}" height="{bar_height}" fill="{color}"/>')
+        parts.append(f'<text x="{label_width + length + 6:.1f}" y="{y + 15}" font-size="12">{value}</text>')
+    parts.append("</svg>")
+    return "".join(parts)
+
+
+def _summary_section(meta, table):
+    total = len(table)
+    flagged = int((table["Risk Level"] == "High").sum())
+    average = table["Confidence Score"].mean() if total else 0.0
+    kpis = [
+        ("Providers processed", total),
+        ("Flagged for review", flagged),
+        ("Average confidence", f"{average:.1%}"),
+        ("Estimated effort saved", f"~{total * 5} mins"),
+    ]
+    return (
+        "<h1>Provider Validation Report</h1>"
+        f"<p>Dataset <code>{_escape(meta.get('source_name') or meta['dataset_hash'][:12])}</code>, "
+        f"validated {_escape(meta['validated_at'])}.</p>"
+        '<div class="kpis">'
+        + "".join(f'<div class="kpi">{_escape(label)}<b>{_escape(value)}</b></div>' for label, value in kpis)
+        + "</div>"
+    )
+
+
+def _charts_section(table, quality_metrics):
+    risk_counts = table["Risk Level"].value_counts()
+    risk_chart = bar_chart_svg(
+        "Providers by risk level",
+        [(risk, int(risk_counts.get(risk, 0)), RISK_COLORS[risk]) for risk in RISK_ORDER],
+    )
+    counts, edges = np.histogram(table["Confidence Score"], bins=5, range=(0.0, 1.0))
+    confidence_chart = bar_chart_svg(
+        "Confidence score distribution",
+        [(f"{low:.0%} – {high:.0%}", int(count), "#1565C0") for low, high, count in zip(edges, edges[1:], counts)],
+    )
+    quality_chart = bar_chart_svg(
+        "Data quality improvements",
+        [(label, int(quality_metrics.get(key, 0)), "#00897B") for key, label in QUALITY_LABELS.items()],
+    )
+    return f'<h2>Summary Charts</h2><div class="charts">{risk_chart}{confidence_chart}{quality_chart}</div>'
+
+
+def _changes_cell(columns, before, after, changed):
+    return "<br>".join(
+        f"{_escape(col)}: {_escape(old)} → {_escape(new)}"
+        for col, old, new, flag in zip(columns, before, after, changed)
+        if flag
+    )
+
+
+def _risk_section(risk, rows, providers_by_id, before_df, after_df, mask):
+    yield f"<h2>{_escape(risk)} Risk Providers ({len(rows)})</h2>"
+    if rows.empty:
+        yield "<p>None.</p>"
+        return
+    columns = list(before_df.columns)
+    header = "".join(
+        f"<th>{name}</th>"
+        for name in ("Provider", "Specialty", "Confidence", "Primary Issue", "Sources", "Changes")
+    )
+    # Rows are rendered SECTION_ROWS at a time so only one chunk of the
+    # before/after frames is materialized as Python objects at once.
+    for start in range(0, len(rows), SECTION_ROWS):
+        chunk = rows.iloc[start:start + SECTION_ROWS]
+        positions = [providers_by_id[provider_id]["row"] for provider_id in chunk["id"]]
+        before_chunk = before_df.iloc[positions].to_numpy(dtype=object)
+        after_chunk = after_df.iloc[positions].to_numpy(dtype=object)
+        mask_chunk = mask.iloc[positions].to_numpy()
+        lines = [f"<table><thead><tr>{header}</tr></thead><tbody>"]
+        for offset, row in enumerate(chunk.to_dict("records")):
+            provider = providers_by_id[row["id"]]
+            changes = _changes_cell(columns, before_chunk[offset], after_chunk[offset], mask_chunk[offset])
+            lines.append(
+                f"<tr><td>{_escape(row['Provider Name'])}</td><td>{_escape(row['Specialty'])}</td>"
+                f"<td>{row['Confidence Score']:.0%}</td><td>{_escape(row['Primary Issue'])}</td>"
+                f"<td>{_escape(', '.join(provider['details']['sources_used']))}</td>"
+                f'<td class="changes">{changes or "—"}</td></tr>'
+            )
+        lines.append("</tbody></table>")
+        yield "".join(lines)
+
+
+def iter_report_sections(meta, providers, table, before_df, after_df, mask):
+    quality_metrics = meta.get("quality_metrics", {})
+    yield f'<!DOCTYPE html><html><head><meta charset="utf-8"><title>Provider Validation Report</title><style>{STYLE}</style></head><body>'
+    yield _summary_section(meta, table)
+    yield _charts_section(table, quality_metrics)
+    providers_by_id = {provider["id"]: provider for provider in providers}
+    for risk in RISK_ORDER:
+        rows = query_results(table, risk_levels=[risk], sort_by="Confidence (low → high)")
+        yield from _risk_section(risk, rows, providers_by_id, before_df, after_df, mask)
+    yield f"<p><small>Generated {datetime.now().isoformat(timespec='seconds')}.</small></p></body></html>"
+
+
+def report_path(dataset_hash, root=REPORTS_DIR):
+    return Path(root) / dataset_hash / REPORT_FILENAME
+
+
+def write_report(path, sections):
+    # Sections are streamed to a temporary file and renamed into place, so a
+    # report on disk is always complete.
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_suffix(path.suffix + ".tmp")
+    with open(tmp_path, "w", encoding="utf-8") as handle:
+        for section in sections:
+            handle.write(section)
+    os.replace(tmp_path, path)
+    return path
+
+
+# Renders reports on background threads, one per dataset hash, and serves an
+# already-rendered report straight from disk.
+class ReportJobs:
+    def __init__(self, root=REPORTS_DIR):
+        self.root = Path(root)
+        self._lock = threading.Lock()
+        self._threads = {}
+        self._pending = {}
+        self._errors = {}
+
+    def path(self, dataset_hash):
+        return report_path(dataset_hash, self.root)
+
+    def start(self, meta, providers, table, before_df, after_df, mask, force=False):
+        dataset_hash = meta["dataset_hash"]
+        with self._lock:
+            sections = iter_report_sections(meta, providers, table, before_df, after_df, mask)
+            thread = self._threads.get(dataset_hash)
+            if thread is not None and thread.is_alive():
+                # Results were replaced mid-render: render again once this one is done.
+                if force:
+                    self._pending[dataset_hash] = sections
+                return
+            if not force and self.path(dataset_hash).exists():
+                return
+            if force:
+                self.path(dataset_hash).unlink(missing_ok=True)
+            self._launch(dataset_hash, sections)
+
+    def _launch(self, dataset_hash, sections):
+        self._errors.pop(dataset_hash, None)
+        thread = threading.Thread(
+            target=self._run, args=(dataset_hash, sections), name=f"report-{dataset_hash[:12]}", daemon=True
+        )
+        self._threads[dataset_hash] = thread
+        thread.start()
+
+    def _run(self, dataset_hash, sections):
+        while sections is not None:
+            try:
+                write_report(self.path(dataset_hash), sections)
+            except Exception as exc:
+                self._errors[dataset_hash] = exc
+            with self._lock:
+                sections = self._pending.pop(dataset_hash, None)
+                if sections is not None:
+                    self._errors.pop(dataset_hash, None)
+
+    def status(self, dataset_hash):
+        with self._lock:
+            thread = self._threads.get(dataset_hash)
+            if thread is not None and thread.is_alive():
+                return "running"
+        if dataset_hash in self._errors:
+            return "failed"
+        if self.path(dataset_hash).exists():
+            return "ready"
+        return None
+
+    def error(self, dataset_hash):
+        return self._errors.get(dataset_hash)
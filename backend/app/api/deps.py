@@ -1,17 +1,20 @@
+from collections.abc import Generator
+
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
 from sqlalchemy.orm import Session
 
 from app.core.security import decode_access_token
 from app.crud.user import get_by_email
-from app.db.session import get_db
+from app.db.routing import read_router
+from app.db.session import get_read_db
 from app.models.user import User
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/v1/auth/login")
 
 
 def get_current_user(
-    db: Session = Depends(get_db), token: str = Depends(oauth2_scheme)
+    db: Session = Depends(get_read_db), token: str = Depends(oauth2_scheme)
 ) -> User:
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
@@ -31,3 +34,28 @@ def get_current_user(
     if not user or not user.is_active:
         raise credentials_exception
     return user
+
+
+def get_current_superuser(current_user: User = Depends(get_current_user)) -> User:
+    if not current_user.is_superuser:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Admin privileges required.")
+    return current_user
+
+
+def get_routed_read_db(
+    current_user: User = Depends(get_current_user),
+    lookup_db: Session = Depends(get_read_db),
+) -> Generator[Session, None, None]:
+    # `lookup_db` is the session get_current_user just used. Its connection is
+    # returned to the pool before routing so a request never holds two reader
+    # connections; primary reads reuse the session, which checks one out again.
+    lookup_db.close()
+    factory = read_router.session_factory(current_user.id)
+    if factory is read_router.primary:
+        yield lookup_db
+        return
+    db = factory()
+    try:
+        yield db
+    finally:
+        db.close()
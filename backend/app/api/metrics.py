@@ -0,0 +1,49 @@
+from __future__ import annotations
+
+from collections.abc import Iterator
+
+from fastapi import APIRouter
+from fastapi.responses import Response
+
+from app.core.hashing import password_hasher
+from app.core.metrics import CONTENT_TYPE, registry
+from app.db.pool import pool_snapshots
+
+router = APIRouter()
+
+POOL_GAUGES = {
+    "checked_out": ("db_pool_checked_out", "gauge", "Connections currently checked out."),
+    "pool_size": ("db_pool_size", "gauge", "Configured pool size."),
+    "checkouts_total": ("db_pool_checkouts_total", "counter", "Connection checkouts."),
+    "timeouts_total": ("db_pool_timeouts_total", "counter", "Checkouts that timed out."),
+}
+HASHING_GAUGES = {
+    "in_flight": ("password_hash_in_flight", "gauge", "Password hashes running."),
+    "queue_depth": ("password_hash_queue_depth", "gauge", "Password hashes waiting for a worker."),
+    "rejected_total": ("password_hash_rejected_total", "counter", "Hashes refused by admission control."),
+}
+
+
+def _live_metrics() -> Iterator[str]:
+    # Pool and hashing state already lives in their own stats objects; read it
+    # at scrape time rather than mirroring every change into the registry.
+    snapshots = pool_snapshots()
+    for field, (name, kind, documentation) in POOL_GAUGES.items():
+        yield f"# HELP {name} {documentation}"
+        yield f"# TYPE {name} {kind}"
+        for snapshot in snapshots:
+            if snapshot[field] is not None:
+                yield f'{name}{{pool="{snapshot["name"]}"}} {snapshot[field]}'
+    stats = password_hasher.stats()
+    for field, (name, kind, documentation) in HASHING_GAUGES.items():
+        yield f"# HELP {name} {documentation}"
+        yield f"# TYPE {name} {kind}"
+        yield f"{name} {stats[field]}"
+
+
+registry.add_collector(_live_metrics)
+
+
+@router.get("/metrics", include_in_schema=False)
+def metrics() -> Response:
+    return Response(content=registry.render(), media_type=CONTENT_TYPE)
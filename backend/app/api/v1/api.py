@@ -1,8 +1,9 @@
 from fastapi import APIRouter
 
-from app.api.v1.endpoints import auth, health, providers
+from app.api.v1.endpoints import auth, health, profiling, providers
 
 api_router = APIRouter()
 api_router.include_router(health.router)
 api_router.include_router(auth.router)
 api_router.include_router(providers.router)
+api_router.include_router(profiling.router)
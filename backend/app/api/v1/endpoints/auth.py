@@ -1,11 +1,13 @@
 from fastapi import APIRouter, Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordRequestForm
 from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
 
 from app.api.deps import get_current_user
+from app.core.hashing import PasswordHasherBusy
 from app.core.security import create_access_token
-from app.crud.user import authenticate, create_user, get_by_email
-from app.db.session import get_db
+from app.crud.user import authenticate_async, create_user_async, get_by_email
+from app.db.session import get_db, get_read_db
 from app.models.user import User
 from app.schemas.auth import RegisterRequest, TokenResponse
 from app.schemas.user import UserRead
@@ -13,20 +15,40 @@ from app.schemas.user import UserRead
 router = APIRouter(prefix="/auth", tags=["auth"])
 
 
+def _hashing_unavailable(exc: PasswordHasherBusy) -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        detail="Authentication is temporarily saturated. Please retry shortly.",
+        headers={"Retry-After": str(exc.retry_after)},
+    )
+
+
 @router.post("/register", response_model=UserRead, status_code=status.HTTP_201_CREATED)
-def register(payload: RegisterRequest, db: Session = Depends(get_db)) -> UserRead:
-    existing = get_by_email(db, email=payload.email)
+async def register(
+    payload: RegisterRequest,
+    db: Session = Depends(get_db),
+    read_db: Session = Depends(get_read_db),
+) -> UserRead:
+    existing = await run_in_threadpool(get_by_email, read_db, payload.email)
+    # The reader connection goes back to the pool before the password is hashed.
+    read_db.close()
     if existing:
         raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="Email already registered.")
-    user = create_user(db, email=payload.email, password=payload.password)
+    try:
+        user = await create_user_async(db, email=payload.email, password=payload.password)
+    except PasswordHasherBusy as exc:
+        raise _hashing_unavailable(exc) from exc
     return UserRead.model_validate(user)
 
 
 @router.post("/login", response_model=TokenResponse)
-def login(
-    form_data: OAuth2PasswordRequestForm = Depends(), db: Session = Depends(get_db)
+async def login(
+    form_data: OAuth2PasswordRequestForm = Depends(), db: Session = Depends(get_read_db)
 ) -> TokenResponse:
-    user = authenticate(db, email=form_data.username, password=form_data.password)
+    try:
+        user = await authenticate_async(db, email=form_data.username, password=form_data.password)
+    except PasswordHasherBusy as exc:
+        raise _hashing_unavailable(exc) from exc
     if not user:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid credentials.")
     token = create_access_token(subject=user.email)
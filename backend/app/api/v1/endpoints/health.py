@@ -3,7 +3,12 @@ from sqlalchemy.orm import Session
 
 from fastapi import APIRouter, Depends
 
+from app.api.deps import get_current_superuser
+from app.core.hashing import password_hasher
+from app.db.pool import pool_snapshots
+from app.db.routing import read_router
 from app.db.session import get_db
+from app.schemas.health import PasswordHashingStats, PoolStats, ReplicaStats
 
 router = APIRouter(tags=["health"])
 
@@ -13,7 +18,34 @@ def health() -> dict[str, str]:
     return {"status": "ok"}
 
 
+@router.get(
+    "/health/hashing",
+    response_model=PasswordHashingStats,
+    dependencies=[Depends(get_current_superuser)],
+)
+def hashing_stats() -> PasswordHashingStats:
+    return PasswordHashingStats.model_validate(password_hasher.stats())
+
+
 @router.get("/ready")
 def ready(db: Session = Depends(get_db)) -> dict[str, str]:
     db.execute(text("SELECT 1"))
     return {"status": "ready"}
+
+
+@router.get(
+    "/ready/pool",
+    response_model=list[PoolStats],
+    dependencies=[Depends(get_current_superuser)],
+)
+def pool_stats() -> list[PoolStats]:
+    return [PoolStats(**snapshot) for snapshot in pool_snapshots()]
+
+
+@router.get(
+    "/ready/replica",
+    response_model=ReplicaStats,
+    dependencies=[Depends(get_current_superuser)],
+)
+def replica_stats() -> ReplicaStats:
+    return ReplicaStats(**read_router.stats())
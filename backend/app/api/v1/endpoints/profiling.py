@@ -0,0 +1,68 @@
+from typing import Literal
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.responses import JSONResponse, PlainTextResponse, Response
+
+from app.api.deps import get_current_superuser
+from app.core.config import settings
+from app.core.sampler import SamplerBusy, sample_stacks
+from app.db.profiler import profile_store
+from app.schemas.profiling import SqlProfile, SqlProfileSummary
+
+router = APIRouter(
+    prefix="/profiling",
+    tags=["profiling"],
+    dependencies=[Depends(get_current_superuser)],
+)
+
+
+def _require_sql_profiling() -> None:
+    if not settings.sql_profiling_enabled:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="SQL profiling is disabled. Set APP_SQL_PROFILING_ENABLED=true.",
+        )
+
+
+@router.get("/sql", response_model=list[SqlProfileSummary])
+def recent_sql_profiles(limit: int = Query(50, ge=1, le=500)) -> list[SqlProfileSummary]:
+    _require_sql_profiling()
+    return [SqlProfileSummary(**profile.summary()) for profile in profile_store.recent(limit)]
+
+
+@router.get("/sql/{request_id}", response_model=SqlProfile)
+def sql_profile(request_id: str) -> SqlProfile:
+    _require_sql_profiling()
+    profile = profile_store.get(request_id)
+    if profile is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="No profile for that request ID.")
+    return SqlProfile(**profile.detail())
+
+
+@router.get("/cpu", response_class=PlainTextResponse)
+async def cpu_profile(
+    seconds: float = Query(10.0, gt=0),
+    interval_ms: float = Query(10.0, ge=1, le=1000),
+    format: Literal["collapsed", "speedscope"] = "collapsed",
+    include_idle: bool = False,
+) -> Response:
+    """Sample the stacks of every thread in this worker for ``seconds``."""
+    if seconds > settings.profiler_max_seconds:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=f"seconds must be at most {settings.profiler_max_seconds:g}.",
+        )
+    try:
+        profile = await sample_stacks(seconds, interval_ms / 1000, settings.profiler_max_overhead, include_idle)
+    except SamplerBusy as exc:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=str(exc)) from exc
+
+    headers = {
+        "X-Profile-Samples": str(profile.samples),
+        "X-Profile-Interval-Ms": f"{profile.interval * 1000:g}",
+        "X-Profile-Overhead": f"{profile.overhead:.4f}",
+    }
+    if format == "speedscope":
+        headers["Content-Disposition"] = 'attachment; filename="profile.speedscope.json"'
+        return JSONResponse(profile.speedscope(), headers=headers)
+    return PlainTextResponse(profile.collapsed(), headers=headers)
@@ -1,35 +1,62 @@
 from __future__ import annotations
 
+import asyncio
 import csv
 import io
+from collections.abc import AsyncIterator
+from typing import Any
 
 from fastapi import APIRouter, Depends, File, HTTPException, Query, UploadFile, status
-from fastapi.responses import Response
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import Response, StreamingResponse
 from sqlalchemy.orm import Session
 
-from app.api.deps import get_current_user
+from app.api.deps import get_current_user, get_routed_read_db
+from app.core.config import settings
+from app.crud.duplicate import index_unindexed_providers, list_duplicate_clusters
 from app.crud.provider import (
     create_provider_batch,
     get_provider,
+    get_providers_by_ids,
     list_providers,
     revalidate_all_for_owner,
     revalidate_provider,
+    revalidate_providers,
+    set_validation_status,
     summary,
 )
-from app.db.session import get_db
+from app.db.routing import read_router
+from app.db.session import get_db, get_read_db
 from app.models.provider import RiskLevel
 from app.models.user import User
 from app.schemas.provider import (
     BatchValidationResult,
+    BulkUpdateResult,
+    DuplicateCluster,
+    DuplicateClusterListResponse,
+    DuplicateScanResult,
     ImportResult,
+    ProviderBatchResponse,
+    ProviderIds,
     ProviderListResponse,
     ProviderRead,
+    ProviderStatusDecision,
     ProviderSummary,
 )
+from app.services.change_stream import (
+    ProviderChange,
+    Subscription,
+    change_broker,
+    current_summary,
+    format_event,
+    provider_changes,
+    publish_change,
+)
 
 router = APIRouter(prefix="/providers", tags=["providers"])
 
 REQUIRED_COLUMNS = {"provider_name", "specialty", "npi", "phone", "address"}
+OPTIONAL_COLUMNS = {"city": ("city",), "state": ("state",), "zip_code": ("zip_code", "zip", "postal_code")}
 
 
 def _parse_csv(content: bytes) -> list[dict[str, str]]:
@@ -58,6 +85,10 @@ def _parse_csv(content: bytes) -> list[dict[str, str]]:
                 "npi": normalized_row.get("npi", ""),
                 "phone": normalized_row.get("phone", ""),
                 "address": normalized_row.get("address", ""),
+                **{
+                    field: next((normalized_row[name] for name in names if normalized_row.get(name)), "")
+                    for field, names in OPTIONAL_COLUMNS.items()
+                },
             }
         )
     return rows
@@ -77,9 +108,13 @@ async def import_csv(
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Uploaded file is empty.")
 
     rows = _parse_csv(content)
+    change = ProviderChange(current_user.id, "import")
     records = create_provider_batch(
-        db, owner_id=current_user.id, rows=rows, source_file=file.filename
+        db, owner_id=current_user.id, rows=rows, source_file=file.filename, delta=change.delta
     )
+    change.provider_ids = [record.id for record in records]
+    await run_in_threadpool(publish_change, change)
+    read_router.record_write(current_user.id)
     return ImportResult(imported=len(records), source_file=file.filename)
 
 
@@ -90,7 +125,7 @@ def list_all(
     risk_level: RiskLevel | None = Query(None),
     min_confidence: float | None = Query(None, ge=0.0, le=1.0),
     search: str | None = Query(None, max_length=200),
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_routed_read_db),
     current_user: User = Depends(get_current_user),
 ) -> ProviderListResponse:
     items, total = list_providers(
@@ -112,25 +147,174 @@ def list_all(
 
 @router.get("/summary", response_model=ProviderSummary)
 def get_summary(
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_routed_read_db),
     current_user: User = Depends(get_current_user),
 ) -> ProviderSummary:
     result = summary(db, owner_id=current_user.id)
     return ProviderSummary(**result)
 
 
+@router.get("/duplicates", response_model=DuplicateClusterListResponse)
+def list_duplicates(
+    page: int = Query(1, ge=1),
+    page_size: int = Query(25, ge=1, le=100),
+    db: Session = Depends(get_routed_read_db),
+    current_user: User = Depends(get_current_user),
+) -> DuplicateClusterListResponse:
+    clusters, total = list_duplicate_clusters(
+        db, owner_id=current_user.id, page=page, page_size=page_size
+    )
+    return DuplicateClusterListResponse(
+        clusters=[
+            DuplicateCluster(
+                cluster_id=cluster_id,
+                providers=[ProviderRead.model_validate(provider) for provider in providers],
+            )
+            for cluster_id, providers in clusters
+        ],
+        total=total,
+        page=page,
+        page_size=page_size,
+    )
+
+
+@router.post("/duplicates/scan", response_model=DuplicateScanResult)
+def scan_duplicates(
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+) -> DuplicateScanResult:
+    # Imports are indexed as they land; this catches up providers imported
+    # before duplicate detection existed.
+    indexed = index_unindexed_providers(db, owner_id=current_user.id)
+    read_router.record_write(current_user.id)
+    return DuplicateScanResult(indexed=indexed)
+
+
 @router.post("/validate-all", response_model=BatchValidationResult)
 def validate_all(
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ) -> BatchValidationResult:
-    processed = revalidate_all_for_owner(db, owner_id=current_user.id)
+    with provider_changes(current_user.id, "validate_all") as change:
+        processed = revalidate_all_for_owner(db, owner_id=current_user.id, delta=change.delta)
+        change.provider_ids = None
+    read_router.record_write(current_user.id)
     return BatchValidationResult(processed=processed)
 
 
+def _unique_ids(payload: ProviderIds) -> list[str]:
+    ids = list(dict.fromkeys(payload.ids))
+    if len(ids) > settings.bulk_max_ids:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=f"At most {settings.bulk_max_ids} provider IDs per request.",
+        )
+    return ids
+
+
+# Declared before the /{provider_id} routes, which would otherwise match
+# "bulk" as a provider id.
+@router.post("/bulk/get", response_model=ProviderBatchResponse)
+def get_many(
+    payload: ProviderIds,
+    db: Session = Depends(get_routed_read_db),
+    current_user: User = Depends(get_current_user),
+) -> ProviderBatchResponse:
+    ids = _unique_ids(payload)
+    providers = get_providers_by_ids(db, owner_id=current_user.id, provider_ids=ids)
+    found = {provider.id for provider in providers}
+    return ProviderBatchResponse(
+        items=[ProviderRead.model_validate(provider) for provider in providers],
+        missing=[provider_id for provider_id in ids if provider_id not in found],
+    )
+
+
+@router.post("/bulk/validate", response_model=BulkUpdateResult)
+def validate_many(
+    payload: ProviderIds,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+) -> BulkUpdateResult:
+    ids = _unique_ids(payload)
+    with provider_changes(current_user.id, "validate") as change:
+        change.provider_ids = revalidate_providers(
+            db, owner_id=current_user.id, provider_ids=ids, delta=change.delta
+        )
+    updated = set(change.provider_ids)
+    read_router.record_write(current_user.id)
+    return BulkUpdateResult(
+        updated=len(updated), missing=[provider_id for provider_id in ids if provider_id not in updated]
+    )
+
+
+@router.post("/bulk/status", response_model=BulkUpdateResult)
+def set_status_many(
+    payload: ProviderStatusDecision,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+) -> BulkUpdateResult:
+    ids = _unique_ids(payload)
+    with provider_changes(current_user.id, "status") as change:
+        change.provider_ids = set_validation_status(
+            db, owner_id=current_user.id, provider_ids=ids, validation_status=payload.validation_status
+        )
+    updated = set(change.provider_ids)
+    read_router.record_write(current_user.id)
+    return BulkUpdateResult(
+        updated=len(updated), missing=[provider_id for provider_id in ids if provider_id not in updated]
+    )
+
+
+async def _event_stream(subscription: Subscription, ready: dict[str, Any]) -> AsyncIterator[str]:
+    # The browser reconnects after `retry` ms if the stream drops; comments
+    # keep idle connections from being closed by proxies.
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + settings.change_stream_max_seconds
+    try:
+        yield "retry: 5000\n\n"
+        yield format_event(ready)
+        while (remaining := deadline - loop.time()) > 0:
+            try:
+                event = await asyncio.wait_for(
+                    subscription.queue.get(), min(settings.change_stream_heartbeat_seconds, remaining)
+                )
+            except TimeoutError:
+                yield ": keep-alive\n\n"
+                continue
+            yield format_event(event)
+        yield format_event({"type": "reconnect"})
+    finally:
+        change_broker.unsubscribe(subscription)
+
+
+@router.get("/events")
+async def provider_events(
+    current_user: User = Depends(get_current_user),
+    lookup_db: Session = Depends(get_read_db),
+) -> StreamingResponse:
+    """Server-sent events for the caller's providers; see app.services.change_stream."""
+    if not settings.change_stream_enabled:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="The change stream is disabled.")
+    # The stream may stay open for hours; it must not hold a pooled connection.
+    owner_id = current_user.id
+    lookup_db.close()
+    # Subscribed first, so no change can fall between the summary and the stream.
+    subscription = change_broker.subscribe(owner_id)
+    try:
+        summary_now = await run_in_threadpool(current_summary, owner_id)
+    except Exception:
+        change_broker.unsubscribe(subscription)
+        raise
+    return StreamingResponse(
+        _event_stream(subscription, {"type": "ready", "summary": summary_now}),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
 @router.get("/export/csv")
 def export_csv(
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_routed_read_db),
     current_user: User = Depends(get_current_user),
 ) -> Response:
     items, _ = list_providers(
@@ -180,7 +364,7 @@ def export_csv(
 @router.get("/{provider_id}", response_model=ProviderRead)
 def get_one(
     provider_id: str,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_routed_read_db),
     current_user: User = Depends(get_current_user),
 ) -> ProviderRead:
     provider = get_provider(db, provider_id=provider_id, owner_id=current_user.id)
@@ -198,5 +382,8 @@ def validate_one(
     provider = get_provider(db, provider_id=provider_id, owner_id=current_user.id)
     if not provider:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Provider not found.")
-    provider = revalidate_provider(db, provider=provider)
+    with provider_changes(current_user.id, "validate") as change:
+        provider = revalidate_provider(db, provider=provider, delta=change.delta)
+        change.provider_ids = [provider.id]
+    read_router.record_write(current_user.id)
     return ProviderRead.model_validate(provider)
@@ -1,16 +1,48 @@
-from sqlalchemy.orm import Session
+import logging
+import threading
+
+from sqlalchemy.orm import Session, sessionmaker
 
 from app.core.config import settings
-from app.crud.user import create_user, get_by_email
+from app.core.security import create_password_hash
+from app.crud.user import create_user_with_hash, get_by_email
+
+logger = logging.getLogger(__name__)
+
+bootstrap_done = threading.Event()
 
 
 def bootstrap_admin_user(db: Session) -> None:
     admin = get_by_email(db, settings.bootstrap_admin_email)
     if admin:
         return
-    create_user(
+    # End the lookup's transaction so the connection (the only one in the tuned
+    # SQLite writer pool) is not held while bcrypt runs.
+    db.rollback()
+    hashed_password = create_password_hash(settings.bootstrap_admin_password)
+    create_user_with_hash(
         db=db,
         email=settings.bootstrap_admin_email,
-        password=settings.bootstrap_admin_password,
+        hashed_password=hashed_password,
         is_superuser=True,
     )
+
+
+def _run_bootstrap(session_factory: sessionmaker[Session]) -> None:
+    try:
+        with session_factory() as db:
+            bootstrap_admin_user(db)
+    except Exception:
+        logger.exception("Admin bootstrap failed.")
+    finally:
+        bootstrap_done.set()
+
+
+def start_bootstrap(session_factory: sessionmaker[Session]) -> threading.Thread | None:
+    if bootstrap_done.is_set():
+        return None
+    thread = threading.Thread(
+        target=_run_bootstrap, args=(session_factory,), name="admin-bootstrap", daemon=True
+    )
+    thread.start()
+    return thread
@@ -2,7 +2,7 @@ from __future__ import annotations
 
 import json
 from functools import lru_cache
-from typing import Any
+from typing import Any, Literal
 
 from pydantic import field_validator
 from pydantic_settings import BaseSettings, SettingsConfigDict
@@ -17,10 +17,66 @@ class Settings(BaseSettings):
     access_token_expire_minutes: int = 120
 
     database_url: str = "sqlite:///./provider_ops.db"
+    db_pool_size: int = 5
+    db_max_overflow: int = 10
+    db_pool_timeout: float = 30.0
+    db_pool_recycle: int = 1800
+    db_pool_pre_ping: bool = True
+    db_pool_retry_after_seconds: int = 5
+
+    replica_database_url: str | None = None
+    read_your_writes_seconds: float = 5.0
+    replica_max_lag_seconds: float = 30.0
+    replica_lag_check_seconds: float = 5.0
+    replica_heartbeat_seconds: float = 1.0
+
+    sqlite_tuned: bool = True
+    sqlite_read_pool_size: int = 4
+    sqlite_synchronous: Literal["OFF", "NORMAL", "FULL"] = "NORMAL"
+    sqlite_busy_timeout_ms: int = 5000
+    sqlite_mmap_size: int = 256 * 1024 * 1024
+    sqlite_cache_size_kib: int = 64 * 1024
     cors_origins: list[str] = ["http://localhost:5173"]
 
     bootstrap_admin_email: str = "admin@providerops.local"
     bootstrap_admin_password: str = "ChangeMe123!"
+    defer_bootstrap: bool = True
+
+    password_hash_workers: int = 2
+    password_hash_queue_size: int = 32
+    password_hash_retry_after_seconds: int = 2
+
+    npi_index_path: str | None = None
+    postal_index_path: str | None = None
+
+    bulk_max_ids: int = 500
+
+    change_stream_enabled: bool = True
+    change_stream_backend: Literal["memory", "database"] = "memory"
+    change_stream_poll_seconds: float = 0.5
+    change_stream_retention_seconds: float = 300.0
+    change_stream_heartbeat_seconds: float = 15.0
+    change_stream_max_seconds: float = 60.0
+    change_stream_queue_size: int = 100
+    change_stream_max_ids: int = 500
+
+    metrics_enabled: bool = True
+
+    sql_profiling_enabled: bool = False
+    sql_profile_slow_ms: float = 100.0
+    sql_profile_n_plus_one_threshold: int = 5
+    sql_profile_history: int = 200
+
+    profiler_max_seconds: float = 60.0
+    profiler_max_overhead: float = 0.05
+
+    server_bind: str = "0.0.0.0:8000"
+    server_workers: int = 0
+    server_max_requests: int = 1000
+    server_max_requests_jitter: int = 100
+    server_timeout: int = 60
+    server_graceful_timeout: int = 120
+    server_keepalive: int = 75
 
     model_config = SettingsConfigDict(
         env_file=".env",
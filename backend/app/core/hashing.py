@@ -0,0 +1,103 @@
+from __future__ import annotations
+
+import asyncio
+import threading
+import time
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, TypeVar
+
+from app.core.config import settings
+
+T = TypeVar("T")
+
+
+class PasswordHasherBusy(RuntimeError):
+    def __init__(self, retry_after: int) -> None:
+        super().__init__("Password hashing capacity exhausted.")
+        self.retry_after = retry_after
+
+
+class PasswordHashExecutor:
+    def __init__(self, workers: int, queue_size: int, retry_after: int) -> None:
+        self.workers = max(1, workers)
+        self.capacity = self.workers + max(0, queue_size)
+        self.retry_after = retry_after
+        self._executor: ThreadPoolExecutor | None = None
+        self._lock = threading.Lock()
+        self._pending = 0
+        self._running = 0
+        self._completed = 0
+        self._rejected = 0
+        self._latency_total = 0.0
+        self._latency_max = 0.0
+        self._wait_total = 0.0
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.workers, thread_name_prefix="password-hash"
+                )
+            return self._executor
+
+    def _admit(self) -> None:
+        with self._lock:
+            if self._pending >= self.capacity:
+                self._rejected += 1
+                raise PasswordHasherBusy(self.retry_after)
+            self._pending += 1
+
+    def _invoke(self, submitted_at: float, fn: Callable[..., T], args: tuple[Any, ...]) -> T:
+        started_at = time.perf_counter()
+        with self._lock:
+            self._running += 1
+            self._wait_total += started_at - submitted_at
+        try:
+            return fn(*args)
+        finally:
+            elapsed = time.perf_counter() - started_at
+            with self._lock:
+                self._running -= 1
+                self._pending -= 1
+                self._completed += 1
+                self._latency_total += elapsed
+                self._latency_max = max(self._latency_max, elapsed)
+
+    async def run(self, fn: Callable[..., T], *args: Any) -> T:
+        self._admit()
+        try:
+            future = self._get_executor().submit(self._invoke, time.perf_counter(), fn, args)
+        except BaseException:
+            with self._lock:
+                self._pending -= 1
+            raise
+        return await asyncio.wrap_future(future)
+
+    def stats(self) -> dict[str, float | int]:
+        with self._lock:
+            completed = self._completed
+            return {
+                "workers": self.workers,
+                "capacity": self.capacity,
+                "in_flight": self._running,
+                "queue_depth": self._pending - self._running,
+                "completed_total": completed,
+                "rejected_total": self._rejected,
+                "avg_latency_ms": (self._latency_total / completed * 1000) if completed else 0.0,
+                "max_latency_ms": self._latency_max * 1000,
+                "avg_wait_ms": (self._wait_total / completed * 1000) if completed else 0.0,
+            }
+
+    def shutdown(self) -> None:
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True)
+
+
+password_hasher = PasswordHashExecutor(
+    workers=settings.password_hash_workers,
+    queue_size=settings.password_hash_queue_size,
+    retry_after=settings.password_hash_retry_after_seconds,
+)
@@ -0,0 +1,309 @@
+"""Process-wide Prometheus metrics: requests, SQL statements and provider rows.
+
+Metrics are plain counters, gauges and histograms behind one lock each, and
+they are rendered in the Prometheus text format when ``/metrics`` is scraped.
+Per-request SQL counts come from engine events. The middleware puts a
+mutable ``RequestStats`` in a context variable, and Starlette copies that
+context into the threadpool where sync endpoints run, so statements executed
+there are added to the request that issued them.
+
+Nothing is shared between processes. Under several gunicorn workers each
+scrape sees only the worker that served it.
+"""
+from __future__ import annotations
+
+import bisect
+import contextvars
+import threading
+import time
+from collections.abc import Callable, Iterable
+from dataclasses import dataclass
+from typing import Any
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+SIZE_BUCKETS = (100, 1_000, 10_000, 100_000, 1_000_000, 10_000_000)
+STATEMENT_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100, 500, 1_000)
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", r"\\").replace("\n", r"\n").replace('"', r"\"")
+
+
+def _labels(names: tuple[str, ...], values: tuple[str, ...], extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _number(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) and not value.is_integer() else str(int(value))
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: tuple[str, ...] = ()) -> None:
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = labelnames
+        self._lock = threading.Lock()
+
+    def header(self) -> list[str]:
+        return [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+
+    def render(self) -> list[str]:
+        raise NotImplementedError
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def __init__(self, name: str, documentation: str, labelnames: tuple[str, ...] = ()) -> None:
+        super().__init__(name, documentation, labelnames)
+        self._values: dict[tuple[str, ...], float] = {}
+
+    def inc(self, amount: float = 1.0, *labels: str) -> None:
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0.0) + amount
+
+    def value(self, *labels: str) -> float:
+        with self._lock:
+            return self._values.get(labels, 0.0)
+
+    def render(self) -> list[str]:
+        with self._lock:
+            values = sorted(self._values.items())
+        return [f"{self.name}{_labels(self.labelnames, key)} {_number(value)}" for key, value in values]
+
+
+class Gauge(Counter):
+    kind = "gauge"
+
+    def dec(self, amount: float = 1.0, *labels: str) -> None:
+        self.inc(-amount, *labels)
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: tuple[str, ...] = (),
+        buckets: tuple[float, ...] = LATENCY_BUCKETS,
+    ) -> None:
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(buckets)
+        # Per label set: a count per bucket (the last is +Inf), the sum and the count.
+        self._series: dict[tuple[str, ...], tuple[list[int], list[float]]] = {}
+
+    def observe(self, value: float, *labels: str) -> None:
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(labels)
+            if series is None:
+                series = self._series[labels] = ([0] * (len(self.buckets) + 1), [0.0, 0.0])
+            series[0][index] += 1
+            totals = series[1]
+            totals[0] += value
+            totals[1] += 1
+
+    def count(self, *labels: str) -> int:
+        with self._lock:
+            series = self._series.get(labels)
+            return int(series[1][1]) if series else 0
+
+    def sum(self, *labels: str) -> float:
+        with self._lock:
+            series = self._series.get(labels)
+            return series[1][0] if series else 0.0
+
+    def render(self) -> list[str]:
+        with self._lock:
+            snapshot = [(key, list(counts), list(totals)) for key, (counts, totals) in self._series.items()]
+        lines = []
+        for key, counts, (total, count) in sorted(snapshot):
+            cumulative = 0
+            for bound, bucket in zip((*self.buckets, float("inf")), counts):
+                cumulative += bucket
+                le = f'le="{_number(bound)}"'
+                lines.append(f"{self.name}_bucket{_labels(self.labelnames, key, le)} {cumulative}")
+            lines.append(f"{self.name}_sum{_labels(self.labelnames, key)} {_number(total)}")
+            lines.append(f"{self.name}_count{_labels(self.labelnames, key)} {int(count)}")
+        return lines
+
+
+class MetricsRegistry:
+    def __init__(self) -> None:
+        self._metrics: list[_Metric] = []
+        # Collectors read live state (pool and hashing stats) at scrape time.
+        self._collectors: list[Callable[[], Iterable[str]]] = []
+
+    def register(self, metric: _Metric) -> Any:
+        self._metrics.append(metric)
+        return metric
+
+    def add_collector(self, collector: Callable[[], Iterable[str]]) -> None:
+        self._collectors.append(collector)
+
+    def render(self) -> str:
+        lines: list[str] = []
+        for metric in self._metrics:
+            lines.extend(metric.header())
+            lines.extend(metric.render())
+        for collector in self._collectors:
+            lines.extend(collector())
+        return "\n".join(lines) + "\n"
+
+
+registry = MetricsRegistry()
+
+http_requests_in_flight: Gauge = registry.register(
+    Gauge("http_requests_in_flight", "HTTP requests currently being served.")
+)
+http_request_duration: Histogram = registry.register(
+    Histogram(
+        "http_request_duration_seconds",
+        "HTTP request latency by route template.",
+        ("method", "route", "status"),
+    )
+)
+http_response_size: Histogram = registry.register(
+    Histogram(
+        "http_response_size_bytes",
+        "HTTP response body size by route template.",
+        ("method", "route"),
+        SIZE_BUCKETS,
+    )
+)
+http_request_db_statements: Histogram = registry.register(
+    Histogram(
+        "http_request_db_statements",
+        "SQL statements executed per HTTP request.",
+        ("method", "route"),
+        STATEMENT_BUCKETS,
+    )
+)
+http_request_db_duration: Histogram = registry.register(
+    Histogram(
+        "http_request_db_duration_seconds",
+        "Time spent executing SQL per HTTP request.",
+        ("method", "route"),
+    )
+)
+db_statements_total: Counter = registry.register(
+    Counter("db_statements_total", "SQL statements executed, by engine.", ("engine",))
+)
+db_statement_seconds_total: Counter = registry.register(
+    Counter("db_statement_seconds_total", "Time spent executing SQL, by engine.", ("engine",))
+)
+provider_rows_imported_total: Counter = registry.register(
+    Counter("provider_rows_imported_total", "Provider rows imported from CSV uploads.")
+)
+provider_rows_validated_total: Counter = registry.register(
+    Counter(
+        "provider_rows_validated_total",
+        "Provider rows run through validation, on import or revalidation.",
+        ("trigger",),
+    )
+)
+
+
+@dataclass
+class RequestStats:
+    statements: int = 0
+    db_seconds: float = 0.0
+
+
+_request_stats: contextvars.ContextVar[RequestStats | None] = contextvars.ContextVar(
+    "request_stats", default=None
+)
+
+
+def instrument_engine(engine: Engine, name: str) -> None:
+    @event.listens_for(engine, "before_cursor_execute")
+    def _before(_conn: Any, _cursor: Any, _statement: Any, _parameters: Any, context: Any, _many: Any) -> None:
+        context._metrics_started = time.perf_counter()
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _after(_conn: Any, _cursor: Any, _statement: Any, _parameters: Any, context: Any, _many: Any) -> None:
+        elapsed = time.perf_counter() - context._metrics_started
+        db_statements_total.inc(1, name)
+        db_statement_seconds_total.inc(elapsed, name)
+        stats = _request_stats.get()
+        if stats is not None:
+            stats.statements += 1
+            stats.db_seconds += elapsed
+
+
+def route_template(scope: Scope) -> str:
+    """The matched route's path template, e.g. ``/api/v1/providers/{provider_id}``.
+
+    Older FastAPI releases copy included routes with their prefix already
+    applied. Newer ones match the router's own route, whose path lacks the
+    ``include_router`` prefixes. The prefixes are static, so they are taken
+    from the leading segments of the request path.
+    """
+    template = getattr(scope.get("route"), "path", None)
+    if template is None:
+        # Raw paths would create a series per provider id, so unmatched
+        # requests (404s, probes) share one label.
+        return "<unmatched>"
+    segments = scope["path"].rstrip("/").split("/")
+    depth = len(template.rstrip("/").split("/"))
+    prefix = "/".join(segments[: max(0, len(segments) - depth) + 1])
+    return prefix + template
+
+
+class MetricsMiddleware:
+    """Time every HTTP request and label it with its route template.
+
+    A plain ASGI middleware rather than ``BaseHTTPMiddleware``, which would
+    run the endpoint in a separate task and add a copy of the response body.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = RequestStats()
+        token = _request_stats.set(stats)
+        status_code = 500
+        size = 0
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status_code, size
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            elif message["type"] == "http.response.body":
+                size += len(message.get("body", b""))
+            await send(message)
+
+        http_requests_in_flight.inc()
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            elapsed = time.perf_counter() - started
+            http_requests_in_flight.dec()
+            _request_stats.reset(token)
+            template = route_template(scope)
+            method = scope["method"]
+            http_request_duration.observe(elapsed, method, template, str(status_code))
+            http_response_size.observe(size, method, template)
+            http_request_db_statements.observe(stats.statements, method, template)
+            http_request_db_duration.observe(stats.db_seconds, method, template)
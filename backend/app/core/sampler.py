@@ -0,0 +1,195 @@
+"""Low-overhead sampling profiler over ``sys._current_frames``.
+
+A daemon thread wakes every ``interval`` seconds and reads the current stack
+of every other thread in the process, counting identical stacks. Nothing is
+installed in the profiled code and no request waits on the sampler; the
+only cost is the GIL time of each snapshot. That time is measured, and the
+sampler doubles its interval whenever a snapshot takes more than
+``max_overhead`` of it. Only one sampler runs at a time per process, and with several
+workers the profile covers the worker that served the request.
+
+Results are rendered as collapsed stacks (``thread;outer;inner count``, the
+input of ``flamegraph.pl`` and speedscope's importer) or as a speedscope
+JSON document with one sampled profile per thread.
+"""
+from __future__ import annotations
+
+import asyncio
+import os
+import sys
+import threading
+import time
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Any
+
+MAX_DEPTH = 128
+MAX_INTERVAL = 1.0
+
+# Leaf frames of threads parked waiting for work; they dominate every
+# profile of a mostly idle server and are dropped unless asked for.
+_IDLE_LEAVES = {
+    ("threading.py", "wait"),
+    ("queue.py", "get"),
+    ("selectors.py", "select"),
+    ("thread.py", "_worker"),
+    ("_thread.py", "worker"),
+}
+
+
+class SamplerBusy(RuntimeError):
+    pass
+
+
+@dataclass
+class StackProfile:
+    requested_seconds: float
+    interval: float
+    elapsed: float = 0.0
+    samples: int = 0
+    sampling_seconds: float = 0.0
+    # (thread name, frames root-first) -> number of samples
+    stacks: Counter[tuple[str, tuple[str, ...]]] = field(default_factory=Counter)
+    frames: dict[str, tuple[str, int]] = field(default_factory=dict)
+
+    @property
+    def overhead(self) -> float:
+        return self.sampling_seconds / self.elapsed if self.elapsed else 0.0
+
+    def collapsed(self) -> str:
+        lines = [
+            ";".join((thread, *frames)) + f" {count}"
+            for (thread, frames), count in sorted(self.stacks.items(), key=lambda item: -item[1])
+        ]
+        return "\n".join(lines) + ("\n" if lines else "")
+
+    def speedscope(self) -> dict[str, Any]:
+        names = list(self.frames)
+        index = {name: position for position, name in enumerate(names)}
+        by_thread: dict[str, list[tuple[tuple[str, ...], int]]] = {}
+        for (thread, frames), count in self.stacks.items():
+            by_thread.setdefault(thread, []).append((frames, count))
+        profiles = []
+        for thread, stacks in sorted(by_thread.items()):
+            weights = [count * self.interval for _, count in stacks]
+            profiles.append(
+                {
+                    "type": "sampled",
+                    "name": thread,
+                    "unit": "seconds",
+                    "startValue": 0,
+                    "endValue": sum(weights),
+                    "samples": [[index[frame] for frame in frames] for frames, _ in stacks],
+                    "weights": weights,
+                }
+            )
+        return {
+            "$schema": "https://www.speedscope.app/file-format-schema.json",
+            "name": f"provider-ops worker {os.getpid()}",
+            "exporter": "provider-ops stack sampler",
+            "activeProfileIndex": 0,
+            "shared": {
+                "frames": [
+                    {"name": name, "file": self.frames[name][0], "line": self.frames[name][1]} for name in names
+                ]
+            },
+            "profiles": profiles,
+        }
+
+
+def _short_path(filename: str) -> str:
+    parts = filename.replace("\\", "/").split("/")
+    return "/".join(parts[-2:])
+
+
+class StackSampler:
+    def __init__(self, seconds: float, interval: float, max_overhead: float, include_idle: bool = False) -> None:
+        self.profile = StackProfile(requested_seconds=seconds, interval=interval)
+        self.max_overhead = max_overhead
+        self.include_idle = include_idle
+        self._labels: dict[Any, str] = {}
+
+    def _label(self, code: Any) -> str:
+        label = self._labels.get(code)
+        if label is None:
+            path = _short_path(code.co_filename)
+            label = self._labels[code] = f"{code.co_name} ({path}:{code.co_firstlineno})"
+            self.profile.frames[label] = (path, code.co_firstlineno)
+        return label
+
+    def sample_once(self, own_ident: int) -> None:
+        names = {thread.ident: thread.name for thread in threading.enumerate()}
+        for ident, frame in sys._current_frames().items():
+            if ident == own_ident:
+                continue
+            leaf = frame.f_code
+            if not self.include_idle and (os.path.basename(leaf.co_filename), leaf.co_name) in _IDLE_LEAVES:
+                continue
+            stack: list[str] = []
+            current: Any = frame
+            while current is not None and len(stack) < MAX_DEPTH:
+                stack.append(self._label(current.f_code))
+                current = current.f_back
+            stack.reverse()
+            self.profile.stacks[(names.get(ident, f"thread-{ident}"), tuple(stack))] += 1
+
+    def run(self) -> StackProfile:
+        profile = self.profile
+        own_ident = threading.get_ident()
+        started = time.perf_counter()
+        deadline = started + profile.requested_seconds
+        while True:
+            tick = time.perf_counter()
+            if tick >= deadline:
+                break
+            self.sample_once(own_ident)
+            spent = time.perf_counter() - tick
+            profile.samples += 1
+            profile.sampling_seconds += spent
+            if spent > self.max_overhead * profile.interval:
+                # Slow snapshots (deep stacks, many threads): sample less often.
+                profile.interval = min(MAX_INTERVAL, profile.interval * 2)
+            time.sleep(max(0.0, min(profile.interval - spent, deadline - time.perf_counter())))
+        profile.elapsed = time.perf_counter() - started
+        return profile
+
+
+_running = threading.Lock()
+
+
+async def sample_stacks(
+    seconds: float, interval: float, max_overhead: float, include_idle: bool = False
+) -> StackProfile:
+    """Sample this process for ``seconds`` on a dedicated thread.
+
+    The caller awaits a future resolved by the sampler thread, so neither the
+    event loop nor a threadpool worker is held while sampling. Raises
+    ``SamplerBusy`` if a sample is already running.
+    """
+    if not _running.acquire(blocking=False):
+        raise SamplerBusy("A profile is already being collected.")
+    loop = asyncio.get_running_loop()
+    future: asyncio.Future[StackProfile] = loop.create_future()
+    sampler = StackSampler(seconds, interval, max_overhead, include_idle)
+
+    def resolve(profile: StackProfile | None, exc: BaseException | None) -> None:
+        # The request may have been cancelled (client gone) while sampling.
+        if future.done():
+            return
+        if exc is not None:
+            future.set_exception(exc)
+        else:
+            future.set_result(profile)  # type: ignore[arg-type]
+
+    def target() -> None:
+        try:
+            profile = sampler.run()
+        except BaseException as exc:
+            loop.call_soon_threadsafe(resolve, None, exc)
+        else:
+            loop.call_soon_threadsafe(resolve, profile, None)
+        finally:
+            _running.release()
+
+    threading.Thread(target=target, name="stack-sampler", daemon=True).start()
+    return await future
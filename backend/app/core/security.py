@@ -1,27 +1,36 @@
 from __future__ import annotations
 
 from datetime import datetime, timedelta, timezone
-from typing import Any
-
-from jose import JWTError, jwt
-from passlib.context import CryptContext
+from functools import lru_cache
+from typing import TYPE_CHECKING, Any
 
 from app.core.config import settings
 
+if TYPE_CHECKING:
+    from passlib.context import CryptContext
+
 ALGORITHM = "HS256"
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+
+@lru_cache
+def get_pwd_context() -> CryptContext:
+    # passlib and jose are imported on first use to keep them off the startup path.
+    from passlib.context import CryptContext
+
+    return CryptContext(schemes=["bcrypt"], deprecated="auto")
 
 
 def create_password_hash(password: str) -> str:
-    return pwd_context.hash(password)
+    return get_pwd_context().hash(password)
 
 
 def verify_password(password: str, hashed_password: str) -> bool:
-    return pwd_context.verify(password, hashed_password)
+    return get_pwd_context().verify(password, hashed_password)
 
 
 def create_access_token(subject: str, expires_delta: timedelta | None = None) -> str:
+    from jose import jwt
+
     expire = datetime.now(timezone.utc) + (
         expires_delta or timedelta(minutes=settings.access_token_expire_minutes)
     )
@@ -30,6 +39,8 @@ def create_access_token(subject: str, expires_delta: timedelta | None = None) ->
 
 
 def decode_access_token(token: str) -> dict[str, Any]:
+    from jose import JWTError, jwt
+
     try:
         return jwt.decode(token, settings.secret_key, algorithms=[ALGORITHM])
     except JWTError as exc:
@@ -0,0 +1,213 @@
+from __future__ import annotations
+
+from collections import defaultdict
+from collections.abc import Sequence
+from datetime import datetime
+
+from sqlalchemy import exists, func, insert, select, update
+from sqlalchemy.orm import Session
+
+from app.models.provider import ProviderMatchKey, ProviderRecord
+from app.services.duplicates import (
+    MAX_BUCKET_SIZE,
+    DisjointSet,
+    MatchFeatures,
+    blocking_keys,
+    features,
+    is_duplicate,
+)
+
+IN_CHUNK = 500
+
+
+def _chunks(items: Sequence[str]) -> list[Sequence[str]]:
+    return [items[start:start + IN_CHUNK] for start in range(0, len(items), IN_CHUNK)]
+
+
+def index_duplicates(db: Session, owner_id: str, providers: Sequence[ProviderRecord]) -> int:
+    """Key new providers and cluster them with their duplicates, old and new.
+
+    Only the new providers' keys are looked up, so the cost grows with the
+    batch, not the table. Flushes but does not commit. Returns how many of the
+    new providers landed in a duplicate cluster.
+    """
+    if not providers:
+        return 0
+    db.flush()
+    new: dict[str, MatchFeatures] = {
+        provider.id: features(
+            provider.provider_name, provider.npi, provider.phone, provider.address, provider.zip_code
+        )
+        for provider in providers
+    }
+    new_keys = {provider_id: blocking_keys(match) for provider_id, match in new.items()}
+
+    buckets: dict[str, list[str]] = defaultdict(list)
+    wanted = sorted({key for keys in new_keys.values() for key in keys})
+    for chunk in _chunks(wanted):
+        rows = db.execute(
+            select(ProviderMatchKey.key, ProviderMatchKey.provider_id).where(
+                ProviderMatchKey.owner_id == owner_id, ProviderMatchKey.key.in_(chunk)
+            )
+        )
+        for key, provider_id in rows:
+            buckets[key].append(provider_id)
+    for provider_id, keys in new_keys.items():
+        for key in keys:
+            buckets[key].append(provider_id)
+
+    # Existing providers were compared with each other when they were
+    # imported, so only pairs involving a new provider are candidates.
+    pairs: set[tuple[str, str]] = set()
+    for members in buckets.values():
+        if len(members) < 2 or len(members) > MAX_BUCKET_SIZE:
+            continue
+        for left in members:
+            if left not in new:
+                continue
+            for right in members:
+                if right != left:
+                    pairs.add((left, right) if left < right else (right, left))
+    if not pairs:
+        _insert_keys(db, owner_id, new_keys)
+        return 0
+
+    existing: dict[str, MatchFeatures] = {}
+    clusters: dict[str, str | None] = {}
+    created: dict[str, datetime] = {}
+    existing_ids = sorted({item for pair in pairs for item in pair if item not in new})
+    for chunk in _chunks(existing_ids):
+        loaded = db.execute(
+            select(
+                ProviderRecord.id,
+                ProviderRecord.provider_name,
+                ProviderRecord.npi,
+                ProviderRecord.phone,
+                ProviderRecord.address,
+                ProviderRecord.zip_code,
+                ProviderRecord.duplicate_cluster_id,
+                ProviderRecord.created_at,
+            ).where(ProviderRecord.id.in_(chunk))
+        )
+        for provider_id, name, npi, phone, address, zip_code, cluster_id, created_at in loaded:
+            existing[provider_id] = features(name, npi, phone, address, zip_code)
+            clusters[provider_id] = cluster_id
+            created[provider_id] = created_at
+
+    matches = {**existing, **new}
+    groups = DisjointSet()
+    for left, right in pairs:
+        if left in matches and right in matches and is_duplicate(matches[left], matches[right]):
+            groups.union(left, right)
+
+    order = {provider.id: position for position, provider in enumerate(providers)}
+    by_id = {provider.id: provider for provider in providers}
+    flagged = 0
+    reassigned: list[dict[str, str]] = []
+    for members in groups.groups():
+        old = [member for member in members if member in existing]
+        cluster_ids = sorted({cluster for member in old if (cluster := clusters[member])})
+        if cluster_ids:
+            cluster_id = cluster_ids[0]
+        elif old:
+            cluster_id = min(old, key=lambda member: (created[member], member))
+        else:
+            cluster_id = min(members, key=order.__getitem__)
+
+        if len(cluster_ids) > 1:
+            # The merged clusters' other members are not loaded, so there is
+            # nothing in the session to synchronise.
+            db.execute(
+                update(ProviderRecord)
+                .where(
+                    ProviderRecord.owner_id == owner_id,
+                    ProviderRecord.duplicate_cluster_id.in_(cluster_ids[1:]),
+                )
+                .values(duplicate_cluster_id=cluster_id)
+                .execution_options(synchronize_session=False)
+            )
+        reassigned.extend(
+            {"id": member, "duplicate_cluster_id": cluster_id}
+            for member in old
+            if clusters[member] != cluster_id
+        )
+        for member in members:
+            if member in by_id:
+                by_id[member].duplicate_cluster_id = cluster_id
+                flagged += 1
+
+    if reassigned:
+        # Bulk UPDATE by primary key: one executemany instead of a statement
+        # (and a session scan) per cluster.
+        db.execute(update(ProviderRecord), reassigned)
+    _insert_keys(db, owner_id, new_keys)
+    db.flush()
+    return flagged
+
+
+def _insert_keys(db: Session, owner_id: str, new_keys: dict[str, list[str]]) -> None:
+    rows = [
+        {"provider_id": provider_id, "owner_id": owner_id, "key": key}
+        for provider_id, keys in new_keys.items()
+        for key in keys
+    ]
+    if rows:
+        db.execute(insert(ProviderMatchKey), rows)
+
+
+def index_unindexed_providers(db: Session, owner_id: str, batch_size: int = 1000) -> int:
+    """Index providers imported before duplicate detection existed, in batches."""
+    indexed = 0
+    last_id = ""
+    while True:
+        batch = list(
+            db.scalars(
+                select(ProviderRecord)
+                .where(
+                    ProviderRecord.owner_id == owner_id,
+                    ProviderRecord.id > last_id,
+                    ~exists().where(ProviderMatchKey.provider_id == ProviderRecord.id),
+                )
+                .order_by(ProviderRecord.id)
+                .limit(batch_size)
+            )
+        )
+        if not batch:
+            return indexed
+        index_duplicates(db, owner_id, batch)
+        db.commit()
+        indexed += len(batch)
+        last_id = batch[-1].id
+
+
+def list_duplicate_clusters(
+    db: Session, owner_id: str, page: int, page_size: int
+) -> tuple[list[tuple[str, list[ProviderRecord]]], int]:
+    clustered = select(ProviderRecord.duplicate_cluster_id).where(
+        ProviderRecord.owner_id == owner_id, ProviderRecord.duplicate_cluster_id.is_not(None)
+    )
+    total = int(db.scalar(select(func.count()).select_from(clustered.distinct().subquery())) or 0)
+    cluster_ids = [
+        cluster_id
+        for cluster_id in db.scalars(
+            clustered.distinct()
+            .order_by(ProviderRecord.duplicate_cluster_id)
+            .offset((page - 1) * page_size)
+            .limit(page_size)
+        )
+        if cluster_id is not None
+    ]
+    members: dict[str, list[ProviderRecord]] = {cluster_id: [] for cluster_id in cluster_ids}
+    if cluster_ids:
+        rows = db.scalars(
+            select(ProviderRecord)
+            .where(
+                ProviderRecord.owner_id == owner_id,
+                ProviderRecord.duplicate_cluster_id.in_(cluster_ids),
+            )
+            .order_by(ProviderRecord.created_at, ProviderRecord.id)
+        )
+        for provider in rows:
+            if provider.duplicate_cluster_id is not None:
+                members[provider.duplicate_cluster_id].append(provider)
+    return list(members.items()), total
@@ -1,16 +1,61 @@
 from __future__ import annotations
 
 from collections.abc import Sequence
+from dataclasses import dataclass
 
-from sqlalchemy import Select, func, or_, select
+from sqlalchemy import Select, func, or_, select, update
 from sqlalchemy.orm import Session
 
-from app.models.provider import ProviderRecord, RiskLevel
+from app.core.metrics import provider_rows_imported_total, provider_rows_validated_total
+from app.crud.duplicate import index_duplicates
+from app.models.provider import ProviderRecord, RiskLevel, ValidationStatus
 from app.services.validation import evaluate_provider
 
 
+@dataclass
+class SummaryDelta:
+    """How a write moves the owner's ``summary``, counted from the rows it changed."""
+
+    total_providers: int = 0
+    high_risk_count: int = 0
+    medium_risk_count: int = 0
+    confidence_total: float = 0.0
+
+    def add(self, risk_level: RiskLevel, confidence_score: float, sign: int = 1) -> None:
+        self.total_providers += sign
+        self.high_risk_count += sign * (risk_level == RiskLevel.HIGH)
+        self.medium_risk_count += sign * (risk_level == RiskLevel.MEDIUM)
+        self.confidence_total += sign * confidence_score
+
+    def replace(
+        self,
+        before: tuple[RiskLevel, float],
+        after: tuple[RiskLevel, float],
+    ) -> None:
+        self.add(*before, sign=-1)
+        self.add(*after)
+
+    def changes(self, after: dict[str, float | int]) -> dict[str, float | int]:
+        """The difference between ``after`` and the summary without this write."""
+        total = after["total_providers"]
+        before_total = total - self.total_providers
+        before_confidence = after["avg_confidence"] * total - self.confidence_total
+        before_average = before_confidence / before_total if before_total > 0 else 0.0
+        return {
+            "total_providers": self.total_providers,
+            "high_risk_count": self.high_risk_count,
+            "medium_risk_count": self.medium_risk_count,
+            "avg_confidence": after["avg_confidence"] - before_average,
+            "requires_review": self.high_risk_count + self.medium_risk_count,
+        }
+
+
 def create_provider_batch(
-    db: Session, owner_id: str, rows: Sequence[dict[str, str]], source_file: str
+    db: Session,
+    owner_id: str,
+    rows: Sequence[dict[str, str]],
+    source_file: str,
+    delta: SummaryDelta | None = None,
 ) -> list[ProviderRecord]:
     records: list[ProviderRecord] = []
     for row in rows:
@@ -20,6 +65,9 @@ def create_provider_batch(
             npi=row.get("npi"),
             phone=row.get("phone"),
             address=row.get("address"),
+            city=row.get("city"),
+            state=row.get("state"),
+            zip_code=row.get("zip_code"),
         )
         record = ProviderRecord(
             owner_id=owner_id,
@@ -28,6 +76,9 @@ def create_provider_batch(
             npi=row.get("npi"),
             phone=row.get("phone"),
             address=row.get("address"),
+            city=row.get("city"),
+            state=row.get("state"),
+            zip_code=row.get("zip_code"),
             risk_level=outcome.risk_level,
             validation_status=outcome.validation_status,
             confidence_score=outcome.confidence_score,
@@ -37,9 +88,14 @@ def create_provider_batch(
         records.append(record)
 
     db.add_all(records)
+    index_duplicates(db, owner_id, records)
     db.commit()
+    provider_rows_imported_total.inc(len(records))
+    provider_rows_validated_total.inc(len(records), "import")
     for record in records:
         db.refresh(record)
+        if delta is not None:
+            delta.add(record.risk_level, record.confidence_score)
     return records
 
 
@@ -136,25 +192,119 @@ def get_provider(db: Session, provider_id: str, owner_id: str) -> ProviderRecord
     )
 
 
-def revalidate_provider(db: Session, provider: ProviderRecord) -> ProviderRecord:
+def get_providers_by_ids(db: Session, owner_id: str, provider_ids: Sequence[str]) -> list[ProviderRecord]:
+    """The owner's providers among ``provider_ids``, in request order, from one query."""
+    found = {
+        record.id: record
+        for record in db.scalars(
+            select(ProviderRecord).where(
+                ProviderRecord.owner_id == owner_id, ProviderRecord.id.in_(provider_ids)
+            )
+        )
+    }
+    return [found[provider_id] for provider_id in provider_ids if provider_id in found]
+
+
+def revalidate_providers(
+    db: Session, owner_id: str, provider_ids: Sequence[str], delta: SummaryDelta | None = None
+) -> list[str]:
+    """Revalidate the owner's providers among ``provider_ids``; returns the ids updated."""
+    # Only the validation inputs and scores are read, as plain rows rather
+    # than ORM objects.
+    rows = db.execute(
+        select(
+            ProviderRecord.id,
+            ProviderRecord.risk_level,
+            ProviderRecord.confidence_score,
+            ProviderRecord.provider_name,
+            ProviderRecord.specialty,
+            ProviderRecord.npi,
+            ProviderRecord.phone,
+            ProviderRecord.address,
+            ProviderRecord.city,
+            ProviderRecord.state,
+            ProviderRecord.zip_code,
+        ).where(ProviderRecord.owner_id == owner_id, ProviderRecord.id.in_(provider_ids))
+    ).all()
+    if not rows:
+        return []
+    updates = []
+    for row in rows:
+        outcome = evaluate_provider(
+            provider_name=row.provider_name,
+            specialty=row.specialty,
+            npi=row.npi,
+            phone=row.phone,
+            address=row.address,
+            city=row.city,
+            state=row.state,
+            zip_code=row.zip_code,
+        )
+        if delta is not None:
+            delta.replace(
+                (row.risk_level, row.confidence_score), (outcome.risk_level, outcome.confidence_score)
+            )
+        updates.append(
+            {
+                "id": row.id,
+                "risk_level": outcome.risk_level,
+                "validation_status": outcome.validation_status,
+                "confidence_score": outcome.confidence_score,
+                "primary_issue": outcome.primary_issue,
+            }
+        )
+    # One UPDATE statement for all rows, sent as a single executemany.
+    db.execute(update(ProviderRecord), updates)
+    db.commit()
+    provider_rows_validated_total.inc(len(updates), "revalidate")
+    return [row.id for row in rows]
+
+
+def set_validation_status(
+    db: Session, owner_id: str, provider_ids: Sequence[str], validation_status: ValidationStatus
+) -> list[str]:
+    """Record a reviewer's decision on the owner's providers; returns the ids updated."""
+    updated = db.scalars(
+        update(ProviderRecord)
+        .where(ProviderRecord.owner_id == owner_id, ProviderRecord.id.in_(provider_ids))
+        .values(validation_status=validation_status)
+        .returning(ProviderRecord.id)
+        .execution_options(synchronize_session=False)
+    ).all()
+    db.commit()
+    return list(updated)
+
+
+def revalidate_provider(
+    db: Session, provider: ProviderRecord, delta: SummaryDelta | None = None
+) -> ProviderRecord:
     outcome = evaluate_provider(
         provider_name=provider.provider_name,
         specialty=provider.specialty,
         npi=provider.npi,
         phone=provider.phone,
         address=provider.address,
+        city=provider.city,
+        state=provider.state,
+        zip_code=provider.zip_code,
     )
+    if delta is not None:
+        delta.replace(
+            (provider.risk_level, provider.confidence_score),
+            (outcome.risk_level, outcome.confidence_score),
+        )
     provider.risk_level = outcome.risk_level
     provider.validation_status = outcome.validation_status
     provider.confidence_score = outcome.confidence_score
     provider.primary_issue = outcome.primary_issue
     db.add(provider)
     db.commit()
+    provider_rows_validated_total.inc(1, "revalidate")
     db.refresh(provider)
     return provider
 
 
-def revalidate_all_for_owner(db: Session, owner_id: str) -> int:
+def revalidate_all_for_owner(db: Session, owner_id: str, delta: SummaryDelta | None = None) -> int:
     providers = db.scalars(select(ProviderRecord).where(ProviderRecord.owner_id == owner_id)).all()
     for provider in providers:
         outcome = evaluate_provider(
@@ -163,11 +313,20 @@ def revalidate_all_for_owner(db: Session, owner_id: str) -> int:
             npi=provider.npi,
             phone=provider.phone,
             address=provider.address,
+            city=provider.city,
+            state=provider.state,
+            zip_code=provider.zip_code,
         )
+        if delta is not None:
+            delta.replace(
+                (provider.risk_level, provider.confidence_score),
+                (outcome.risk_level, outcome.confidence_score),
+            )
         provider.risk_level = outcome.risk_level
         provider.validation_status = outcome.validation_status
         provider.confidence_score = outcome.confidence_score
         provider.primary_issue = outcome.primary_issue
         db.add(provider)
     db.commit()
+    provider_rows_validated_total.inc(len(providers), "revalidate")
     return len(providers)
@@ -2,7 +2,9 @@ from __future__ import annotations
 
 from sqlalchemy import select
 from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
 
+from app.core.hashing import password_hasher
 from app.core.security import create_password_hash, verify_password
 from app.models.user import User
 
@@ -11,10 +13,10 @@ def get_by_email(db: Session, email: str) -> User | None:
     return db.scalar(select(User).where(User.email == email))
 
 
-def create_user(db: Session, email: str, password: str, is_superuser: bool = False) -> User:
+def _add_user(db: Session, email: str, hashed_password: str, is_superuser: bool) -> User:
     user = User(
         email=email,
-        hashed_password=create_password_hash(password),
+        hashed_password=hashed_password,
         is_superuser=is_superuser,
         is_active=True,
     )
@@ -24,8 +26,41 @@ def create_user(db: Session, email: str, password: str, is_superuser: bool = Fal
     return user
 
 
+def create_user(db: Session, email: str, password: str, is_superuser: bool = False) -> User:
+    return _add_user(db, email, create_password_hash(password), is_superuser)
+
+
+def create_user_with_hash(
+    db: Session, email: str, hashed_password: str, is_superuser: bool = False
+) -> User:
+    return _add_user(db, email, hashed_password, is_superuser)
+
+
 def authenticate(db: Session, email: str, password: str) -> User | None:
     user = get_by_email(db, email=email)
     if not user or not verify_password(password, user.hashed_password):
         return None
     return user
+
+
+async def create_user_async(
+    db: Session, email: str, password: str, is_superuser: bool = False
+) -> User:
+    hashed_password = await password_hasher.run(create_password_hash, password)
+    return await run_in_threadpool(_add_user, db, email, hashed_password, is_superuser)
+
+
+def _get_by_email_and_release(db: Session, email: str) -> User | None:
+    # Hand the connection back to the pool before the caller waits on the
+    # hashing executor; the loaded user stays usable, just detached.
+    try:
+        return get_by_email(db, email)
+    finally:
+        db.close()
+
+
+async def authenticate_async(db: Session, email: str, password: str) -> User | None:
+    user = await run_in_threadpool(_get_by_email_and_release, db, email)
+    if not user or not await password_hasher.run(verify_password, password, user.hashed_password):
+        return None
+    return user
@@ -1,2 +1,2 @@
-from app.models import ProviderRecord, User  # noqa: F401
+from app.models import ProviderChangeEvent, ProviderMatchKey, ProviderRecord, ReplicationHeartbeat, User  # noqa: F401
 from app.models.base import Base
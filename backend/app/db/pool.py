@@ -0,0 +1,124 @@
+from __future__ import annotations
+
+import threading
+import time
+from typing import Any
+
+from sqlalchemy import event
+from sqlalchemy import exc as sa_exc
+from sqlalchemy.engine import Engine
+from sqlalchemy.pool import Pool, QueuePool
+
+from app.core.config import settings
+from app.core.metrics import instrument_engine
+from app.db import profiler
+
+
+class PoolMetrics:
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self._lock = threading.Lock()
+        self.checkouts_total = 0
+        self.checked_out = 0
+        self.peak_checked_out = 0
+        self.connections_created = 0
+        self.overflow_total = 0
+        self.timeouts_total = 0
+        self.invalidations_total = 0
+        self.wait_total = 0.0
+        self.wait_max = 0.0
+
+    def record_wait(self, seconds: float) -> None:
+        with self._lock:
+            self.wait_total += seconds
+            self.wait_max = max(self.wait_max, seconds)
+
+    def record_timeout(self) -> None:
+        with self._lock:
+            self.timeouts_total += 1
+
+    def attach(self, engine: Engine) -> None:
+        @event.listens_for(engine, "connect")
+        def _on_connect(_dbapi_connection: Any, _record: Any) -> None:
+            pool = engine.pool
+            with self._lock:
+                self.connections_created += 1
+                if isinstance(pool, QueuePool) and pool.overflow() > 0:
+                    self.overflow_total += 1
+
+        @event.listens_for(engine, "checkout")
+        def _on_checkout(_dbapi_connection: Any, _record: Any, _proxy: Any) -> None:
+            with self._lock:
+                self.checkouts_total += 1
+                self.checked_out += 1
+                self.peak_checked_out = max(self.peak_checked_out, self.checked_out)
+
+        @event.listens_for(engine, "checkin")
+        def _on_checkin(_dbapi_connection: Any, _record: Any) -> None:
+            with self._lock:
+                self.checked_out = max(0, self.checked_out - 1)
+
+        @event.listens_for(engine, "invalidate")
+        def _on_invalidate(_dbapi_connection: Any, _record: Any, _exception: Any) -> None:
+            with self._lock:
+                self.invalidations_total += 1
+
+    def snapshot(self, pool: Pool) -> dict[str, Any]:
+        queue_pool = pool if isinstance(pool, QueuePool) else None
+        with self._lock:
+            checkouts = self.checkouts_total
+            return {
+                "name": self.name,
+                "pool_class": type(pool).__name__,
+                "pool_size": queue_pool.size() if queue_pool else None,
+                "checked_out": self.checked_out,
+                "peak_checked_out": self.peak_checked_out,
+                "overflow": queue_pool.overflow() if queue_pool else None,
+                "overflow_total": self.overflow_total,
+                "connections_created": self.connections_created,
+                "checkouts_total": checkouts,
+                "timeouts_total": self.timeouts_total,
+                "invalidations_total": self.invalidations_total,
+                "avg_wait_ms": (self.wait_total / checkouts * 1000) if checkouts else 0.0,
+                "max_wait_ms": self.wait_max * 1000,
+            }
+
+
+def instrumented_queue_pool(metrics: PoolMetrics) -> type[QueuePool]:
+    # The subclass carries the metrics so ``Pool.recreate()`` (engine.dispose) keeps them.
+    class InstrumentedQueuePool(QueuePool):
+        pool_metrics = metrics
+
+        def _do_get(self) -> Any:
+            started = time.perf_counter()
+            try:
+                connection = super()._do_get()
+            except sa_exc.TimeoutError:
+                self.pool_metrics.record_timeout()
+                raise
+            self.pool_metrics.record_wait(time.perf_counter() - started)
+            return connection
+
+    return InstrumentedQueuePool
+
+
+_registry: dict[str, tuple[Engine, PoolMetrics]] = {}
+
+
+def register_engine(engine: Engine, metrics: PoolMetrics) -> None:
+    metrics.attach(engine)
+    if settings.metrics_enabled:
+        instrument_engine(engine, metrics.name)
+    if settings.sql_profiling_enabled:
+        profiler.instrument_engine(engine, metrics.name)
+    _registry[metrics.name] = (engine, metrics)
+
+
+def dispose_engines() -> None:
+    """Close every pooled connection, e.g. before a server forks its workers."""
+    for engine, _ in _registry.values():
+        engine.dispose()
+
+
+def pool_snapshots() -> list[dict[str, Any]]:
+    return [metrics.snapshot(engine.pool) for engine, metrics in _registry.values()]
@@ -0,0 +1,312 @@
+"""Opt-in per-request SQL profiler.
+
+With ``APP_SQL_PROFILING_ENABLED`` set, every HTTP request gets a request ID
+(the caller's ``X-Request-ID`` or a new one, echoed back in the response)
+and every statement it runs is recorded with its timing. Parameters are
+recorded only as their types and lengths. Statements slower than
+``APP_SQL_PROFILE_SLOW_MS`` also get their plan (``EXPLAIN QUERY PLAN`` on
+SQLite, ``EXPLAIN`` elsewhere; never ``ANALYZE``, which would run writes
+twice).
+
+When the request finishes, its statements are checked for N+1 patterns and
+for exact repeats. The profile is kept in a bounded in-memory history for
+the admin endpoint, and slow statements and findings go to the
+``app.db.profiler`` logger.
+"""
+from __future__ import annotations
+
+import json
+import logging
+import re
+import threading
+import time
+import uuid
+from collections import Counter, OrderedDict
+from contextvars import ContextVar
+from dataclasses import asdict, dataclass, field
+from typing import Any
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.config import settings
+from app.core.metrics import route_template
+
+logger = logging.getLogger(__name__)
+
+REQUEST_ID_HEADER = "x-request-id"
+# Statements beyond this are counted but not kept, so one runaway request
+# cannot hold unbounded memory.
+MAX_STATEMENTS = 2_000
+_REQUEST_ID = re.compile(r"^[A-Za-z0-9._-]{1,64}$")
+_EXPLAINABLE = ("SELECT", "WITH", "INSERT", "UPDATE", "DELETE")
+
+
+@dataclass
+class StatementRecord:
+    sql: str
+    parameters: list[str]
+    parameter_sets: int
+    duration_ms: float
+    rows: int
+    engine: str
+    plan: list[str] | None = None
+    # Identifies the bound values for repeat detection without keeping them.
+    fingerprint: int = field(default=0, repr=False)
+
+
+@dataclass
+class Finding:
+    kind: str
+    sql: str
+    count: int
+    total_ms: float
+
+
+@dataclass
+class RequestProfile:
+    request_id: str
+    method: str
+    path: str
+    started_at: float
+    route: str = ""
+    status_code: int = 500
+    duration_ms: float = 0.0
+    statement_count: int = 0
+    db_ms: float = 0.0
+    statements: list[StatementRecord] = field(default_factory=list)
+    findings: list[Finding] = field(default_factory=list)
+
+    def summary(self) -> dict[str, Any]:
+        return {
+            "request_id": self.request_id,
+            "method": self.method,
+            "route": self.route,
+            "status_code": self.status_code,
+            "started_at": self.started_at,
+            "duration_ms": self.duration_ms,
+            "statement_count": self.statement_count,
+            "db_ms": self.db_ms,
+            "finding_count": len(self.findings),
+        }
+
+    def detail(self) -> dict[str, Any]:
+        statements = [
+            {key: value for key, value in asdict(statement).items() if key != "fingerprint"}
+            for statement in self.statements
+        ]
+        return {
+            **self.summary(),
+            "path": self.path,
+            "statements": statements,
+            "findings": [asdict(finding) for finding in self.findings],
+        }
+
+
+_current: ContextVar[RequestProfile | None] = ContextVar("sql_profile", default=None)
+
+
+def _redact(value: Any) -> str:
+    if value is None:
+        return "NULL"
+    if isinstance(value, (str, bytes)):
+        return f"{type(value).__name__}[{len(value)}]"
+    return type(value).__name__
+
+
+def redact_parameters(parameters: Any) -> list[str]:
+    if isinstance(parameters, dict):
+        return [f"{name}={_redact(value)}" for name, value in parameters.items()]
+    if isinstance(parameters, (list, tuple)):
+        return [_redact(value) for value in parameters]
+    return [] if parameters is None else [_redact(parameters)]
+
+
+def _fingerprint(parameters: Any) -> int:
+    try:
+        return hash(repr(parameters))
+    except Exception:
+        return 0
+
+
+def _explain(cursor: Any, dialect: str, statement: str, parameters: Any) -> list[str] | None:
+    if not statement.lstrip().upper().startswith(_EXPLAINABLE):
+        return None
+    prefix = "EXPLAIN QUERY PLAN " if dialect == "sqlite" else "EXPLAIN "
+    explain_cursor = cursor.connection.cursor()
+    # A failed statement aborts a Postgres transaction, so the plan is taken
+    # under a savepoint that is always unwound.
+    use_savepoint = dialect != "sqlite"
+    try:
+        if use_savepoint:
+            explain_cursor.execute("SAVEPOINT sql_profiler_explain")
+        try:
+            explain_cursor.execute(prefix + statement, parameters)
+            return [str(row[-1]) for row in explain_cursor.fetchall()]
+        except Exception as exc:
+            if use_savepoint:
+                explain_cursor.execute("ROLLBACK TO SAVEPOINT sql_profiler_explain")
+            return [f"EXPLAIN failed: {type(exc).__name__}"]
+        finally:
+            if use_savepoint:
+                explain_cursor.execute("RELEASE SAVEPOINT sql_profiler_explain")
+    finally:
+        explain_cursor.close()
+
+
+_instrumented: set[int] = set()
+
+
+def instrument_engine(engine: Engine, name: str) -> None:
+    if id(engine) in _instrumented:
+        return
+    _instrumented.add(id(engine))
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _before(_conn: Any, _cursor: Any, _statement: Any, _parameters: Any, context: Any, _many: Any) -> None:
+        if _current.get() is not None:
+            context._profiler_started = time.perf_counter()
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _after(
+        conn: Any, cursor: Any, statement: str, parameters: Any, context: Any, executemany: bool
+    ) -> None:
+        profile = _current.get()
+        started = getattr(context, "_profiler_started", None)
+        if profile is None or started is None:
+            return
+        duration_ms = (time.perf_counter() - started) * 1000
+        profile.statement_count += 1
+        profile.db_ms += duration_ms
+        if len(profile.statements) >= MAX_STATEMENTS:
+            return
+        first = parameters[0] if executemany and parameters else parameters
+        record = StatementRecord(
+            sql=statement,
+            parameters=redact_parameters(first),
+            parameter_sets=len(parameters) if executemany else 1,
+            duration_ms=duration_ms,
+            rows=cursor.rowcount,
+            engine=name,
+            fingerprint=0 if executemany else _fingerprint(parameters),
+        )
+        if duration_ms >= settings.sql_profile_slow_ms:
+            record.plan = _explain(cursor, conn.dialect.name, statement, first)
+        profile.statements.append(record)
+
+
+def analyze(statements: list[StatementRecord], n_plus_one_threshold: int, slow_ms: float) -> list[Finding]:
+    """Flag N+1 selects, exact repeats and slow statements."""
+    findings: list[Finding] = []
+    by_sql: dict[str, list[StatementRecord]] = {}
+    for statement in statements:
+        by_sql.setdefault(statement.sql, []).append(statement)
+    for sql, group in by_sql.items():
+        total_ms = sum(statement.duration_ms for statement in group)
+        repeats = Counter(statement.fingerprint for statement in group if statement.parameter_sets == 1)
+        duplicated = sum(count for count in repeats.values() if count > 1)
+        if duplicated:
+            findings.append(Finding("repeated", sql, duplicated, total_ms))
+        # One statement shape issued once per row of an earlier result.
+        distinct = len(repeats)
+        if sql.lstrip().upper().startswith(("SELECT", "WITH")) and distinct >= n_plus_one_threshold:
+            findings.append(Finding("n_plus_one", sql, distinct, total_ms))
+        slow = [statement.duration_ms for statement in group if statement.duration_ms >= slow_ms]
+        if slow:
+            findings.append(Finding("slow", sql, len(slow), sum(slow)))
+    return findings
+
+
+class ProfileStore:
+    def __init__(self, capacity: int) -> None:
+        self.capacity = max(1, capacity)
+        self._lock = threading.Lock()
+        self._profiles: OrderedDict[str, RequestProfile] = OrderedDict()
+
+    def add(self, profile: RequestProfile) -> None:
+        with self._lock:
+            self._profiles.pop(profile.request_id, None)
+            self._profiles[profile.request_id] = profile
+            while len(self._profiles) > self.capacity:
+                self._profiles.popitem(last=False)
+
+    def get(self, request_id: str) -> RequestProfile | None:
+        with self._lock:
+            return self._profiles.get(request_id)
+
+    def recent(self, limit: int) -> list[RequestProfile]:
+        with self._lock:
+            return list(reversed(self._profiles.values()))[:limit]
+
+
+profile_store = ProfileStore(settings.sql_profile_history)
+
+
+def _log(profile: RequestProfile) -> None:
+    for finding in profile.findings:
+        plan = None
+        if finding.kind == "slow":
+            plan = next(
+                (
+                    statement.plan
+                    for statement in profile.statements
+                    if statement.sql == finding.sql and statement.plan is not None
+                ),
+                None,
+            )
+        logger.warning(
+            "SQL %s: %s",
+            finding.kind,
+            json.dumps(
+                {
+                    "request_id": profile.request_id,
+                    "route": f"{profile.method} {profile.route}",
+                    "count": finding.count,
+                    "total_ms": round(finding.total_ms, 3),
+                    "sql": finding.sql,
+                    "plan": plan,
+                }
+            ),
+        )
+
+
+class SqlProfilerMiddleware:
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        supplied = next(
+            (value.decode("latin-1") for key, value in scope["headers"] if key == REQUEST_ID_HEADER.encode()),
+            "",
+        )
+        request_id = supplied if _REQUEST_ID.match(supplied) else uuid.uuid4().hex
+        profile = RequestProfile(request_id, scope["method"], scope["path"], time.time())
+
+        async def send_wrapper(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                profile.status_code = message["status"]
+                headers = [*message.get("headers", []), (REQUEST_ID_HEADER.encode(), request_id.encode())]
+                message = {**message, "headers": headers}
+            await send(message)
+
+        token = _current.set(profile)
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            _current.reset(token)
+            profile.duration_ms = (time.perf_counter() - started) * 1000
+            # Requests without SQL (health checks, static docs) would only
+            # push useful profiles out of the history.
+            if profile.statement_count:
+                profile.route = route_template(scope)
+                profile.findings = analyze(
+                    profile.statements, settings.sql_profile_n_plus_one_threshold, settings.sql_profile_slow_ms
+                )
+                profile_store.add(profile)
+                _log(profile)
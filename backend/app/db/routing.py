@@ -0,0 +1,162 @@
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from collections.abc import Callable
+from typing import Any
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session, sessionmaker
+
+from app.core.config import settings
+from app.db.session import ReadSessionLocal, ReplicaSessionLocal, SessionLocal
+from app.models.heartbeat import ReplicationHeartbeat
+
+logger = logging.getLogger(__name__)
+
+HEARTBEAT_ID = "primary"
+
+
+class ReplicaRouter:
+    def __init__(
+        self,
+        primary: sessionmaker[Session],
+        replica: sessionmaker[Session] | None,
+        read_your_writes_seconds: float,
+        max_lag_seconds: float,
+        lag_check_seconds: float,
+        writer: sessionmaker[Session] | None = None,
+        heartbeat_seconds: float = 1.0,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        self.primary = primary
+        self.replica = replica
+        self.writer = writer or primary
+        self.read_your_writes_seconds = read_your_writes_seconds
+        self.max_lag_seconds = max_lag_seconds
+        self.lag_check_seconds = lag_check_seconds
+        self.heartbeat_seconds = heartbeat_seconds
+        self.clock = clock
+        self._lock = threading.Lock()
+        self._heartbeat_stop = threading.Event()
+        self._heartbeat_thread: threading.Thread | None = None
+        self._last_write: dict[str, float] = {}
+        self._lag_seconds: float | None = None
+        self._lag_checked_at = float("-inf")
+        self._counts = {"replica": 0, "primary_read_your_writes": 0, "primary_lagging": 0}
+
+    def record_write(self, owner_id: str) -> None:
+        now = time.monotonic()
+        with self._lock:
+            self._last_write[owner_id] = now
+            if len(self._last_write) > 10_000:
+                cutoff = now - self.read_your_writes_seconds
+                self._last_write = {
+                    key: value for key, value in self._last_write.items() if value >= cutoff
+                }
+
+    def _wrote_recently(self, owner_id: str) -> bool:
+        with self._lock:
+            last_write = self._last_write.get(owner_id)
+        return last_write is not None and time.monotonic() - last_write < self.read_your_writes_seconds
+
+    def beat(self) -> None:
+        with self.writer() as db:
+            heartbeat = db.get(ReplicationHeartbeat, HEARTBEAT_ID)
+            if heartbeat is None:
+                db.add(ReplicationHeartbeat(id=HEARTBEAT_ID, beat_at=self.clock()))
+            else:
+                heartbeat.beat_at = self.clock()
+            db.commit()
+
+    def _run_heartbeat(self) -> None:
+        while not self._heartbeat_stop.is_set():
+            try:
+                self.beat()
+            except Exception:
+                logger.exception("Replication heartbeat failed.")
+            self._heartbeat_stop.wait(self.heartbeat_seconds)
+
+    def start_heartbeat(self) -> threading.Thread | None:
+        if self.replica is None or self._heartbeat_thread is not None:
+            return None
+        self._heartbeat_stop.clear()
+        self._heartbeat_thread = threading.Thread(
+            target=self._run_heartbeat, name="replication-heartbeat", daemon=True
+        )
+        self._heartbeat_thread.start()
+        return self._heartbeat_thread
+
+    def stop_heartbeat(self) -> None:
+        self._heartbeat_stop.set()
+        if self._heartbeat_thread is not None:
+            self._heartbeat_thread.join()
+            self._heartbeat_thread = None
+
+    def replica_lag(self, force: bool = False) -> float | None:
+        # The primary rewrites a heartbeat row every `heartbeat_seconds`, so the
+        # row's age on the replica is how far replication is behind (to within
+        # one heartbeat) whatever else is or is not being written. Only the
+        # replica is queried; the primary's pool is never touched here.
+        if self.replica is None:
+            return None
+        now = time.monotonic()
+        with self._lock:
+            if not force and now - self._lag_checked_at < self.lag_check_seconds:
+                return self._lag_seconds
+            self._lag_checked_at = now
+
+        try:
+            with self.replica() as db:
+                beat_at = db.scalar(
+                    select(ReplicationHeartbeat.beat_at).where(ReplicationHeartbeat.id == HEARTBEAT_ID)
+                )
+        except Exception:
+            beat_at = None
+        lag = None if beat_at is None else max(0.0, self.clock() - beat_at)
+
+        with self._lock:
+            self._lag_seconds = lag
+        return lag
+
+    def _replica_healthy(self) -> bool:
+        lag = self.replica_lag()
+        return lag is not None and lag <= self.max_lag_seconds
+
+    def session_factory(self, owner_id: str) -> sessionmaker[Session]:
+        if self.replica is None:
+            return self.primary
+        if self._wrote_recently(owner_id):
+            route = "primary_read_your_writes"
+        elif not self._replica_healthy():
+            route = "primary_lagging"
+        else:
+            route = "replica"
+        with self._lock:
+            self._counts[route] += 1
+        return self.replica if route == "replica" else self.primary
+
+    def stats(self) -> dict[str, Any]:
+        lag = self.replica_lag()
+        with self._lock:
+            counts = dict(self._counts)
+        return {
+            "replica_configured": self.replica is not None,
+            "lag_seconds": lag,
+            "healthy": self.replica is not None and lag is not None and lag <= self.max_lag_seconds,
+            "max_lag_seconds": self.max_lag_seconds,
+            "read_your_writes_seconds": self.read_your_writes_seconds,
+            "routed": counts,
+        }
+
+
+read_router = ReplicaRouter(
+    primary=ReadSessionLocal,
+    replica=ReplicaSessionLocal,
+    read_your_writes_seconds=settings.read_your_writes_seconds,
+    max_lag_seconds=settings.replica_max_lag_seconds,
+    lag_check_seconds=settings.replica_lag_check_seconds,
+    writer=SessionLocal,
+    heartbeat_seconds=settings.replica_heartbeat_seconds,
+)
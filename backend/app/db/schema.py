@@ -0,0 +1,85 @@
+from __future__ import annotations
+
+import hashlib
+
+from sqlalchemy import Column, DateTime, MetaData, String, Table, func, insert, inspect, select, text, update
+from sqlalchemy import exc as sa_exc
+from sqlalchemy.engine import Engine
+
+from app.db.base import Base
+
+_version_metadata = MetaData()
+schema_version_table = Table(
+    "schema_version",
+    _version_metadata,
+    Column("id", String(16), primary_key=True),
+    Column("version", String(64), nullable=False),
+    Column("applied_at", DateTime(timezone=True), server_default=func.now(), nullable=False),
+)
+
+
+def schema_fingerprint() -> str:
+    digest = hashlib.sha256()
+    for table in Base.metadata.sorted_tables:
+        digest.update(table.name.encode())
+        for column in table.columns:
+            digest.update(f"{column.name}:{column.type}:{column.nullable}".encode())
+        for index in sorted(table.indexes, key=lambda item: item.name or ""):
+            digest.update(f"{index.name}:{index.unique}".encode())
+    return digest.hexdigest()[:32]
+
+
+def stored_schema_version(engine: Engine) -> str | None:
+    try:
+        with engine.connect() as connection:
+            return connection.scalar(
+                select(schema_version_table.c.version).where(schema_version_table.c.id == "app")
+            )
+    except (sa_exc.OperationalError, sa_exc.ProgrammingError):
+        return None
+
+
+def _add_missing_columns(engine: Engine) -> None:
+    # create_all only creates missing tables; nullable columns added to an
+    # existing model are added in place so older databases keep working.
+    # Column info is read before the transaction opens: the tuned SQLite writer
+    # pool has a single connection, which the inspector would otherwise wait on.
+    inspector = inspect(engine)
+    preparer = engine.dialect.identifier_preparer
+    statements: list[str] = []
+    for table in Base.metadata.sorted_tables:
+        if not inspector.has_table(table.name):
+            continue
+        present = {column["name"] for column in inspector.get_columns(table.name)}
+        for column in table.columns:
+            if column.name in present or not column.nullable:
+                continue
+            column_type = column.type.compile(dialect=engine.dialect)
+            statements.append(
+                f"ALTER TABLE {preparer.format_table(table)} "
+                f"ADD COLUMN {preparer.format_column(column)} {column_type}"
+            )
+    if not statements:
+        return
+    with engine.begin() as connection:
+        for statement in statements:
+            connection.execute(text(statement))
+
+
+def ensure_schema(engine: Engine) -> bool:
+    version = schema_fingerprint()
+    if stored_schema_version(engine) == version:
+        return False
+
+    _add_missing_columns(engine)
+    Base.metadata.create_all(bind=engine)
+    _version_metadata.create_all(bind=engine)
+    with engine.begin() as connection:
+        updated = connection.execute(
+            update(schema_version_table)
+            .where(schema_version_table.c.id == "app")
+            .values(version=version, applied_at=func.now())
+        )
+        if not updated.rowcount:
+            connection.execute(insert(schema_version_table).values(id="app", version=version))
+    return True
@@ -1,26 +1,105 @@
 from __future__ import annotations
 
 from collections.abc import Generator
+from typing import Any
 
 from sqlalchemy import create_engine
+from sqlalchemy.engine import Engine, make_url
 from sqlalchemy.orm import Session, sessionmaker
 
 from app.core.config import settings
+from app.db.pool import PoolMetrics, instrumented_queue_pool, register_engine
+from app.db.sqlite import apply_pragmas
 
 
-def _connect_args(database_url: str) -> dict[str, bool]:
+def _connect_args(database_url: str) -> dict[str, Any]:
     if database_url.startswith("sqlite"):
-        return {"check_same_thread": False}
+        return {"check_same_thread": False, "timeout": settings.sqlite_busy_timeout_ms / 1000}
     return {}
 
 
-engine = create_engine(
-    settings.database_url,
-    pool_pre_ping=True,
-    connect_args=_connect_args(settings.database_url),
+def _is_memory_sqlite(database_url: str) -> bool:
+    url = make_url(database_url)
+    return url.get_backend_name() == "sqlite" and url.database in (None, "", ":memory:")
+
+
+def _is_tuned_sqlite(database_url: str) -> bool:
+    return (
+        settings.sqlite_tuned
+        and make_url(database_url).get_backend_name() == "sqlite"
+        and not _is_memory_sqlite(database_url)
+    )
+
+
+def _engine_kwargs(
+    database_url: str, metrics: PoolMetrics, pool_size: int, max_overflow: int
+) -> dict[str, Any]:
+    kwargs: dict[str, Any] = {
+        "pool_pre_ping": settings.db_pool_pre_ping,
+        "pool_recycle": settings.db_pool_recycle,
+        "connect_args": _connect_args(database_url),
+    }
+    if not _is_memory_sqlite(database_url):
+        kwargs.update(
+            poolclass=instrumented_queue_pool(metrics),
+            pool_size=pool_size,
+            max_overflow=max_overflow,
+            pool_timeout=settings.db_pool_timeout,
+        )
+    return kwargs
+
+
+def create_engines(database_url: str) -> tuple[Engine, Engine]:
+    if not _is_tuned_sqlite(database_url):
+        metrics = PoolMetrics("primary")
+        primary = create_engine(
+            database_url,
+            **_engine_kwargs(database_url, metrics, settings.db_pool_size, settings.db_max_overflow),
+        )
+        register_engine(primary, metrics)
+        return primary, primary
+
+    # SQLite allows one writer at a time, so imports and revalidation share a single
+    # connection while list/summary/export read from a separate WAL reader pool.
+    writer_metrics = PoolMetrics("primary")
+    writer = create_engine(database_url, **_engine_kwargs(database_url, writer_metrics, 1, 0))
+    apply_pragmas(writer, read_only=False)
+    register_engine(writer, writer_metrics)
+
+    reader_metrics = PoolMetrics("sqlite-reader")
+    reader = create_engine(
+        database_url,
+        **_engine_kwargs(database_url, reader_metrics, settings.sqlite_read_pool_size, 0),
+    )
+    apply_pragmas(reader, read_only=True)
+    register_engine(reader, reader_metrics)
+    return writer, reader
+
+
+def create_replica_engine(database_url: str) -> Engine:
+    metrics = PoolMetrics("replica")
+    replica = create_engine(
+        database_url,
+        **_engine_kwargs(database_url, metrics, settings.db_pool_size, settings.db_max_overflow),
+    )
+    if _is_tuned_sqlite(database_url):
+        apply_pragmas(replica, read_only=True)
+    register_engine(replica, metrics)
+    return replica
+
+
+engine, read_engine = create_engines(settings.database_url)
+replica_engine = (
+    create_replica_engine(settings.replica_database_url) if settings.replica_database_url else None
 )
 
 SessionLocal = sessionmaker(bind=engine, autocommit=False, autoflush=False, class_=Session)
+ReadSessionLocal = sessionmaker(bind=read_engine, autocommit=False, autoflush=False, class_=Session)
+ReplicaSessionLocal = (
+    sessionmaker(bind=replica_engine, autocommit=False, autoflush=False, class_=Session)
+    if replica_engine is not None
+    else None
+)
 
 
 def get_db() -> Generator[Session, None, None]:
@@ -29,3 +108,11 @@ def get_db() -> Generator[Session, None, None]:
         yield db
     finally:
         db.close()
+
+
+def get_read_db() -> Generator[Session, None, None]:
+    db = ReadSessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
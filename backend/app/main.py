@@ -1,23 +1,83 @@
 from __future__ import annotations
 
+import gc
 from contextlib import asynccontextmanager
 
-from fastapi import FastAPI
+from fastapi import FastAPI, Request, status
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse
+from sqlalchemy import exc as sa_exc
 
+from app.api import metrics
 from app.api.v1.api import api_router
-from app.bootstrap import bootstrap_admin_user
+from app.bootstrap import bootstrap_admin_user, bootstrap_done, start_bootstrap
 from app.core.config import settings
-from app.db.base import Base
+from app.core.hashing import password_hasher
+from app.core.metrics import MetricsMiddleware
+from app.db.pool import dispose_engines
+from app.db.profiler import REQUEST_ID_HEADER, SqlProfilerMiddleware
+from app.db.routing import read_router
+from app.db.schema import ensure_schema
 from app.db.session import SessionLocal, engine
+from app.services.address_index import get_postal_index
+from app.services.change_stream import change_broker
+from app.services.npi_index import get_npi_index
 
 
-@asynccontextmanager
-async def lifespan(_: FastAPI):
-    Base.metadata.create_all(bind=engine)
+_prepared_before_fork = False
+
+
+def prepare_before_fork() -> None:
+    """Run the one-time startup work in a pre-forking server's master.
+
+    Workers forked afterwards share the reference indexes copy-on-write, and
+    their lifespan skips the schema check and admin bootstrap.
+    """
+    global _prepared_before_fork
+    ensure_schema(engine)
+    get_npi_index()
+    get_postal_index()
     with SessionLocal() as db:
         bootstrap_admin_user(db)
+    bootstrap_done.set()
+    # Children must open their own connections, not inherit the master's.
+    dispose_engines()
+    # Frozen objects are never scanned by the collector, so a worker's
+    # collections do not write to (and copy) the pages they live on.
+    gc.collect()
+    gc.freeze()
+    _prepared_before_fork = True
+
+
+@asynccontextmanager
+async def lifespan(_: FastAPI):
+    if not _prepared_before_fork:
+        ensure_schema(engine)
+        # Reference indexes load once here rather than on the first import request.
+        get_npi_index()
+        get_postal_index()
+        if settings.defer_bootstrap:
+            start_bootstrap(SessionLocal)
+        else:
+            with SessionLocal() as db:
+                bootstrap_admin_user(db)
+    read_router.start_heartbeat()
+    change_broker.start()
     yield
+    change_broker.stop()
+    read_router.stop_heartbeat()
+    password_hasher.shutdown()
+
+
+async def pool_timeout_handler(_: Request, __: Exception) -> JSONResponse:
+    # The tuned SQLite writer pool has a single connection, so a write that
+    # arrives during a long import can time out waiting for it. That is
+    # transient back-pressure, not a server error.
+    return JSONResponse(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        content={"detail": "The database is busy. Please retry shortly."},
+        headers={"Retry-After": str(settings.db_pool_retry_after_seconds)},
+    )
 
 
 def create_app() -> FastAPI:
@@ -34,7 +94,15 @@ def create_app() -> FastAPI:
         allow_credentials=True,
         allow_methods=["*"],
         allow_headers=["*"],
+        expose_headers=[REQUEST_ID_HEADER],
     )
+    if settings.sql_profiling_enabled:
+        app.add_middleware(SqlProfilerMiddleware)
+    if settings.metrics_enabled:
+        # Added last so it is outermost and times the whole middleware stack.
+        app.add_middleware(MetricsMiddleware)
+        app.include_router(metrics.router)
+    app.add_exception_handler(sa_exc.TimeoutError, pool_timeout_handler)
     app.include_router(api_router, prefix=settings.api_v1_prefix)
     return app
 
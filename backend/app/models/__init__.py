@@ -1,4 +1,14 @@
-from app.models.provider import ProviderRecord, RiskLevel, ValidationStatus
+from app.models.change_event import ProviderChangeEvent
+from app.models.heartbeat import ReplicationHeartbeat
+from app.models.provider import ProviderMatchKey, ProviderRecord, RiskLevel, ValidationStatus
 from app.models.user import User
 
-__all__ = ["User", "ProviderRecord", "RiskLevel", "ValidationStatus"]
+__all__ = [
+    "User",
+    "ProviderRecord",
+    "ProviderMatchKey",
+    "ProviderChangeEvent",
+    "ReplicationHeartbeat",
+    "RiskLevel",
+    "ValidationStatus",
+]
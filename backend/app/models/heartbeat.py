@@ -0,0 +1,15 @@
+from __future__ import annotations
+
+from sqlalchemy import Float, String
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.models.base import Base
+
+
+# A single row the primary rewrites on a timer; its age as seen on a replica
+# is the replication lag.
+class ReplicationHeartbeat(Base):
+    __tablename__ = "replication_heartbeat"
+
+    id: Mapped[str] = mapped_column(String(16), primary_key=True)
+    beat_at: Mapped[float] = mapped_column(Float, nullable=False)
@@ -4,7 +4,7 @@ from datetime import datetime
 from enum import Enum
 from uuid import uuid4
 
-from sqlalchemy import DateTime, Enum as SAEnum, Float, ForeignKey, String, Text, func
+from sqlalchemy import DateTime, Enum as SAEnum, Float, ForeignKey, Index, Integer, String, Text, func
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.models.base import Base
@@ -31,6 +31,9 @@ class ProviderRecord(Base):
     npi: Mapped[str | None] = mapped_column(String(32), index=True, nullable=True)
     phone: Mapped[str | None] = mapped_column(String(64), nullable=True)
     address: Mapped[str | None] = mapped_column(String(255), nullable=True)
+    city: Mapped[str | None] = mapped_column(String(120), nullable=True)
+    state: Mapped[str | None] = mapped_column(String(64), nullable=True)
+    zip_code: Mapped[str | None] = mapped_column(String(16), nullable=True)
 
     risk_level: Mapped[RiskLevel] = mapped_column(
         SAEnum(RiskLevel), default=RiskLevel.LOW, nullable=False
@@ -41,6 +44,8 @@ class ProviderRecord(Base):
     confidence_score: Mapped[float] = mapped_column(Float, default=0.0, nullable=False)
     primary_issue: Mapped[str | None] = mapped_column(Text, nullable=True)
     source_file: Mapped[str | None] = mapped_column(String(255), nullable=True)
+    # Id of the first-seen record of the provider's duplicate cluster, or None.
+    duplicate_cluster_id: Mapped[str | None] = mapped_column(String(36), nullable=True)
 
     owner_id: Mapped[str] = mapped_column(
         String(36), ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True
@@ -54,3 +59,15 @@ class ProviderRecord(Base):
     )
 
     owner = relationship("User", back_populates="providers")
+
+
+class ProviderMatchKey(Base):
+    __tablename__ = "provider_match_keys"
+    __table_args__ = (Index("ix_provider_match_keys_owner_key", "owner_id", "key"),)
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    provider_id: Mapped[str] = mapped_column(
+        String(36), ForeignKey("provider_records.id", ondelete="CASCADE"), nullable=False, index=True
+    )
+    owner_id: Mapped[str] = mapped_column(String(36), nullable=False)
+    key: Mapped[str] = mapped_column(String(64), nullable=False)
@@ -0,0 +1,38 @@
+from pydantic import BaseModel
+
+
+class PasswordHashingStats(BaseModel):
+    workers: int
+    capacity: int
+    in_flight: int
+    queue_depth: int
+    completed_total: int
+    rejected_total: int
+    avg_latency_ms: float
+    max_latency_ms: float
+    avg_wait_ms: float
+
+
+class PoolStats(BaseModel):
+    name: str
+    pool_class: str
+    pool_size: int | None = None
+    checked_out: int
+    peak_checked_out: int
+    overflow: int | None = None
+    overflow_total: int
+    connections_created: int
+    checkouts_total: int
+    timeouts_total: int
+    invalidations_total: int
+    avg_wait_ms: float
+    max_wait_ms: float
+
+
+class ReplicaStats(BaseModel):
+    replica_configured: bool
+    lag_seconds: float | None = None
+    healthy: bool
+    max_lag_seconds: float
+    read_your_writes_seconds: float
+    routed: dict[str, int]
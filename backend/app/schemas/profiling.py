@@ -0,0 +1,36 @@
+from pydantic import BaseModel
+
+
+class SqlStatement(BaseModel):
+    sql: str
+    parameters: list[str]
+    parameter_sets: int
+    duration_ms: float
+    rows: int
+    engine: str
+    plan: list[str] | None = None
+
+
+class SqlFinding(BaseModel):
+    kind: str
+    sql: str
+    count: int
+    total_ms: float
+
+
+class SqlProfileSummary(BaseModel):
+    request_id: str
+    method: str
+    route: str
+    status_code: int
+    started_at: float
+    duration_ms: float
+    statement_count: int
+    db_ms: float
+    finding_count: int
+
+
+class SqlProfile(SqlProfileSummary):
+    path: str
+    statements: list[SqlStatement]
+    findings: list[SqlFinding]
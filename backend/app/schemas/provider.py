@@ -1,6 +1,6 @@
 from datetime import datetime
 
-from pydantic import BaseModel, ConfigDict, Field
+from pydantic import BaseModel, ConfigDict, Field, field_validator
 
 from app.models.provider import RiskLevel, ValidationStatus
 
@@ -14,11 +14,15 @@ class ProviderRead(BaseModel):
     npi: str | None = None
     phone: str | None = None
     address: str | None = None
+    city: str | None = None
+    state: str | None = None
+    zip_code: str | None = None
     risk_level: RiskLevel
     validation_status: ValidationStatus
     confidence_score: float = Field(ge=0.0, le=1.0)
     primary_issue: str | None = None
     source_file: str | None = None
+    duplicate_cluster_id: str | None = None
     created_at: datetime
     updated_at: datetime
 
@@ -45,3 +49,45 @@ class ImportResult(BaseModel):
 
 class BatchValidationResult(BaseModel):
     processed: int
+
+
+class ProviderIds(BaseModel):
+    ids: list[str] = Field(min_length=1)
+
+
+class ProviderStatusDecision(ProviderIds):
+    validation_status: ValidationStatus
+
+    @field_validator("validation_status")
+    @classmethod
+    def reject_pending(cls, value: ValidationStatus) -> ValidationStatus:
+        # Pending is the state before any validation, not a reviewer decision.
+        if value == ValidationStatus.PENDING:
+            raise ValueError("Choose Validated or Needs Review.")
+        return value
+
+
+class ProviderBatchResponse(BaseModel):
+    items: list[ProviderRead]
+    missing: list[str]
+
+
+class BulkUpdateResult(BaseModel):
+    updated: int
+    missing: list[str]
+
+
+class DuplicateCluster(BaseModel):
+    cluster_id: str
+    providers: list[ProviderRead]
+
+
+class DuplicateClusterListResponse(BaseModel):
+    clusters: list[DuplicateCluster]
+    total: int
+    page: int
+    page_size: int
+
+
+class DuplicateScanResult(BaseModel):
+    indexed: int
@@ -0,0 +1,202 @@
+"""Local postal reference index for address consistency checks.
+
+A postal reference (GeoNames postal-code dumps, or a ``postal_code,city,state``
+CSV) is precomputed once into a compact JSON file. At startup it is loaded
+into memory as one dict from postal code to a tuple of place ids, plus
+interned place and state names, so checking an address is a few dict and set
+lookups with no network. Build it with::
+
+    python -m app.services.address_index build US.txt IN.txt -o postal.json
+"""
+from __future__ import annotations
+
+import argparse
+import csv
+import json
+import os
+import re
+import time
+from collections.abc import Iterable, Iterator
+from dataclasses import dataclass
+from functools import lru_cache
+from pathlib import Path
+
+from app.core.config import settings
+
+VERSION = 1
+
+_PUNCTUATION = re.compile(r"[^\w\s]")
+_SPACES = re.compile(r"\s+")
+
+# USPS Publication 28 abbreviations for the most common street suffixes,
+# directionals and unit designators.
+STREET_ABBREVIATIONS = {
+    "AVENUE": "AVE", "BOULEVARD": "BLVD", "CIRCLE": "CIR", "COURT": "CT", "DRIVE": "DR",
+    "EXPRESSWAY": "EXPY", "FREEWAY": "FWY", "HIGHWAY": "HWY", "LANE": "LN", "PARKWAY": "PKWY",
+    "PLACE": "PL", "ROAD": "RD", "SQUARE": "SQ", "STREET": "ST", "TERRACE": "TER", "TRAIL": "TRL",
+    "NORTH": "N", "SOUTH": "S", "EAST": "E", "WEST": "W",
+    "NORTHEAST": "NE", "NORTHWEST": "NW", "SOUTHEAST": "SE", "SOUTHWEST": "SW",
+    "APARTMENT": "APT", "BUILDING": "BLDG", "FLOOR": "FL", "SUITE": "STE", "ROOM": "RM",
+}
+_DESIGNATORS = set(STREET_ABBREVIATIONS.values())
+
+
+def normalize_text(value: str | None) -> str:
+    if not value:
+        return ""
+    return _SPACES.sub(" ", _PUNCTUATION.sub(" ", value.upper())).strip()
+
+
+def normalize_street(address: str | None) -> str:
+    """Upper-case, strip punctuation and apply USPS abbreviations."""
+    return " ".join(STREET_ABBREVIATIONS.get(token, token) for token in normalize_text(address).split())
+
+
+def street_is_incomplete(normalized_street: str) -> bool:
+    # A usable street line names a street: at least two tokens, one of them a
+    # word that is not just a suffix, directional or unit designator.
+    tokens = normalized_street.split()
+    return len(tokens) < 2 or not any(
+        token.isalpha() and len(token) > 1 and token not in _DESIGNATORS for token in tokens
+    )
+
+
+def normalize_postal_code(value: str | None) -> str:
+    # ZIP+4 and "560 001" style codes reduce to their base code.
+    text = normalize_text(value).replace(" ", "")
+    if len(text) == 9 and text.isdigit():
+        return text[:5]
+    return text
+
+
+@dataclass(frozen=True)
+class AddressCheck:
+    postal_code_known: bool
+    city_matches: bool
+    state_matches: bool
+
+
+class PostalIndex:
+    def __init__(
+        self,
+        places: list[tuple[int, tuple[str, ...]]],
+        states: list[frozenset[str]],
+        postal: dict[str, tuple[int, ...]],
+    ) -> None:
+        # places[i] is (state id, city aliases); states[j] holds a state's name and code.
+        self.places = places
+        self.states = states
+        self.postal = postal
+
+    @classmethod
+    def load(cls, path: str | os.PathLike[str]) -> PostalIndex:
+        with open(path, encoding="utf-8") as handle:
+            payload = json.load(handle)
+        if payload.get("version") != VERSION:
+            raise ValueError(f"{path} is not a version {VERSION} postal index.")
+        return cls(
+            places=[(state_id, tuple(aliases)) for state_id, aliases in payload["places"]],
+            states=[frozenset(aliases) for aliases in payload["states"]],
+            postal={code: tuple(ids) for code, ids in payload["postal"].items()},
+        )
+
+    def __len__(self) -> int:
+        return len(self.postal)
+
+    def check(self, postal_code: str | None, city: str | None, state: str | None) -> AddressCheck:
+        place_ids = self.postal.get(normalize_postal_code(postal_code))
+        if not place_ids:
+            return AddressCheck(postal_code_known=False, city_matches=False, state_matches=False)
+        city_name = normalize_text(city)
+        state_name = normalize_text(state)
+        city_matches = not city_name
+        state_matches = not state_name
+        for place_id in place_ids:
+            state_id, aliases = self.places[place_id]
+            if not state_matches and state_name in self.states[state_id]:
+                state_matches = True
+            if not city_matches and city_name in aliases:
+                city_matches = True
+            if city_matches and state_matches:
+                break
+        return AddressCheck(postal_code_known=True, city_matches=city_matches, state_matches=state_matches)
+
+
+@lru_cache
+def get_postal_index() -> PostalIndex | None:
+    if not settings.postal_index_path:
+        return None
+    return PostalIndex.load(settings.postal_index_path)
+
+
+def read_geonames(path: str | os.PathLike[str]) -> Iterator[tuple[str, list[str], list[str]]]:
+    """Yield ``(postal_code, city aliases, state aliases)`` from a GeoNames postal dump."""
+    with open(path, newline="", encoding="utf-8") as handle:
+        for row in csv.reader(handle, delimiter="\t"):
+            if len(row) < 7:
+                continue
+            # country, postal code, place name, admin1 name/code, admin2 name/code, ...
+            yield row[1], [row[2], row[5]], [row[3], row[4]]
+
+
+def read_postal_csv(path: str | os.PathLike[str]) -> Iterator[tuple[str, list[str], list[str]]]:
+    """Yield entries from a ``postal_code,city,state[,state_code]`` CSV."""
+    with open(path, newline="", encoding="utf-8-sig") as handle:
+        for row in csv.DictReader(handle):
+            yield row["postal_code"], [row["city"]], [row["state"], row.get("state_code", "")]
+
+
+def build_index(entries: Iterable[tuple[str, list[str], list[str]]]) -> dict:
+    state_ids: dict[frozenset[str], int] = {}
+    place_ids: dict[tuple[int, tuple[str, ...]], int] = {}
+    postal: dict[str, list[int]] = {}
+    for postal_code, cities, states in entries:
+        code = normalize_postal_code(postal_code)
+        state_aliases = frozenset(alias for alias in map(normalize_text, states) if alias)
+        city_aliases = tuple(dict.fromkeys(alias for alias in map(normalize_text, cities) if alias))
+        if not code or not city_aliases:
+            continue
+        state_id = state_ids.setdefault(state_aliases, len(state_ids))
+        place_id = place_ids.setdefault((state_id, city_aliases), len(place_ids))
+        ids = postal.setdefault(code, [])
+        if place_id not in ids:
+            ids.append(place_id)
+    return {
+        "version": VERSION,
+        "states": [sorted(aliases) for aliases in state_ids],
+        "places": [[state_id, list(aliases)] for state_id, aliases in place_ids],
+        "postal": postal,
+    }
+
+
+def write_index(path: str | os.PathLike[str], entries: Iterable[tuple[str, list[str], list[str]]]) -> int:
+    payload = build_index(entries)
+    path = Path(path)
+    tmp_path = path.with_suffix(path.suffix + ".tmp")
+    with open(tmp_path, "w", encoding="utf-8") as handle:
+        json.dump(payload, handle, separators=(",", ":"))
+    os.replace(tmp_path, path)
+    return len(payload["postal"])
+
+
+def _read_any(paths: list[str]) -> Iterator[tuple[str, list[str], list[str]]]:
+    for path in paths:
+        yield from (read_postal_csv(path) if path.endswith(".csv") else read_geonames(path))
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(prog="python -m app.services.address_index")
+    commands = parser.add_subparsers(dest="command", required=True)
+    build = commands.add_parser("build", help="Build an index from GeoNames dumps or postal CSVs.")
+    build.add_argument("sources", nargs="+")
+    build.add_argument("-o", "--output", required=True)
+    args = parser.parse_args(argv)
+
+    started = time.perf_counter()
+    count = write_index(args.output, _read_any(args.sources))
+    size = Path(args.output).stat().st_size
+    print(f"Indexed {count} postal codes into {args.output} ({size / 1e6:.1f} MB) in {time.perf_counter() - started:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
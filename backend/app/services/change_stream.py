@@ -0,0 +1,299 @@
+"""Per-owner change stream behind ``GET /providers/events``.
+
+Write endpoints wrap their work in ``provider_changes`` and pass the
+change's ``SummaryDelta`` to the CRUD function, which counts how the rows it
+changed move the summary. Once the write has committed, the owner's new
+summary, that delta and the IDs of the changed providers (``None`` when there
+are more than ``APP_CHANGE_STREAM_MAX_IDS``, meaning "refetch everything") are
+published. The summary is only read when some stream could receive the
+event. ``change_broker`` fans each event out to that owner's open streams,
+each of which has a bounded queue. A stream that falls behind is sent a single
+``resync`` event instead of its backlog.
+
+A stream opens with a ``ready`` event that carries the current summary. After
+``APP_CHANGE_STREAM_MAX_SECONDS`` it ends with a ``reconnect`` event. Servers
+wait for open responses before a worker exits, so without that limit a
+recycled or reloaded worker would hang until its graceful timeout.
+
+How events reach the broker depends on ``APP_CHANGE_STREAM_BACKEND``:
+
+``memory``
+    Delivered directly. Only streams served by the same process see them.
+``database``
+    Appended to ``provider_change_events``, which every process polls every
+    ``APP_CHANGE_STREAM_POLL_SECONDS``. Needed when several server workers
+    run. The polling is one query per process, however many dashboards are
+    connected.
+"""
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import threading
+import time
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Any
+
+from sqlalchemy import delete, func, insert, select
+from sqlalchemy.orm import Session, sessionmaker
+
+from app.core.config import settings
+from app.crud.provider import SummaryDelta, summary
+from app.db.session import ReadSessionLocal, SessionLocal
+from app.models.change_event import ProviderChangeEvent
+
+logger = logging.getLogger(__name__)
+
+RESYNC: dict[str, Any] = {"type": "resync"}
+
+
+@dataclass
+class ProviderChange:
+    owner_id: str
+    reason: str
+    provider_ids: list[str] | None = field(default_factory=list)
+    delta: SummaryDelta = field(default_factory=SummaryDelta)
+
+    def event(self, after: dict[str, Any], max_ids: int) -> dict[str, Any]:
+        ids = self.provider_ids
+        return {
+            "type": "providers",
+            "reason": self.reason,
+            "provider_ids": ids if ids is not None and len(ids) <= max_ids else None,
+            "summary": after,
+            "delta": self.delta.changes(after),
+            "at": time.time(),
+        }
+
+
+class Subscription:
+    """One open stream: a bounded queue fed from any thread."""
+
+    def __init__(self, owner_id: str, queue_size: int) -> None:
+        self.owner_id = owner_id
+        self.queue: asyncio.Queue[dict[str, Any]] = asyncio.Queue(max(1, queue_size))
+        self._loop = asyncio.get_running_loop()
+
+    def deliver(self, event: dict[str, Any]) -> None:
+        try:
+            self._loop.call_soon_threadsafe(self._put, event)
+        except RuntimeError:
+            # The stream's event loop has closed; unsubscribe will follow.
+            pass
+
+    def _put(self, event: dict[str, Any]) -> None:
+        if self.queue.full():
+            while not self.queue.empty():
+                self.queue.get_nowait()
+            event = RESYNC
+        self.queue.put_nowait(event)
+
+
+class MemoryBackend:
+    # Whether streams in other processes receive this process's events.
+    shared = False
+
+    def __init__(self) -> None:
+        self._deliver: Callable[[str, dict[str, Any]], None] = lambda _owner, _event: None
+
+    def attach(self, deliver: Callable[[str, dict[str, Any]], None]) -> None:
+        self._deliver = deliver
+
+    def publish(self, owner_id: str, event: dict[str, Any]) -> None:
+        self._deliver(owner_id, event)
+
+    def start(self) -> None:
+        return None
+
+    def stop(self) -> None:
+        return None
+
+
+class DatabaseBackend(MemoryBackend):
+    """Share events between processes through ``provider_change_events``.
+
+    A background thread writes queued events and then reads any new rows,
+    so a request that publishes never waits for a database connection. On
+    SQLite that connection is the single writer connection. Rows are read
+    through ``reader`` and written and pruned through ``writer``.
+    """
+
+    shared = True
+
+    def __init__(
+        self,
+        writer: sessionmaker[Session],
+        reader: sessionmaker[Session],
+        poll_seconds: float,
+        retention_seconds: float,
+    ) -> None:
+        super().__init__()
+        self.writer = writer
+        self.reader = reader
+        self.poll_seconds = poll_seconds
+        self.retention_seconds = retention_seconds
+        self._lock = threading.Lock()
+        self._outbox: list[dict[str, Any]] = []
+        self._last_id: int | None = None
+        self._pruned_at = 0.0
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def publish(self, owner_id: str, event: dict[str, Any]) -> None:
+        row = {"owner_id": owner_id, "payload": json.dumps(event), "created_at": time.time()}
+        with self._lock:
+            self._outbox.append(row)
+
+    def poll(self) -> int:
+        """Write queued events, then deliver new rows; returns rows delivered."""
+        with self._lock:
+            outbox, self._outbox = self._outbox, []
+        if self._last_id is None:
+            # Start from the current tail: older events were for streams that
+            # were open before this process started.
+            with self.reader() as db:
+                self._last_id = int(db.scalar(select(func.max(ProviderChangeEvent.id))) or 0)
+        now = time.time()
+        if outbox or now - self._pruned_at >= self.retention_seconds:
+            with self.writer() as db:
+                if outbox:
+                    db.execute(insert(ProviderChangeEvent), outbox)
+                if now - self._pruned_at >= self.retention_seconds:
+                    db.execute(
+                        delete(ProviderChangeEvent).where(
+                            ProviderChangeEvent.created_at < now - self.retention_seconds
+                        )
+                    )
+                    self._pruned_at = now
+                db.commit()
+        with self.reader() as db:
+            rows = db.execute(
+                select(ProviderChangeEvent.id, ProviderChangeEvent.owner_id, ProviderChangeEvent.payload)
+                .where(ProviderChangeEvent.id > self._last_id)
+                .order_by(ProviderChangeEvent.id)
+            ).all()
+        for row in rows:
+            self._last_id = row.id
+            self._deliver(row.owner_id, json.loads(row.payload))
+        return len(rows)
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            try:
+                self.poll()
+            except Exception:
+                logger.exception("Change stream poll failed.")
+            self._stop.wait(self.poll_seconds)
+
+    def start(self) -> None:
+        if self._thread is not None:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="change-stream-poller", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+
+class ChangeBroker:
+    def __init__(self, backend: MemoryBackend, queue_size: int) -> None:
+        self.backend = backend
+        self.queue_size = queue_size
+        self._lock = threading.Lock()
+        self._subscriptions: dict[str, set[Subscription]] = {}
+        backend.attach(self._fan_out)
+
+    def subscribe(self, owner_id: str) -> Subscription:
+        subscription = Subscription(owner_id, self.queue_size)
+        with self._lock:
+            self._subscriptions.setdefault(owner_id, set()).add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        with self._lock:
+            owned = self._subscriptions.get(subscription.owner_id)
+            if owned is not None:
+                owned.discard(subscription)
+                if not owned:
+                    del self._subscriptions[subscription.owner_id]
+
+    def has_listeners(self, owner_id: str) -> bool:
+        """False when no stream can receive the owner's events, so none need building."""
+        if self.backend.shared:
+            return True
+        with self._lock:
+            return owner_id in self._subscriptions
+
+    def subscriber_count(self) -> int:
+        with self._lock:
+            return sum(len(owned) for owned in self._subscriptions.values())
+
+    def publish(self, owner_id: str, event: dict[str, Any]) -> None:
+        self.backend.publish(owner_id, event)
+
+    def _fan_out(self, owner_id: str, event: dict[str, Any]) -> None:
+        with self._lock:
+            targets = list(self._subscriptions.get(owner_id, ()))
+        for subscription in targets:
+            subscription.deliver(event)
+
+    def start(self) -> None:
+        self.backend.start()
+
+    def stop(self) -> None:
+        self.backend.stop()
+
+
+def _create_backend() -> MemoryBackend:
+    if settings.change_stream_backend == "database":
+        return DatabaseBackend(
+            SessionLocal,
+            ReadSessionLocal,
+            settings.change_stream_poll_seconds,
+            settings.change_stream_retention_seconds,
+        )
+    return MemoryBackend()
+
+
+change_broker = ChangeBroker(_create_backend(), settings.change_stream_queue_size)
+
+
+def current_summary(owner_id: str) -> dict[str, Any]:
+    # Read through the reader pool so the writer connection (the only one
+    # with the tuned SQLite profile) is never held for it.
+    with ReadSessionLocal() as db:
+        return summary(db, owner_id=owner_id)
+
+
+def publish_change(change: ProviderChange) -> None:
+    """Publish ``change`` to the owner's streams. Reads the summary, so call it off the event loop."""
+    if (
+        not settings.change_stream_enabled
+        or change.provider_ids == []
+        or not change_broker.has_listeners(change.owner_id)
+    ):
+        return
+    change_broker.publish(
+        change.owner_id, change.event(current_summary(change.owner_id), settings.change_stream_max_ids)
+    )
+
+
+@contextmanager
+def provider_changes(owner_id: str, reason: str) -> Iterator[ProviderChange]:
+    """Publish a change event for the owner once the wrapped write succeeds."""
+    change = ProviderChange(owner_id, reason)
+    yield change
+    publish_change(change)
+
+
+def format_event(event: dict[str, Any]) -> str:
+    kind = event.get("type", "message")
+    data = {key: value for key, value in event.items() if key != "type"}
+    return f"event: {kind}\ndata: {json.dumps(data, separators=(',', ':'))}\n\n"
@@ -0,0 +1,154 @@
+"""Duplicate-provider detection with blocking keys and MinHash/LSH.
+
+Every provider gets a handful of blocking keys: its NPI, its normalised phone
+number, and one locality-sensitive hash per band of a MinHash signature over
+its name and street (scoped to its ZIP code when it has one). Two providers
+are only ever compared when they share a key, so finding the candidates for a
+batch of new rows is a keyed lookup rather than a scan, and each candidate pair
+is then confirmed by comparing names, phones and addresses directly.
+"""
+from __future__ import annotations
+
+import random
+import zlib
+from collections.abc import Iterable
+from dataclasses import dataclass
+
+from app.services.address_index import normalize_postal_code, normalize_street, normalize_text
+
+NUM_BANDS = 8
+ROWS_PER_BAND = 4
+NUM_PERMUTATIONS = NUM_BANDS * ROWS_PER_BAND
+SHINGLE_SIZE = 3
+
+# Keys shared by more providers than this (a switchboard number, a hospital's
+# street block) say nothing about any one pair and are skipped.
+MAX_BUCKET_SIZE = 64
+
+NAME_SIMILARITY = 0.6
+ADDRESS_SIMILARITY = 0.5
+
+_PRIME = (1 << 61) - 1
+_rng = random.Random(0x5EED)
+_PERMUTATIONS = [
+    (_rng.randrange(1, _PRIME), _rng.randrange(0, _PRIME)) for _ in range(NUM_PERMUTATIONS)
+]
+
+# Titles and credentials that vary between directories for the same person.
+_NAME_NOISE = {
+    "DR", "MD", "DO", "PHD", "NP", "PA", "PAC", "RN", "APRN", "DDS", "DMD", "DPM", "OD",
+    "FACC", "FACP", "MR", "MRS", "MS", "JR", "SR", "II", "III",
+}
+
+
+@dataclass(frozen=True)
+class MatchFeatures:
+    npi: str
+    phone: str
+    zip_code: str
+    name: frozenset[str]
+    address: frozenset[str]
+
+
+def normalize_name(name: str | None) -> str:
+    # Token order is dropped so "Smith, Jane" and "Jane Smith" compare equal.
+    tokens = [token for token in normalize_text(name).split() if token not in _NAME_NOISE]
+    return " ".join(sorted(tokens))
+
+
+def normalize_phone(phone: str | None) -> str:
+    digits = "".join(char for char in phone or "" if char.isdigit())
+    if len(digits) == 11 and digits.startswith("1"):
+        digits = digits[1:]
+    return digits if len(digits) == 10 else ""
+
+
+def shingles(text: str) -> frozenset[str]:
+    if not text:
+        return frozenset()
+    padded = f" {text} "
+    if len(padded) <= SHINGLE_SIZE:
+        return frozenset([padded])
+    return frozenset(padded[i:i + SHINGLE_SIZE] for i in range(len(padded) - SHINGLE_SIZE + 1))
+
+
+def features(
+    provider_name: str | None,
+    npi: str | None,
+    phone: str | None,
+    address: str | None,
+    zip_code: str | None,
+) -> MatchFeatures:
+    npi = (npi or "").strip()
+    return MatchFeatures(
+        npi=npi if len(npi) == 10 and npi.isdigit() else "",
+        phone=normalize_phone(phone),
+        zip_code=normalize_postal_code(zip_code),
+        name=shingles(normalize_name(provider_name)),
+        address=shingles(normalize_street(address)),
+    )
+
+
+def minhash(items: Iterable[str]) -> list[int]:
+    hashes = [zlib.crc32(item.encode()) for item in items]
+    if not hashes:
+        return []
+    return [min((a * value + b) % _PRIME for value in hashes) for a, b in _PERMUTATIONS]
+
+
+def blocking_keys(match: MatchFeatures) -> list[str]:
+    keys = []
+    if match.npi:
+        keys.append(f"npi:{match.npi}")
+    if match.phone:
+        keys.append(f"phone:{match.phone}")
+    # Name and street shingles are tagged so "MAIN" in a name and in a street
+    # stay distinct.
+    signature = minhash([f"n{item}" for item in match.name] + [f"a{item}" for item in match.address])
+    if match.name and signature:
+        for band in range(NUM_BANDS):
+            rows = signature[band * ROWS_PER_BAND:(band + 1) * ROWS_PER_BAND]
+            digest = zlib.crc32(",".join(map(str, rows)).encode())
+            keys.append(f"lsh{band}:{match.zip_code}:{digest:08x}")
+    return keys
+
+
+def jaccard(left: frozenset[str], right: frozenset[str]) -> float:
+    if not left or not right:
+        return 0.0
+    return len(left & right) / len(left | right)
+
+
+def is_duplicate(left: MatchFeatures, right: MatchFeatures) -> bool:
+    if left.npi and right.npi:
+        # Two different valid NPIs are two registered providers, however alike.
+        return left.npi == right.npi
+    if jaccard(left.name, right.name) < NAME_SIMILARITY:
+        return False
+    if left.phone and left.phone == right.phone:
+        return True
+    return jaccard(left.address, right.address) >= ADDRESS_SIMILARITY
+
+
+class DisjointSet:
+    def __init__(self) -> None:
+        self._parent: dict[str, str] = {}
+
+    def find(self, item: str) -> str:
+        parent = self._parent.setdefault(item, item)
+        while parent != item:
+            grandparent = self._parent.setdefault(parent, parent)
+            self._parent[item] = grandparent
+            item, parent = parent, grandparent
+        return item
+
+    def union(self, left: str, right: str) -> None:
+        left_root, right_root = self.find(left), self.find(right)
+        if left_root != right_root:
+            self._parent[right_root] = left_root
+
+    def groups(self) -> list[list[str]]:
+        grouped: dict[str, list[str]] = {}
+        for item in self._parent:
+            grouped.setdefault(self.find(item), []).append(item)
+        return [members for members in grouped.values() if len(members) > 1]
@@ -0,0 +1,206 @@
+"""Offline NPI registry index.
+
+The index is a single little-endian file built once from the NPPES bulk
+export and memory-mapped read-only, so every worker process on a host shares
+the same pages through the OS page cache::
+
+    header    "NPIX", version, record count, specialty table offset/length
+    npis      uint32[count], sorted (every NPI is below 2**32)
+    codes     uint16[count], index into the specialty table
+    table     JSON list of [taxonomy_code, description]
+
+Lookups are a binary search over the mapped ``npis`` array. Build it with::
+
+    python -m app.services.npi_index build npidata_pfile.csv npi.idx [--taxonomy nucc_taxonomy.csv]
+"""
+from __future__ import annotations
+
+import argparse
+import csv
+import json
+import mmap
+import os
+import struct
+import sys
+import time
+from array import array
+from bisect import bisect_left
+from collections.abc import Iterable, Iterator
+from dataclasses import dataclass
+from functools import lru_cache
+from pathlib import Path
+
+from app.core.config import settings
+
+MAGIC = b"NPIX"
+VERSION = 1
+HEADER = struct.Struct("<4sHxxQQQ")
+TAXONOMY_SLOTS = 15
+
+
+@dataclass(frozen=True)
+class NpiEntry:
+    npi: str
+    taxonomy_code: str
+    specialty: str | None
+
+
+class NpiIndex:
+    def __init__(self, path: str | os.PathLike[str]) -> None:
+        if sys.byteorder != "little":
+            raise RuntimeError("NPI index files are little-endian; this platform is not supported.")
+        self.path = Path(path)
+        with open(self.path, "rb") as handle:
+            self._mmap = mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, count, table_offset, table_length = HEADER.unpack_from(self._mmap, 0)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"{self.path} is not a version {VERSION} NPI index.")
+
+        self.count = count
+        view = memoryview(self._mmap)
+        npis_end = HEADER.size + 4 * count
+        self._npis = view[HEADER.size:npis_end].cast("I")
+        self._codes = view[npis_end:npis_end + 2 * count].cast("H")
+        self._specialties: list[tuple[str, str | None]] = [
+            (code, description or None)
+            for code, description in json.loads(bytes(view[table_offset:table_offset + table_length]))
+        ]
+
+    def __len__(self) -> int:
+        return self.count
+
+    def _position(self, npi: str) -> int | None:
+        if len(npi) != 10 or not npi.isdigit():
+            return None
+        key = int(npi)
+        if key >= 2**32:
+            return None
+        position = bisect_left(self._npis, key)
+        if position < self.count and self._npis[position] == key:
+            return position
+        return None
+
+    def __contains__(self, npi: object) -> bool:
+        return isinstance(npi, str) and self._position(npi) is not None
+
+    def lookup(self, npi: str) -> NpiEntry | None:
+        position = self._position(npi)
+        if position is None:
+            return None
+        taxonomy_code, specialty = self._specialties[self._codes[position]]
+        return NpiEntry(npi=npi, taxonomy_code=taxonomy_code, specialty=specialty)
+
+
+@lru_cache
+def get_npi_index() -> NpiIndex | None:
+    if not settings.npi_index_path:
+        return None
+    return NpiIndex(settings.npi_index_path)
+
+
+def write_index(
+    path: str | os.PathLike[str],
+    entries: Iterable[tuple[int, str]],
+    descriptions: dict[str, str] | None = None,
+) -> int:
+    """Write ``(npi, taxonomy_code)`` pairs as an index file; returns the record count."""
+    descriptions = descriptions or {}
+    code_ids: dict[str, int] = {}
+    packed = array("Q")
+    for npi, taxonomy_code in entries:
+        if not 0 <= npi < 2**32:
+            raise ValueError(f"NPI {npi} does not fit the index's uint32 keys.")
+        code_id = code_ids.setdefault(taxonomy_code, len(code_ids))
+        packed.append(npi << 16 | code_id)
+    if len(code_ids) > 0xFFFF:
+        raise ValueError("Too many distinct taxonomy codes for a uint16 index.")
+
+    ordered = sorted(packed)
+    npis = array("I")
+    codes = array("H")
+    previous = None
+    for item in ordered:
+        npi = item >> 16
+        if npi == previous:
+            continue
+        previous = npi
+        npis.append(npi)
+        codes.append(item & 0xFFFF)
+    del ordered, packed
+
+    table = json.dumps([[code, descriptions.get(code, "")] for code in code_ids]).encode("utf-8")
+    table_offset = HEADER.size + 4 * len(npis) + 2 * len(codes)
+    path = Path(path)
+    tmp_path = path.with_suffix(path.suffix + ".tmp")
+    with open(tmp_path, "wb") as handle:
+        handle.write(HEADER.pack(MAGIC, VERSION, len(npis), table_offset, len(table)))
+        npis.tofile(handle)
+        codes.tofile(handle)
+        handle.write(table)
+    os.replace(tmp_path, path)
+    return len(npis)
+
+
+def read_nppes(path: str | os.PathLike[str]) -> Iterator[tuple[int, str]]:
+    """Yield ``(npi, primary taxonomy code)`` for every active NPI in an NPPES export."""
+    with open(path, newline="", encoding="utf-8", errors="replace") as handle:
+        reader = csv.DictReader(handle)
+        for row in reader:
+            npi = row.get("NPI", "")
+            if len(npi) != 10 or not npi.isdigit():
+                continue
+            if row.get("NPI Deactivation Date") and not row.get("NPI Reactivation Date"):
+                continue
+            first = primary = ""
+            for slot in range(1, TAXONOMY_SLOTS + 1):
+                code = row.get(f"Healthcare Provider Taxonomy Code_{slot}", "")
+                if not code:
+                    continue
+                first = first or code
+                if row.get(f"Healthcare Provider Primary Taxonomy Switch_{slot}") == "Y":
+                    primary = code
+                    break
+            taxonomy_code = primary or first
+            yield int(npi), taxonomy_code
+
+
+def read_taxonomy(path: str | os.PathLike[str]) -> dict[str, str]:
+    """Map taxonomy codes to display names from the NUCC taxonomy CSV."""
+    descriptions: dict[str, str] = {}
+    with open(path, newline="", encoding="utf-8", errors="replace") as handle:
+        for row in csv.DictReader(handle):
+            code = row.get("Code", "").strip()
+            name = row.get("Display Name") or ", ".join(
+                part for part in (row.get("Classification"), row.get("Specialization")) if part
+            )
+            if code:
+                descriptions[code] = name.strip()
+    return descriptions
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(prog="python -m app.services.npi_index")
+    commands = parser.add_subparsers(dest="command", required=True)
+    build = commands.add_parser("build", help="Build an index from an NPPES bulk CSV.")
+    build.add_argument("nppes_csv")
+    build.add_argument("output")
+    build.add_argument("--taxonomy", help="NUCC taxonomy CSV for specialty names.")
+    lookup = commands.add_parser("lookup", help="Look NPIs up in an index.")
+    lookup.add_argument("index")
+    lookup.add_argument("npis", nargs="+")
+    args = parser.parse_args(argv)
+
+    if args.command == "build":
+        started = time.perf_counter()
+        descriptions = read_taxonomy(args.taxonomy) if args.taxonomy else None
+        count = write_index(args.output, read_nppes(args.nppes_csv), descriptions)
+        size = Path(args.output).stat().st_size
+        print(f"Indexed {count} NPIs into {args.output} ({size / 1e6:.1f} MB) in {time.perf_counter() - started:.1f}s")
+    else:
+        index = NpiIndex(args.index)
+        for npi in args.npis:
+            print(npi, index.lookup(npi))
+
+
+if __name__ == "__main__":
+    main()
@@ -4,6 +4,13 @@ import re
 from dataclasses import dataclass
 
 from app.models.provider import RiskLevel, ValidationStatus
+from app.services.address_index import (
+    PostalIndex,
+    get_postal_index,
+    normalize_street,
+    street_is_incomplete,
+)
+from app.services.npi_index import NpiIndex, get_npi_index
 
 NPI_REGEX = re.compile(r"^\d{10}$")
 
@@ -16,6 +23,20 @@ class ValidationOutcome:
     primary_issue: str | None
 
 
+def npi_checksum_valid(npi: str) -> bool:
+    # NPIs carry a Luhn check digit computed over the number prefixed with the
+    # card issuer code 80840.
+    total = 0
+    for position, char in enumerate(reversed("80840" + npi)):
+        digit = int(char)
+        if position % 2 == 1:
+            digit *= 2
+            if digit > 9:
+                digit -= 9
+        total += digit
+    return total % 10 == 0
+
+
 def _normalize_phone(phone: str | None) -> str:
     if not phone:
         return ""
@@ -28,7 +49,16 @@ def evaluate_provider(
     npi: str | None,
     phone: str | None,
     address: str | None,
+    city: str | None = None,
+    state: str | None = None,
+    zip_code: str | None = None,
+    npi_index: NpiIndex | None = None,
+    postal_index: PostalIndex | None = None,
 ) -> ValidationOutcome:
+    if npi_index is None:
+        npi_index = get_npi_index()
+    if postal_index is None:
+        postal_index = get_postal_index()
     score = 1.0
     issues: list[str] = []
 
@@ -46,6 +76,12 @@ def evaluate_provider(
     elif not NPI_REGEX.match(npi):
         score -= 0.2
         issues.append("NPI format is invalid.")
+    elif not npi_checksum_valid(npi):
+        score -= 0.2
+        issues.append("NPI check digit is invalid.")
+    elif npi_index is not None and npi not in npi_index:
+        score -= 0.2
+        issues.append("NPI is not in the NPPES registry.")
 
     normalized_phone = _normalize_phone(phone)
     if not normalized_phone:
@@ -58,10 +94,23 @@ def evaluate_provider(
     if not address:
         score -= 0.15
         issues.append("Address is missing.")
-    elif len(address.strip()) < 8:
+    elif street_is_incomplete(normalize_street(address)):
         score -= 0.1
         issues.append("Address appears incomplete.")
 
+    if postal_index is not None and zip_code:
+        check = postal_index.check(zip_code, city, state)
+        if not check.postal_code_known:
+            score -= 0.1
+            issues.append("ZIP code is not in the postal reference.")
+        else:
+            if not check.state_matches:
+                score -= 0.1
+                issues.append("State does not match the ZIP code.")
+            if not check.city_matches:
+                score -= 0.05
+                issues.append("City does not match the ZIP code.")
+
     bounded_score = max(0.0, min(1.0, score))
     risk_level = RiskLevel.LOW
     status = ValidationStatus.VALIDATED
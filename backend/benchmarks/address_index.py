@@ -0,0 +1,75 @@
+"""Postal reference index: build time, memory footprint and check throughput.
+
+Builds an index from ``--postal-codes`` synthetic ZIP codes (one to three
+places each, spread over 50 states), loads it the way the app does at startup,
+then checks ``--addresses`` addresses (street normalisation plus ZIP to
+city/state consistency) in a single thread. Run from ``backend/``::
+
+    python -m benchmarks.address_index --postal-codes 42000 --addresses 1000000
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import random
+import tempfile
+import time
+import tracemalloc
+
+from app.services.address_index import PostalIndex, normalize_street, street_is_incomplete, write_index
+
+STREETS = ["Main Street", "Oak Avenue", "North Park Road", "Elm Boulevard", "Lake Drive", "Hill Lane"]
+
+
+def _reference(count: int, rng: random.Random) -> list[tuple[str, list[str], list[str]]]:
+    states = [(f"State {index}", f"S{index:02d}") for index in range(50)]
+    entries = []
+    for code in rng.sample(range(10000, 99999), count):
+        state = rng.choice(states)
+        for place in range(rng.randint(1, 3)):
+            entries.append((f"{code:05d}", [f"City {code}-{place}", f"County {code % 3000}"], list(state)))
+    return entries
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--postal-codes", type=int, default=42_000)
+    parser.add_argument("--addresses", type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    rng = random.Random(7)
+    entries = _reference(args.postal_codes, rng)
+    path = os.path.join(tempfile.mkdtemp(prefix="postal-bench-"), "postal.json")
+
+    started = time.perf_counter()
+    count = write_index(path, entries)
+    print(f"build: {count} postal codes, {len(entries)} places in {time.perf_counter() - started:.2f}s, "
+          f"{os.path.getsize(path) / 1e6:.1f} MB on disk")
+
+    tracemalloc.start()
+    started = time.perf_counter()
+    index = PostalIndex.load(path)
+    load_seconds = time.perf_counter() - started
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"load: {load_seconds * 1000:.0f} ms, {current / 2**20:.1f} MiB resident, {peak / 2**20:.1f} MiB peak")
+
+    addresses = []
+    for _ in range(args.addresses):
+        postal_code, cities, states = rng.choice(entries)
+        if rng.random() < 0.1:
+            postal_code = f"{rng.randrange(100000):05d}"
+        addresses.append((f"{rng.randrange(1, 9999)} {rng.choice(STREETS)}", postal_code, cities[0], states[1]))
+
+    started = time.perf_counter()
+    flagged = 0
+    for street, postal_code, city, state in addresses:
+        check = index.check(postal_code, city, state)
+        if street_is_incomplete(normalize_street(street)) or not (check.city_matches and check.state_matches):
+            flagged += 1
+    elapsed = time.perf_counter() - started
+    print(f"check: {len(addresses) / elapsed:,.0f} addresses/s ({elapsed:.2f}s for {len(addresses)}), {flagged} flagged")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,141 @@
+"""Duplicate detection: throughput, scaling and accuracy on synthetic imports.
+
+Generates ``--rows`` providers in which ``--duplicate-rate`` of the rows are
+noisy copies of earlier ones (reordered names, credentials, abbreviated
+streets, reformatted phones, dropped NPIs), imports them in ``--batch``-row
+batches through ``index_duplicates`` against a file-backed SQLite database,
+and reports rows/s per tenth of the run (flat means near-linear), the number
+of candidate keys, and pairwise precision and recall against the generator's
+ground truth. Run from ``backend/``::
+
+    python -m benchmarks.duplicates --rows 200000 --batch 5000
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import random
+import tempfile
+import time
+from itertools import combinations
+
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session, sessionmaker
+
+from app.crud.duplicate import index_duplicates
+from app.db.base import Base
+from app.db.session import create_engines
+from app.models.provider import ProviderMatchKey, ProviderRecord
+from app.models.user import User
+
+FIRST = ["Jane", "John", "Maria", "Wei", "Aisha", "Carlos", "Priya", "David", "Fatima", "Ivan", "Laura", "Omar"]
+LAST = ["Smith", "Garcia", "Chen", "Patel", "Okafor", "Kowalski", "Nguyen", "Haddad", "Silva", "Kim", "Brown"]
+STREETS = ["Main", "Oak", "Pine", "Maple", "Cedar", "Elm", "Lake", "Hill", "Park", "Sunset", "River", "Church"]
+SUFFIXES = [("Street", "St"), ("Avenue", "Ave"), ("Road", "Rd"), ("Boulevard", "Blvd"), ("Drive", "Dr")]
+
+
+def _provider(rng: random.Random, index: int) -> dict[str, str]:
+    suffix = rng.choice(SUFFIXES)[0]
+    return {
+        "provider_name": f"Dr. {rng.choice(FIRST)} {rng.choice(LAST)}-{index % 9973}",
+        "npi": str(1_000_000_000 + index) if rng.random() < 0.6 else "",
+        "phone": f"{rng.randrange(200, 999)}{rng.randrange(200, 999)}{rng.randrange(0, 9999):04d}",
+        "address": f"{rng.randrange(1, 9999)} {rng.choice(STREETS)} {suffix}",
+        "zip_code": f"{rng.randrange(10000, 99999)}",
+    }
+
+
+def _variant(rng: random.Random, original: dict[str, str]) -> dict[str, str]:
+    row = dict(original)
+    parts = row["provider_name"].removeprefix("Dr. ").split()
+    row["provider_name"] = rng.choice(
+        [f"{parts[1]}, {parts[0]}", f"{parts[0]} {parts[1]} MD", f"Dr {parts[0]} {parts[1]}"]
+    )
+    for long, short in SUFFIXES:
+        row["address"] = row["address"].replace(long, short)
+    phone = row["phone"]
+    row["phone"] = rng.choice([phone, f"({phone[:3]}) {phone[3:6]}-{phone[6:]}", f"{phone[:3]}.{phone[3:6]}.{phone[6:]}"])
+    if rng.random() < 0.5:
+        row["npi"] = ""
+    return row
+
+
+def generate(rows: int, duplicate_rate: float, seed: int) -> tuple[list[dict[str, str]], list[int]]:
+    """Rows plus, for each row, the index of the original it copies (its own index if none)."""
+    rng = random.Random(seed)
+    data: list[dict[str, str]] = []
+    origin: list[int] = []
+    for index in range(rows):
+        if data and rng.random() < duplicate_rate:
+            source = origin[rng.randrange(len(data))]
+            data.append(_variant(rng, data[source]))
+            origin.append(source)
+        else:
+            data.append(_provider(rng, index))
+            origin.append(index)
+    return data, origin
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=50_000)
+    parser.add_argument("--batch", type=int, default=5_000)
+    parser.add_argument("--duplicate-rate", type=float, default=0.1)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    data, origin = generate(args.rows, args.duplicate_rate, args.seed)
+    path = os.path.join(tempfile.mkdtemp(prefix="duplicates-bench-"), "bench.db")
+    writer, reader = create_engines(f"sqlite:///{path}")
+    Base.metadata.create_all(bind=writer)
+    WriteSession = sessionmaker(bind=writer, class_=Session, expire_on_commit=False)
+    with WriteSession() as db:
+        owner = User(email="bench@example.com", hashed_password="x")
+        db.add(owner)
+        db.commit()
+        owner_id = owner.id
+
+    ids: list[str] = []
+    rates: list[float] = []
+    started = time.perf_counter()
+    for offset in range(0, args.rows, args.batch):
+        batch = [ProviderRecord(owner_id=owner_id, **row) for row in data[offset:offset + args.batch]]
+        batch_started = time.perf_counter()
+        with WriteSession() as db:
+            db.add_all(batch)
+            index_duplicates(db, owner_id, batch)
+            db.commit()
+        rates.append(len(batch) / (time.perf_counter() - batch_started))
+        ids.extend(record.id for record in batch)
+    elapsed = time.perf_counter() - started
+
+    with WriteSession() as db:
+        cluster_of = dict(db.execute(select(ProviderRecord.id, ProviderRecord.duplicate_cluster_id)).all())
+        keys = db.scalar(select(func.count()).select_from(ProviderMatchKey))
+    writer.dispose()
+    reader.dispose()
+
+    truth: dict[int, list[int]] = {}
+    for index, source in enumerate(origin):
+        truth.setdefault(source, []).append(index)
+    true_pairs = {pair for members in truth.values() for pair in combinations(members, 2)}
+    found: dict[str, list[int]] = {}
+    for index, provider_id in enumerate(ids):
+        if cluster_id := cluster_of[provider_id]:
+            found.setdefault(cluster_id, []).append(index)
+    found_pairs = {pair for members in found.values() for pair in combinations(sorted(members), 2)}
+    hits = len(true_pairs & found_pairs)
+
+    print(f"{args.rows} rows ({len(true_pairs)} true duplicate pairs), batches of {args.batch}")
+    print(f"indexed in {elapsed:.1f}s ({args.rows / elapsed:,.0f} rows/s), {keys} blocking keys")
+    tenth = max(1, len(rates) // 10)
+    print("rows/s by tenth of the run:", " ".join(f"{sum(rates[i:i + tenth]) / len(rates[i:i + tenth]):,.0f}" for i in range(0, len(rates), tenth)))
+    print(
+        f"precision {hits / len(found_pairs) if found_pairs else 1.0:.3f}  "
+        f"recall {hits / len(true_pairs) if true_pairs else 1.0:.3f}  "
+        f"({len(found)} clusters found, {len(truth) - sum(1 for members in truth.values() if len(members) == 1)} expected)"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,338 @@
+"""End-to-end benchmark suite: import, list, search, summary, export, validate-all.
+
+Imports a deterministic synthetic directory (see ``benchmarks.synthetic``)
+through ``/providers/import-csv`` in ``--import-chunk``-row uploads. It then
+drives each read and write scenario through the in-process FastAPI app. The
+``crud.*`` scenarios call the CRUD layer directly, which shows how much of a
+request is spent outside the database. Every scenario reports its throughput,
+latency percentiles and peak RSS. RSS is the whole process, client included,
+sampled every few milliseconds. Each run registers a fresh user, so the suite
+can be repeated against a long-lived Postgres database.
+
+Results are compared with ``--baseline-file``, keyed by database dialect and
+row count. The exit status is 1 when any scenario regresses by more than
+``--threshold``. ``--save-baseline`` records the current run instead. Run from
+``backend/``::
+
+    python -m benchmarks.e2e --rows 10000
+    python -m benchmarks.e2e --rows 1000000 --database-url postgresql+psycopg://bench@localhost/bench
+    python -m benchmarks.e2e --rows 10000 --save-baseline
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import os
+import platform
+import random
+import resource
+import sys
+import tempfile
+import threading
+import time
+import uuid
+from collections.abc import Awaitable, Callable
+from dataclasses import asdict, dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from benchmarks.synthetic import FIRST, LAST, SPECIALTIES, InvalidRates, csv_chunks
+
+if TYPE_CHECKING:
+    from sqlalchemy.orm import Session
+
+BASELINE_FILE = Path(__file__).parent / "baselines" / "e2e.json"
+PASSWORD = "BenchPassword123!"
+
+
+@dataclass
+class ScenarioResult:
+    name: str
+    operations: int
+    errors: int
+    seconds: float
+    throughput: float
+    unit: str
+    p50_ms: float
+    p95_ms: float
+    p99_ms: float
+    peak_rss_mib: float
+
+
+def _percentile(samples: list[float], pct: float) -> float:
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def _rss_bytes() -> int:
+    try:
+        with open("/proc/self/statm") as statm:
+            return int(statm.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except OSError:
+        # No procfs: fall back to the lifetime peak (KiB on Linux, bytes on macOS).
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak if sys.platform == "darwin" else peak * 1024
+
+
+class RssSampler:
+    """Track peak resident memory on a background thread."""
+
+    def __init__(self, interval: float = 0.005) -> None:
+        self._interval = interval
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+        self.peak = 0
+
+    def __enter__(self) -> RssSampler:
+        self.peak = _rss_bytes()
+        self._thread = threading.Thread(target=self._run, name="rss-sampler", daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+        self.peak = max(self.peak, _rss_bytes())
+
+    def _run(self) -> None:
+        while not self._stop.wait(self._interval):
+            self.peak = max(self.peak, _rss_bytes())
+
+
+async def _timed(
+    name: str,
+    operations: int,
+    concurrency: int,
+    call: Callable[[int], Awaitable[int]],
+    unit: str = "req/s",
+) -> ScenarioResult:
+    """Run ``call(i)`` for each operation, ``concurrency`` at a time.
+
+    ``call`` returns how many units of work it did (1 per request, or rows for
+    bulk scenarios) and raises on failure.
+    """
+    latencies: list[float] = []
+    errors = 0
+    work = 0
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one(index: int) -> None:
+        nonlocal errors, work
+        async with semaphore:
+            started = time.perf_counter()
+            try:
+                work += await call(index)
+            except Exception:
+                errors += 1
+            latencies.append((time.perf_counter() - started) * 1000)
+
+    with RssSampler() as rss:
+        started = time.perf_counter()
+        await asyncio.gather(*(one(index) for index in range(operations)))
+        seconds = time.perf_counter() - started
+    return ScenarioResult(
+        name=name,
+        operations=operations,
+        errors=errors,
+        seconds=seconds,
+        throughput=work / seconds if seconds else 0.0,
+        unit=unit,
+        p50_ms=_percentile(latencies, 50),
+        p95_ms=_percentile(latencies, 95),
+        p99_ms=_percentile(latencies, 99),
+        peak_rss_mib=rss.peak / 2**20,
+    )
+
+
+async def run_suite(args: argparse.Namespace) -> list[ScenarioResult]:
+    import httpx
+
+    from app.crud.provider import list_providers, summary
+    from app.db.session import SessionLocal
+    from app.main import app
+
+    chunks = list(range(0, args.rows, args.import_chunk))
+    rng = random.Random(args.seed)
+    terms = [*FIRST, *LAST, *SPECIALTIES]
+    results: list[ScenarioResult] = []
+
+    transport = httpx.ASGITransport(app=app)
+    async with app.router.lifespan_context(app):
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=None) as client:
+            email = f"bench-{uuid.uuid4().hex[:12]}@example.com"
+            (await client.post("/api/v1/auth/register", json={"email": email, "password": PASSWORD})).raise_for_status()
+            login = await client.post(
+                "/api/v1/auth/login",
+                data={"username": email, "password": PASSWORD},
+                headers={"Content-Type": "application/x-www-form-urlencoded"},
+            )
+            login.raise_for_status()
+            headers = {"Authorization": f"Bearer {login.json()['access_token']}"}
+            owner_id = (await client.get("/api/v1/auth/me", headers=headers)).json()["id"]
+
+            documents = csv_chunks(args.rows, args.import_chunk, args.seed, InvalidRates.parse(args.invalid))
+            lock = asyncio.Lock()
+
+            async def import_chunk(index: int) -> int:
+                # Uploads are generated lazily and in order, so memory stays
+                # flat however many rows there are.
+                async with lock:
+                    document = next(documents)
+                files = {"file": (f"synthetic-{index}.csv", document, "text/csv")}
+                response = await client.post("/api/v1/providers/import-csv", files=files, headers=headers)
+                response.raise_for_status()
+                return int(response.json()["imported"])
+
+            # Imports share the single writer, so they run one at a time.
+            results.append(await _timed("import", len(chunks), 1, import_chunk, unit="rows/s"))
+
+            pages = max(1, min(args.rows, 10_000) // 25)
+
+            def getter(path: Callable[[int], str]) -> Callable[[int], Awaitable[int]]:
+                async def call(index: int) -> int:
+                    response = await client.get(path(index), headers=headers)
+                    response.raise_for_status()
+                    return 1
+                return call
+
+            page_numbers = [rng.randrange(1, pages + 1) for _ in range(args.requests)]
+            search_terms = [rng.choice(terms) for _ in range(args.requests)]
+            reads: list[tuple[str, int, Callable[[int], str]]] = [
+                ("list.first_page", args.requests, lambda _: "/api/v1/providers"),
+                ("list.random_page", args.requests, lambda i: f"/api/v1/providers?page={page_numbers[i]}"),
+                ("list.high_risk", args.requests, lambda _: "/api/v1/providers?risk_level=High"),
+                ("search", args.requests, lambda i: f"/api/v1/providers?search={search_terms[i]}"),
+                ("summary", args.requests, lambda _: "/api/v1/providers/summary"),
+                ("export", args.exports, lambda _: "/api/v1/providers/export/csv"),
+            ]
+            for name, operations, path in reads:
+                results.append(await _timed(name, operations, args.concurrency, getter(path)))
+
+            def crud_call(work: Callable[[Session], object]) -> Callable[[int], Awaitable[int]]:
+                def in_session() -> int:
+                    with SessionLocal() as db:
+                        work(db)
+                    return 1
+
+                async def call(_: int) -> int:
+                    return await asyncio.to_thread(in_session)
+                return call
+
+            results.append(await _timed("crud.summary", args.requests, args.concurrency, crud_call(
+                lambda db: summary(db, owner_id)
+            )))
+            results.append(await _timed("crud.list_first_page", args.requests, args.concurrency, crud_call(
+                lambda db: list_providers(db, owner_id, 1, 25, None, None, None)
+            )))
+
+            async def validate_all(_: int) -> int:
+                response = await client.post("/api/v1/providers/validate-all", headers=headers)
+                response.raise_for_status()
+                return int(response.json()["processed"])
+
+            results.append(await _timed("validate_all", args.validations, 1, validate_all, unit="rows/s"))
+    return results
+
+
+def _baseline_key(database_url: str, rows: int) -> str:
+    dialect = database_url.split(":", 1)[0].split("+", 1)[0]
+    return f"{dialect}-{rows}"
+
+
+def compare(
+    current: list[ScenarioResult], baseline: dict[str, dict[str, float]], threshold: float, min_delta_ms: float
+) -> list[str]:
+    """Describe every scenario that is worse than its baseline by more than ``threshold``."""
+    regressions = []
+    for result in current:
+        base = baseline.get(result.name)
+        if base is None:
+            continue
+        if result.errors > base.get("errors", 0):
+            regressions.append(f"{result.name}: {result.errors} errors (baseline {base.get('errors', 0):.0f})")
+        if result.throughput < base["throughput"] * (1 - threshold):
+            regressions.append(
+                f"{result.name}: throughput {result.throughput:,.1f} {result.unit} "
+                f"vs {base['throughput']:,.1f} ({result.throughput / base['throughput'] - 1:+.0%})"
+            )
+        for field in ("p95_ms", "p99_ms"):
+            now, then = getattr(result, field), base[field]
+            # Sub-millisecond jitter is not a regression, whatever its ratio.
+            if now > then * (1 + threshold) and now - then > min_delta_ms:
+                regressions.append(f"{result.name}: {field} {now:.1f} vs {then:.1f} ({now / then - 1:+.0%})")
+        if result.peak_rss_mib > base["peak_rss_mib"] * (1 + threshold):
+            regressions.append(
+                f"{result.name}: peak RSS {result.peak_rss_mib:.0f} MiB vs {base['peak_rss_mib']:.0f} MiB"
+            )
+    return regressions
+
+
+def _report(results: list[ScenarioResult]) -> None:
+    print(f"{'scenario':<22} {'ops':>6} {'err':>4} {'throughput':>16} {'p50':>9} {'p95':>9} {'p99':>9} {'peak RSS':>10}")
+    for result in results:
+        print(
+            f"{result.name:<22} {result.operations:>6} {result.errors:>4} "
+            f"{result.throughput:>10,.1f} {result.unit:<5} "
+            f"{result.p50_ms:>7.1f}ms {result.p95_ms:>7.1f}ms {result.p99_ms:>7.1f}ms "
+            f"{result.peak_rss_mib:>6.0f} MiB"
+        )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=10_000)
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--invalid", action="append", default=[], metavar="FIELD=RATE",
+                        help="invalid-field rate, e.g. npi=0.2 (repeatable)")
+    parser.add_argument("--database-url", help="default: a fresh SQLite file in a temp directory")
+    parser.add_argument("--import-chunk", type=int, default=5_000, help="rows per CSV upload")
+    parser.add_argument("--requests", type=int, default=200, help="requests per read scenario")
+    parser.add_argument("--exports", type=int, default=5)
+    parser.add_argument("--validations", type=int, default=1)
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--baseline-file", type=Path, default=BASELINE_FILE)
+    parser.add_argument("--save-baseline", action="store_true")
+    parser.add_argument("--threshold", type=float, default=0.25, help="allowed fractional regression")
+    parser.add_argument("--min-delta-ms", type=float, default=2.0)
+    args = parser.parse_args()
+
+    database_url = args.database_url or f"sqlite:///{os.path.join(tempfile.mkdtemp(prefix='e2e-bench-'), 'bench.db')}"
+    # Settings are read when the app is first imported, which run_suite defers.
+    os.environ["APP_DATABASE_URL"] = database_url
+    os.environ.setdefault("APP_DEFER_BOOTSTRAP", "false")
+
+    results = asyncio.run(run_suite(args))
+    _report(results)
+
+    key = _baseline_key(database_url, args.rows)
+    baselines = json.loads(args.baseline_file.read_text()) if args.baseline_file.exists() else {}
+    if args.save_baseline:
+        baselines[key] = {
+            "recorded_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "machine": f"{platform.machine()} {os.cpu_count()} CPUs, Python {platform.python_version()}",
+            "scenarios": {result.name: {k: v for k, v in asdict(result).items() if k != "name"} for result in results},
+        }
+        args.baseline_file.parent.mkdir(parents=True, exist_ok=True)
+        args.baseline_file.write_text(json.dumps(baselines, indent=2, sort_keys=True) + "\n")
+        print(f"saved baseline {key!r} to {args.baseline_file}")
+        return
+    if key not in baselines:
+        print(f"no baseline {key!r} in {args.baseline_file}; run with --save-baseline to record one")
+        return
+    regressions = compare(results, baselines[key]["scenarios"], args.threshold, args.min_delta_ms)
+    print(f"compared with baseline {key!r} ({baselines[key]['machine']}, {baselines[key]['recorded_at']})")
+    for line in regressions:
+        print(f"REGRESSION {line}")
+    if regressions:
+        raise SystemExit(1)
+    print(f"no regressions beyond {args.threshold:.0%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,337 @@
+"""Load test that replays dashboard sessions against a running API.
+
+Sessions arrive as a Poisson process at ``--arrival-rate`` per second for
+``--duration`` seconds. Arrivals are open-loop, so a slow server builds a
+queue instead of quietly slowing the offered load. Each session behaves like
+``DashboardPage``:
+- It logs in as one of ``--users`` seeded accounts.
+- It loads the summary and the first page together.
+- It performs ``--actions`` actions drawn from ``--mix``, with exponential
+  think time between them:
+
+    page          next page of the grid
+    filter        change the risk filter (back to page 1)
+    search        type a term; the page refetches on every keystroke
+    poll          refetch summary and the current page (react-query refresh)
+    import        upload a synthetic CSV, then refetch summary and page
+    validate_all  revalidate everything, then refetch summary and page
+
+All calls go through ``provider_ops_client``. The report gives the
+throughput, p50/p95/p99 latency and error rate of each endpoint. Point
+``--base-url`` at a running server, or use ``--spawn`` to start a local
+uvicorn (or gunicorn, with ``--server gunicorn``) against ``--database-url``
+(default: a fresh SQLite file). Run from ``backend/``::
+
+    python -m benchmarks.load_test --spawn --arrival-rate 2 --duration 60
+    python -m benchmarks.load_test --spawn --workers 4 --database-url postgresql+psycopg://bench@localhost/bench
+    python -m benchmarks.load_test --spawn --server gunicorn --workers 4
+    python -m benchmarks.load_test --base-url http://staging:8000/api/v1 --mix poll=6,search=2,import=0
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import io
+import json
+import os
+import random
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.request
+import uuid
+from collections.abc import Awaitable
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Any, TypeVar
+
+import httpx
+
+from benchmarks.synthetic import FIRST, LAST, SPECIALTIES, csv_chunks
+from provider_ops_client.client import ApiError, ProviderOpsClient
+
+T = TypeVar("T")
+
+PAGE_SIZE = 20  # DashboardPage's PAGE_SIZE
+RISK_LEVELS = ["High", "Medium", "Low"]
+DEFAULT_MIX = "page=4,filter=2,search=2,poll=4,import=0.3,validate_all=0.15"
+PASSWORD = "LoadTestPass123!"
+
+
+@dataclass
+class EndpointStats:
+    latencies: list[float] = field(default_factory=list)
+    errors: dict[str, int] = field(default_factory=dict)
+
+    @property
+    def requests(self) -> int:
+        return len(self.latencies) + sum(self.errors.values())
+
+
+class Recorder:
+    def __init__(self) -> None:
+        self.endpoints: dict[str, EndpointStats] = {}
+        self.sessions_started = 0
+        self.sessions_completed = 0
+
+    async def timed(self, endpoint: str, call: Awaitable[T]) -> T | None:
+        stats = self.endpoints.setdefault(endpoint, EndpointStats())
+        started = time.perf_counter()
+        try:
+            result = await call
+        except ApiError as exc:
+            stats.errors[str(exc.status_code)] = stats.errors.get(str(exc.status_code), 0) + 1
+            return None
+        except httpx.HTTPError as exc:
+            stats.errors[type(exc).__name__] = stats.errors.get(type(exc).__name__, 0) + 1
+            return None
+        stats.latencies.append((time.perf_counter() - started) * 1000)
+        return result
+
+
+def parse_mix(spec: str) -> dict[str, float]:
+    known = {"page", "filter", "search", "poll", "import", "validate_all"}
+    mix: dict[str, float] = {}
+    for item in filter(None, spec.split(",")):
+        name, _, weight = item.partition("=")
+        if name not in known or not weight:
+            raise SystemExit(f"--mix expects name=weight with names from {sorted(known)}, got {item!r}")
+        mix[name] = float(weight)
+    return mix
+
+
+@dataclass
+class SessionConfig:
+    base_url: str
+    users: list[str]
+    mix: dict[str, float]
+    actions: int
+    think_seconds: float
+    import_rows: int
+
+
+class DashboardSession:
+    def __init__(self, config: SessionConfig, recorder: Recorder, seed: int) -> None:
+        self.config = config
+        self.recorder = recorder
+        self.rng = random.Random(seed)
+        self.seed = seed
+        self.page = 1
+        self.total = 0
+        self.search = ""
+        self.risk_level: str | None = None
+
+    async def _list(self, endpoint: str, client: ProviderOpsClient) -> None:
+        payload = await self.recorder.timed(
+            endpoint,
+            client.list_providers(
+                page=self.page, page_size=PAGE_SIZE, search=self.search or None, risk_level=self.risk_level
+            ),
+        )
+        if payload is not None:
+            self.total = payload["total"]
+
+    async def _refresh(self, client: ProviderOpsClient) -> None:
+        # Both queries are invalidated together, so they refetch concurrently.
+        await asyncio.gather(self.recorder.timed("summary", client.summary()), self._list("list", client))
+
+    async def run(self) -> None:
+        self.recorder.sessions_started += 1
+        email = self.rng.choice(self.config.users)
+        async with ProviderOpsClient(self.config.base_url, email, PASSWORD, login_retries=0) as client:
+            if await self.recorder.timed("login", client.login()) is None:
+                return
+            await self._refresh(client)
+            names = list(self.config.mix)
+            weights = list(self.config.mix.values())
+            for _ in range(self.config.actions):
+                await asyncio.sleep(self.rng.expovariate(1 / self.config.think_seconds))
+                action = self.rng.choices(names, weights)[0]
+                await getattr(self, f"_{action}")(client)
+        self.recorder.sessions_completed += 1
+
+    async def _page(self, client: ProviderOpsClient) -> None:
+        pages = max(1, -(-self.total // PAGE_SIZE))
+        self.page = self.page % pages + 1
+        await self._list("list", client)
+
+    async def _filter(self, client: ProviderOpsClient) -> None:
+        self.risk_level = self.rng.choice([None, *RISK_LEVELS])
+        self.page = 1
+        await self._list("list.filter", client)
+
+    async def _search(self, client: ProviderOpsClient) -> None:
+        term = self.rng.choice([*FIRST, *LAST, *SPECIALTIES])
+        self.page = 1
+        for length in range(1, len(term) + 1):
+            self.search = term[:length]
+            await self._list("list.search", client)
+            await asyncio.sleep(self.rng.uniform(0.08, 0.25))
+
+    async def _poll(self, client: ProviderOpsClient) -> None:
+        await self._refresh(client)
+
+    async def _import(self, client: ProviderOpsClient) -> None:
+        self.seed += 1
+        document = next(csv_chunks(self.config.import_rows, self.config.import_rows, seed=self.seed))
+        upload = io.BytesIO(document)
+        if await self.recorder.timed("import", client.import_csv(upload, "load-test.csv")) is not None:
+            await self._refresh(client)
+
+    async def _validate_all(self, client: ProviderOpsClient) -> None:
+        if await self.recorder.timed("validate_all", client.validate_all()) is not None:
+            await self._refresh(client)
+
+
+async def seed_users(base_url: str, users: int, rows: int) -> list[str]:
+    """Register ``users`` fresh accounts and import ``rows`` providers into each."""
+    emails = [f"load-{uuid.uuid4().hex[:10]}@example.com" for _ in range(users)]
+    for index, email in enumerate(emails):
+        async with ProviderOpsClient(base_url, email, PASSWORD, timeout=600) as client:
+            await client.register(email, PASSWORD)
+            await client.login()
+            for document in csv_chunks(rows, 5_000, seed=index):
+                await client.import_csv(io.BytesIO(document), "seed.csv")
+    return emails
+
+
+async def run_load(
+    config: SessionConfig, arrival_rate: float, duration: float, drain: float, seed: int
+) -> tuple[Recorder, float]:
+    recorder = Recorder()
+    rng = random.Random(seed)
+    sessions: list[asyncio.Task[None]] = []
+    started = time.perf_counter()
+    next_arrival = 0.0
+    while True:
+        next_arrival += rng.expovariate(arrival_rate)
+        if next_arrival >= duration:
+            break
+        await asyncio.sleep(max(0.0, next_arrival - (time.perf_counter() - started)))
+        session = DashboardSession(config, recorder, rng.randrange(2**31))
+        sessions.append(asyncio.create_task(session.run()))
+    _, pending = await asyncio.wait(sessions, timeout=drain) if sessions else (set(), set())
+    for task in pending:
+        task.cancel()
+    return recorder, time.perf_counter() - started
+
+
+def _percentile(samples: list[float], pct: float) -> float:
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def report(recorder: Recorder, elapsed: float) -> dict[str, Any]:
+    rows = {}
+    print(f"{recorder.sessions_completed}/{recorder.sessions_started} sessions completed in {elapsed:.1f}s")
+    print(f"{'endpoint':<14} {'requests':>8} {'req/s':>7} {'errors':>7} {'p50':>9} {'p95':>9} {'p99':>9}  error codes")
+    for name, stats in sorted(recorder.endpoints.items()):
+        error_count = sum(stats.errors.values())
+        rows[name] = {
+            "requests": stats.requests,
+            "throughput": stats.requests / elapsed,
+            "error_rate": error_count / stats.requests if stats.requests else 0.0,
+            "errors": stats.errors,
+            "p50_ms": _percentile(stats.latencies, 50),
+            "p95_ms": _percentile(stats.latencies, 95),
+            "p99_ms": _percentile(stats.latencies, 99),
+        }
+        row = rows[name]
+        print(
+            f"{name:<14} {stats.requests:>8} {row['throughput']:>7.2f} {row['error_rate']:>7.1%} "
+            f"{row['p50_ms']:>7.1f}ms {row['p95_ms']:>7.1f}ms {row['p99_ms']:>7.1f}ms  "
+            f"{', '.join(f'{code}x{count}' for code, count in sorted(stats.errors.items())) or '-'}"
+        )
+    return rows
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+@contextmanager
+def spawn_server(database_url: str, workers: int, server: str = "uvicorn") -> Any:
+    port = _free_port()
+    env = dict(os.environ, APP_DATABASE_URL=database_url)
+    if server == "gunicorn":
+        command = ["-m", "gunicorn", "app.main:app", "--bind", f"127.0.0.1:{port}", "--workers", str(workers),
+                   "--log-level", "warning", "--access-logfile", os.devnull]
+    else:
+        command = ["-m", "uvicorn", "app.main:app", "--port", str(port), "--workers", str(workers),
+                   "--log-level", "warning"]
+    process = subprocess.Popen([sys.executable, *command], env=env)
+    base_url = f"http://127.0.0.1:{port}/api/v1"
+    try:
+        deadline = time.monotonic() + 60
+        while True:
+            try:
+                with urllib.request.urlopen(f"{base_url}/health", timeout=1):
+                    break
+            except OSError:
+                if time.monotonic() > deadline or process.poll() is not None:
+                    raise SystemExit(f"{server} did not become healthy")
+                time.sleep(0.1)
+        yield base_url
+    finally:
+        process.terminate()
+        process.wait()
+
+
+async def main_async(args: argparse.Namespace, base_url: str) -> dict[str, Any]:
+    users = await seed_users(base_url, args.users, args.seed_rows)
+    print(f"seeded {len(users)} users with {args.seed_rows} providers each")
+    config = SessionConfig(
+        base_url=base_url,
+        users=users,
+        mix=parse_mix(args.mix),
+        actions=args.actions,
+        think_seconds=args.think_seconds,
+        import_rows=args.import_rows,
+    )
+    recorder, elapsed = await run_load(config, args.arrival_rate, args.duration, args.drain_seconds, args.seed)
+    return report(recorder, elapsed)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--base-url", default="http://localhost:8000/api/v1")
+    parser.add_argument("--spawn", action="store_true", help="start a local uvicorn for the run")
+    parser.add_argument("--database-url", help="with --spawn; default: a fresh SQLite file")
+    parser.add_argument("--workers", type=int, default=1, help="server workers with --spawn")
+    parser.add_argument(
+        "--server", choices=["uvicorn", "gunicorn"], default="uvicorn",
+        help="with --spawn; gunicorn uses gunicorn.conf.py (preloaded, copy-on-write workers)",
+    )
+    parser.add_argument("--arrival-rate", type=float, default=1.0, help="new sessions per second")
+    parser.add_argument("--duration", type=float, default=60.0, help="seconds during which sessions arrive")
+    parser.add_argument("--drain-seconds", type=float, default=120.0, help="wait for open sessions after that")
+    parser.add_argument("--actions", type=int, default=8, help="actions per session after the first load")
+    parser.add_argument("--think-seconds", type=float, default=2.0, help="mean pause between actions")
+    parser.add_argument("--mix", default=DEFAULT_MIX, help=f"action weights (default {DEFAULT_MIX})")
+    parser.add_argument("--users", type=int, default=5)
+    parser.add_argument("--seed-rows", type=int, default=2_000, help="providers imported per user up front")
+    parser.add_argument("--import-rows", type=int, default=200, help="rows per import action")
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--json", help="also write the per-endpoint results to this file")
+    args = parser.parse_args()
+
+    if args.spawn:
+        database_url = args.database_url or f"sqlite:///{os.path.join(tempfile.mkdtemp(prefix='load-test-'), 'load.db')}"
+        with spawn_server(database_url, args.workers, args.server) as base_url:
+            results = asyncio.run(main_async(args, base_url))
+    else:
+        results = asyncio.run(main_async(args, args.base_url))
+    if args.json:
+        with open(args.json, "w") as handle:
+            json.dump(results, handle, indent=2)
+
+
+if __name__ == "__main__":
+    main()
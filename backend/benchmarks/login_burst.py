@@ -0,0 +1,119 @@
+"""Login-burst load test.
+
+Fires a burst of concurrent logins against the in-process app while a steady
+reader polls ``/providers`` and ``/providers/summary``, and reports reader
+latency before and during the burst. Run from ``backend/``::
+
+    python -m benchmarks.login_burst --logins 200 --readers 4
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import os
+import statistics
+import tempfile
+import time
+
+os.environ.setdefault(
+    "APP_DATABASE_URL", f"sqlite:///{os.path.join(tempfile.gettempdir(), 'bench_login_burst.db')}"
+)
+
+import httpx  # noqa: E402
+
+from app.bootstrap import bootstrap_done  # noqa: E402
+from app.core.config import settings  # noqa: E402
+from app.core.hashing import password_hasher  # noqa: E402
+from app.main import app  # noqa: E402
+
+FORM = {"Content-Type": "application/x-www-form-urlencoded"}
+
+
+def _percentile(samples: list[float], pct: float) -> float:
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+async def _login(client: httpx.AsyncClient) -> httpx.Response:
+    return await client.post(
+        "/api/v1/auth/login",
+        data={"username": settings.bootstrap_admin_email, "password": settings.bootstrap_admin_password},
+        headers=FORM,
+    )
+
+
+async def _reader(client: httpx.AsyncClient, headers: dict[str, str], stop: asyncio.Event) -> list[float]:
+    latencies: list[float] = []
+    paths = ["/api/v1/providers", "/api/v1/providers/summary"]
+    while not stop.is_set():
+        for path in paths:
+            started = time.perf_counter()
+            response = await client.get(path, headers=headers)
+            response.raise_for_status()
+            latencies.append((time.perf_counter() - started) * 1000)
+        await asyncio.sleep(0.01)
+    return latencies
+
+
+async def _measure_readers(
+    client: httpx.AsyncClient, headers: dict[str, str], readers: int, seconds: float
+) -> list[float]:
+    stop = asyncio.Event()
+    tasks = [asyncio.create_task(_reader(client, headers, stop)) for _ in range(readers)]
+    await asyncio.sleep(seconds)
+    stop.set()
+    return [sample for result in await asyncio.gather(*tasks) for sample in result]
+
+
+def _report(label: str, samples: list[float]) -> None:
+    print(
+        f"{label:<18} n={len(samples):<6} p50={_percentile(samples, 50):7.1f}ms "
+        f"p95={_percentile(samples, 95):7.1f}ms p99={_percentile(samples, 99):7.1f}ms "
+        f"max={max(samples, default=0.0):7.1f}ms"
+    )
+
+
+async def main(logins: int, readers: int, baseline_seconds: float) -> None:
+    transport = httpx.ASGITransport(app=app)
+    async with app.router.lifespan_context(app):
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+            # With APP_DEFER_BOOTSTRAP the admin is created on a background thread.
+            if not await asyncio.to_thread(bootstrap_done.wait, 60):
+                raise SystemExit("Admin bootstrap did not finish within 60s.")
+            login = await _login(client)
+            login.raise_for_status()
+            token = login.json()["access_token"]
+            headers = {"Authorization": f"Bearer {token}"}
+
+            baseline = await _measure_readers(client, headers, readers, baseline_seconds)
+
+            stop = asyncio.Event()
+            reader_tasks = [asyncio.create_task(_reader(client, headers, stop)) for _ in range(readers)]
+            started = time.perf_counter()
+            responses = await asyncio.gather(*(_login(client) for _ in range(logins)))
+            burst_seconds = time.perf_counter() - started
+            stop.set()
+            during = [sample for result in await asyncio.gather(*reader_tasks) for sample in result]
+
+    codes: dict[int, int] = {}
+    for response in responses:
+        codes[response.status_code] = codes.get(response.status_code, 0) + 1
+
+    print(f"login burst: {logins} logins in {burst_seconds:.2f}s, status codes {codes}")
+    _report("readers baseline", baseline)
+    _report("readers in burst", during)
+    if baseline and during:
+        print(f"median slowdown: {statistics.median(during) / statistics.median(baseline):.2f}x")
+    print(f"hashing executor: {password_hasher.stats()}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--logins", type=int, default=100)
+    parser.add_argument("--readers", type=int, default=4)
+    parser.add_argument("--baseline-seconds", type=float, default=2.0)
+    args = parser.parse_args()
+    asyncio.run(main(args.logins, args.readers, args.baseline_seconds))
@@ -0,0 +1,155 @@
+"""Cost of the ``/metrics`` middleware and SQL statement events.
+
+Runs the same in-process workload in fresh interpreters with
+``APP_METRICS_ENABLED`` on and off, alternating ``--rounds`` times. The
+workload is ``/health`` (no SQL), ``/providers/summary`` (a few statements)
+and the first ``/providers`` page over a small imported directory. It reports
+the median per-request latency of each, the added cost per request, and how
+long a scrape of ``/metrics`` takes. End-to-end differences of a few percent
+are within run-to-run noise, so the collection cost is also measured directly:
+the middleware around a no-op ASGI app, and the statement events around
+``SELECT 1`` on an in-memory SQLite engine. Run from ``backend/``::
+
+    python -m benchmarks.metrics_overhead --requests 2000 --rounds 3
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+PATHS = ["/api/v1/health", "/api/v1/providers/summary", "/api/v1/providers"]
+
+
+async def _child(requests: int, rows: int) -> dict[str, float]:
+    import httpx
+
+    from app.core.config import settings
+    from app.main import app
+    from benchmarks.synthetic import csv_chunks
+
+    results: dict[str, float] = {}
+    transport = httpx.ASGITransport(app=app)
+    async with app.router.lifespan_context(app):
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+            login = await client.post(
+                "/api/v1/auth/login",
+                data={"username": settings.bootstrap_admin_email, "password": settings.bootstrap_admin_password},
+                headers={"Content-Type": "application/x-www-form-urlencoded"},
+            )
+            login.raise_for_status()
+            headers = {"Authorization": f"Bearer {login.json()['access_token']}"}
+            for document in csv_chunks(rows, rows):
+                files = {"file": ("synthetic.csv", document, "text/csv")}
+                (await client.post("/api/v1/providers/import-csv", files=files, headers=headers)).raise_for_status()
+
+            for path in PATHS:
+                for _ in range(min(100, requests)):
+                    await client.get(path, headers=headers)
+                samples = []
+                for _ in range(requests):
+                    started = time.perf_counter()
+                    response = await client.get(path, headers=headers)
+                    samples.append(time.perf_counter() - started)
+                    response.raise_for_status()
+                results[path] = statistics.median(samples) * 1e6
+
+            if settings.metrics_enabled:
+                started = time.perf_counter()
+                scrape = await client.get("/metrics")
+                results["scrape_us"] = (time.perf_counter() - started) * 1e6
+                results["scrape_bytes"] = len(scrape.content)
+    return results
+
+
+def _direct_costs(iterations: int) -> tuple[float, float]:
+    """Added microseconds per request (middleware) and per statement (engine events)."""
+    from sqlalchemy import create_engine, text
+
+    from app.core.metrics import MetricsMiddleware, instrument_engine
+
+    async def noop(_scope: object, _receive: object, send: object) -> None:
+        await send({"type": "http.response.start", "status": 200, "headers": []})  # type: ignore[operator]
+        await send({"type": "http.response.body", "body": b"ok"})  # type: ignore[operator]
+
+    async def sink(_message: object) -> None:
+        return None
+
+    async def requests(app: object) -> float:
+        scope = {"type": "http", "method": "GET", "path": "/bench"}
+        started = time.perf_counter()
+        for _ in range(iterations):
+            await app(scope, None, sink)  # type: ignore[operator]
+        return (time.perf_counter() - started) / iterations * 1e6
+
+    per_request = asyncio.run(requests(MetricsMiddleware(noop))) - asyncio.run(requests(noop))
+
+    def statements(instrumented: bool) -> float:
+        engine = create_engine("sqlite://")
+        if instrumented:
+            instrument_engine(engine, "bench")
+        with engine.connect() as connection:
+            query = text("SELECT 1")
+            started = time.perf_counter()
+            for _ in range(iterations):
+                connection.execute(query)
+            return (time.perf_counter() - started) / iterations * 1e6
+
+    per_statement = statements(True) - statements(False)
+    return per_request, per_statement
+
+
+def _run(enabled: bool, requests: int, rows: int, workdir: str, round_: int) -> dict[str, float]:
+    env = dict(
+        os.environ,
+        APP_METRICS_ENABLED=str(enabled).lower(),
+        APP_DEFER_BOOTSTRAP="false",
+        APP_DATABASE_URL=f"sqlite:///{os.path.join(workdir, f'{enabled}-{round_}.db')}",
+    )
+    output = subprocess.run(
+        [sys.executable, "-m", "benchmarks.metrics_overhead", "--child", "--requests", str(requests),
+         "--rows", str(rows)],
+        env=env, check=True, capture_output=True, text=True,
+    )
+    return json.loads(output.stdout.strip().splitlines()[-1])
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=2_000)
+    parser.add_argument("--rows", type=int, default=500)
+    parser.add_argument("--rounds", type=int, default=3)
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        print(json.dumps(asyncio.run(_child(args.requests, args.rows))))
+        return
+
+    workdir = tempfile.mkdtemp(prefix="metrics-bench-")
+    runs: dict[bool, list[dict[str, float]]] = {True: [], False: []}
+    for round_ in range(args.rounds):
+        for enabled in (False, True):
+            runs[enabled].append(_run(enabled, args.requests, args.rows, workdir, round_))
+
+    print(f"median latency per request over {args.rounds} rounds of {args.requests} requests")
+    print(f"{'path':<28} {'off':>10} {'on':>10} {'added':>10}")
+    for path in PATHS:
+        off = statistics.median(run[path] for run in runs[False])
+        on = statistics.median(run[path] for run in runs[True])
+        print(f"{path:<28} {off:>8.0f}us {on:>8.0f}us {on - off:>+8.0f}us ({on / off - 1:+.1%})")
+    scrape = statistics.median(run["scrape_us"] for run in runs[True])
+    size = statistics.median(run["scrape_bytes"] for run in runs[True])
+    print(f"/metrics scrape: {scrape / 1000:.1f} ms, {size / 1024:.0f} KiB")
+    per_request, per_statement = _direct_costs(50_000)
+    print(f"direct cost: {per_request:.1f}us per request, {per_statement:.1f}us per SQL statement")
+
+
+if __name__ == "__main__":
+    main()
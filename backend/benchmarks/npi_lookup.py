@@ -0,0 +1,112 @@
+"""Offline NPI index: build time, file size and lookup latency.
+
+Builds an index of ``--npis`` synthetic NPIs with valid check digits, then
+times Luhn checks and index lookups (hits and misses) in this process and in
+``--workers`` child processes mapping the same file. On Linux each worker also
+reports how much of its resident memory is file-backed (shared page cache)
+versus private. Run from ``backend/``::
+
+    python -m benchmarks.npi_lookup --npis 1000000 --workers 4
+"""
+from __future__ import annotations
+
+import argparse
+import multiprocessing
+import os
+import random
+import tempfile
+import time
+
+from app.services.npi_index import NpiIndex, write_index
+from app.services.validation import npi_checksum_valid
+
+TAXONOMY_CODES = ["207RC0000X", "208000000X", "207X00000X", "2084N0400X", "207V00000X"]
+
+
+def _with_check_digit(base: int) -> int:
+    for digit in range(10):
+        npi = base * 10 + digit
+        if npi_checksum_valid(str(npi)):
+            return npi
+    raise AssertionError("unreachable")
+
+
+def _rss_kib() -> dict[str, int]:
+    try:
+        with open("/proc/self/status") as handle:
+            return {
+                key: int(value.split()[0])
+                for key, value in (line.split(":", 1) for line in handle)
+                if key in ("RssAnon", "RssFile")
+            }
+    except OSError:
+        return {}
+
+
+def _time_lookups(index: NpiIndex, npis: list[str]) -> float:
+    started = time.perf_counter()
+    for npi in npis:
+        index.lookup(npi)
+    return (time.perf_counter() - started) / len(npis) * 1e6
+
+
+def _worker(path: str, hits: list[str], misses: list[str], results: multiprocessing.Queue) -> None:
+    index = NpiIndex(path)
+    hit_us = _time_lookups(index, hits)
+    miss_us = _time_lookups(index, misses)
+    results.put((os.getpid(), hit_us, miss_us, _rss_kib()))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--npis", type=int, default=1_000_000)
+    parser.add_argument("--lookups", type=int, default=200_000)
+    parser.add_argument("--workers", type=int, default=2)
+    args = parser.parse_args()
+
+    rng = random.Random(7)
+    bases = rng.sample(range(100_000_000, 300_000_000), args.npis)
+    entries = [(_with_check_digit(base), rng.choice(TAXONOMY_CODES)) for base in bases]
+    path = os.path.join(tempfile.mkdtemp(prefix="npi-bench-"), "npi.idx")
+
+    started = time.perf_counter()
+    count = write_index(path, entries)
+    build_seconds = time.perf_counter() - started
+    print(f"build: {count} NPIs in {build_seconds:.2f}s, {os.path.getsize(path) / 1e6:.1f} MB on disk")
+
+    hits = [str(npi) for npi, _ in rng.sample(entries, min(args.lookups, len(entries)))]
+    known = {npi for npi, _ in entries}
+    misses: list[str] = []
+    while len(misses) < len(hits):
+        candidate = _with_check_digit(rng.randrange(100_000_000, 300_000_000))
+        if candidate not in known:
+            misses.append(str(candidate))
+    del entries, known
+
+    started = time.perf_counter()
+    for npi in hits:
+        npi_checksum_valid(npi)
+    print(f"luhn check: {(time.perf_counter() - started) / len(hits) * 1e6:.2f} µs/op")
+
+    started = time.perf_counter()
+    index = NpiIndex(path)
+    print(f"open: {(time.perf_counter() - started) * 1000:.2f} ms")
+    print(f"lookup hit: {_time_lookups(index, hits):.2f} µs/op, miss: {_time_lookups(index, misses):.2f} µs/op")
+
+    results: multiprocessing.Queue = multiprocessing.Queue()
+    workers = [
+        multiprocessing.Process(target=_worker, args=(path, hits, misses, results))
+        for _ in range(args.workers)
+    ]
+    for worker in workers:
+        worker.start()
+    for _ in workers:
+        pid, hit_us, miss_us, rss = results.get()
+        memory = f", RssFile {rss['RssFile'] / 1024:.1f} MiB / RssAnon {rss['RssAnon'] / 1024:.1f} MiB" if rss else ""
+        print(f"worker {pid}: hit {hit_us:.2f} µs/op, miss {miss_us:.2f} µs/op{memory}")
+    for worker in workers:
+        worker.join()
+
+
+if __name__ == "__main__":
+    main()
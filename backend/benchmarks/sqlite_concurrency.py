@@ -0,0 +1,158 @@
+"""Concurrent reads during a large import, default vs tuned SQLite profile.
+
+The main process imports ``--rows`` providers in chunks through the writer
+engine while ``--readers`` separate processes run the list and summary queries
+through the read engine, as API workers would. Readers are processes rather
+than threads so that contention for the GIL does not hide contention for the
+database. Run from ``backend/``::
+
+    python -m benchmarks.sqlite_concurrency --rows 50000 --readers 4
+"""
+from __future__ import annotations
+
+import argparse
+import multiprocessing
+import os
+import tempfile
+import time
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session, sessionmaker
+
+from app.core.config import settings
+from app.crud.provider import (
+    create_provider_batch,
+    get_provider,
+    list_providers,
+    revalidate_provider,
+    summary,
+)
+from app.db.base import Base
+from app.db.session import create_engines
+from app.models.provider import ProviderRecord
+from app.models.user import User
+
+
+def _rows(start: int, count: int) -> list[dict[str, str]]:
+    return [
+        {
+            "provider_name": f"Dr. Bench {index}",
+            "specialty": "Cardiology",
+            "npi": f"{1000000000 + index}",
+            "phone": "5551234567",
+            "address": f"{index} Main Street",
+        }
+        for index in range(start, start + count)
+    ]
+
+
+def _percentile(samples: list[float], pct: float) -> float:
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))]
+
+
+def _read_loop(path: str, tuned: bool, owner_id: str, stop, results) -> None:
+    settings.sqlite_tuned = tuned
+    _, reader = create_engines(f"sqlite:///{path}")
+    ReadSession = sessionmaker(bind=reader, class_=Session)
+    latencies: list[float] = []
+    errors = 0
+    while not stop.is_set():
+        started = time.perf_counter()
+        try:
+            with ReadSession() as db:
+                list_providers(db, owner_id, 1, 25, None, None, None)
+                summary(db, owner_id)
+        except Exception:  # noqa: BLE001
+            errors += 1
+            continue
+        latencies.append((time.perf_counter() - started) * 1000)
+    reader.dispose()
+    results.put((latencies, errors))
+
+
+def run(
+    tuned: bool, rows: int, readers: int, chunk: int, revalidations: int, directory: str | None
+) -> None:
+    settings.sqlite_tuned = tuned
+    path = os.path.join(tempfile.mkdtemp(prefix="sqlite-bench-", dir=directory), "bench.db")
+    writer, reader = create_engines(f"sqlite:///{path}")
+    Base.metadata.create_all(bind=writer)
+    WriteSession = sessionmaker(bind=writer, class_=Session)
+
+    with WriteSession() as db:
+        owner = User(email="bench@example.com", hashed_password="x")
+        db.add(owner)
+        db.commit()
+        owner_id = owner.id
+
+    context = multiprocessing.get_context("spawn")
+    stop = context.Event()
+    results = context.Queue()
+    processes = [
+        context.Process(target=_read_loop, args=(path, tuned, owner_id, stop, results))
+        for _ in range(readers)
+    ]
+    for process in processes:
+        process.start()
+    time.sleep(2.0)  # let the readers import the app and start polling
+
+    chunk_latencies: list[float] = []
+    started = time.perf_counter()
+    for offset in range(0, rows, chunk):
+        chunk_started = time.perf_counter()
+        with WriteSession() as db:
+            create_provider_batch(db, owner_id, _rows(offset, min(chunk, rows - offset)), "bench.csv")
+        chunk_latencies.append((time.perf_counter() - chunk_started) * 1000)
+    import_seconds = time.perf_counter() - started
+
+    # Revalidating one provider is a one-row transaction: this is where the
+    # journal mode and synchronous level show up, as per-commit fsync cost.
+    with WriteSession() as db:
+        provider_ids = list(db.scalars(select(ProviderRecord.id).limit(revalidations)))
+    commit_latencies: list[float] = []
+    for provider_id in provider_ids:
+        commit_started = time.perf_counter()
+        with WriteSession() as db:
+            provider = get_provider(db, provider_id, owner_id)
+            if provider is not None:
+                revalidate_provider(db, provider)
+        commit_latencies.append((time.perf_counter() - commit_started) * 1000)
+    stop.set()
+    latencies: list[float] = []
+    errors = 0
+    for _ in processes:
+        samples, failed = results.get()
+        latencies.extend(samples)
+        errors += failed
+    for process in processes:
+        process.join()
+    writer.dispose()
+    reader.dispose()
+
+    label = "tuned" if tuned else "default"
+    print(
+        f"{label:<8} import {rows} rows in {import_seconds:6.2f}s ({rows / import_seconds:6.0f} rows/s, "
+        f"chunk p99={_percentile(chunk_latencies, 99):7.1f}ms) | "
+        f"revalidate p50={_percentile(commit_latencies, 50):6.1f}ms "
+        f"p99={_percentile(commit_latencies, 99):6.1f}ms | "
+        f"reads={len(latencies):<6} p50={_percentile(latencies, 50):7.1f}ms "
+        f"p99={_percentile(latencies, 99):7.1f}ms errors={errors}"
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=20000)
+    parser.add_argument("--readers", type=int, default=4)
+    parser.add_argument("--chunk", type=int, default=1000)
+    parser.add_argument("--revalidations", type=int, default=500)
+    parser.add_argument(
+        "--dir", default=None, help="Directory for the database files; use real disk, not tmpfs."
+    )
+    args = parser.parse_args()
+    print(f"{os.cpu_count()} CPU(s), {args.readers} reader processes")
+    for tuned in (False, True):
+        run(tuned, args.rows, args.readers, args.chunk, args.revalidations, args.dir)
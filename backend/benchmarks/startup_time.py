@@ -0,0 +1,86 @@
+"""Cold-start benchmark: import time and time to the first ``/health`` response.
+
+Each sample runs in a fresh interpreter. ``cold`` starts against an empty
+database, ``warm`` against one that already holds the current schema and
+admin user. Run from ``backend/``::
+
+    python -m benchmarks.startup_time --runs 5
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.request
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _import_seconds(env: dict[str, str]) -> float:
+    code = "import time; s = time.perf_counter(); import app.main; print(time.perf_counter() - s)"
+    output = subprocess.run(
+        [sys.executable, "-c", code], env=env, check=True, capture_output=True, text=True
+    )
+    return float(output.stdout.strip().splitlines()[-1])
+
+
+def _first_health_seconds(env: dict[str, str], timeout: float = 30.0) -> float:
+    port = _free_port()
+    started = time.perf_counter()
+    process = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--port", str(port), "--log-level", "warning"],
+        env=env,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    try:
+        while time.perf_counter() - started < timeout:
+            try:
+                with urllib.request.urlopen(f"http://127.0.0.1:{port}/api/v1/health", timeout=1) as response:
+                    if response.status == 200:
+                        return time.perf_counter() - started
+            except OSError:
+                time.sleep(0.01)
+        raise TimeoutError("server did not become healthy")
+    finally:
+        process.terminate()
+        process.wait()
+
+
+def main(runs: int) -> None:
+    workdir = tempfile.mkdtemp(prefix="startup-bench-")
+    env = dict(os.environ, PYTHONDONTWRITEBYTECODE="0")
+
+    imports = [_import_seconds(env) for _ in range(runs)]
+    print(
+        f"import app.main      median={statistics.median(imports) * 1000:7.1f}ms  "
+        f"min={min(imports) * 1000:7.1f}ms"
+    )
+
+    _first_health_seconds(dict(env, APP_DATABASE_URL=f"sqlite:///{os.path.join(workdir, 'warm.db')}"))
+    for label in ("cold", "warm"):
+        samples = []
+        for run in range(runs):
+            db_name = f"{label}-{run}.db" if label == "cold" else "warm.db"
+            run_env = dict(env, APP_DATABASE_URL=f"sqlite:///{os.path.join(workdir, db_name)}")
+            samples.append(_first_health_seconds(run_env))
+        print(
+            f"first /health {label:<5} median={statistics.median(samples) * 1000:7.1f}ms  "
+            f"min={min(samples) * 1000:7.1f}ms"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+    main(args.runs)
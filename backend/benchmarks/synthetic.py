@@ -0,0 +1,147 @@
+"""Deterministic synthetic provider directories for benchmarks.
+
+Rows are generated as a stream from a seeded RNG, so the same ``seed`` always
+yields the same directory and ten million rows never have to sit in memory.
+Each field is broken at its own configurable rate, in the ways the validator
+looks for (missing values, bad NPI check digits, short phones, PO boxes).
+Write a CSV from ``backend/``::
+
+    python -m benchmarks.synthetic --rows 100000 -o providers.csv --invalid npi=0.2
+"""
+from __future__ import annotations
+
+import argparse
+import csv
+import io
+import random
+import sys
+from collections.abc import Iterator
+from dataclasses import dataclass, fields
+
+COLUMNS = ["provider_name", "specialty", "npi", "phone", "address", "city", "state", "zip"]
+
+FIRST = ["Jane", "John", "Maria", "Wei", "Aisha", "Carlos", "Priya", "David", "Fatima", "Ivan", "Laura", "Omar",
+         "Grace", "Kenji", "Noah", "Sofia", "Tariq", "Elena", "Samuel", "Mei"]
+LAST = ["Smith", "Garcia", "Chen", "Patel", "Okafor", "Kowalski", "Nguyen", "Haddad", "Silva", "Kim", "Brown",
+        "Johnson", "Rossi", "Novak", "Ahmed", "Larsen", "Moreau", "Tanaka", "Cohen", "Mensah"]
+SPECIALTIES = ["Cardiology", "Pediatrics", "Family Medicine", "Dermatology", "Oncology", "Neurology",
+               "Orthopedics", "Psychiatry", "Radiology", "Internal Medicine"]
+STREETS = ["Main", "Oak", "Pine", "Maple", "Cedar", "Elm", "Lake", "Hill", "Park", "Sunset", "River", "Church"]
+SUFFIXES = ["Street", "Avenue", "Road", "Boulevard", "Drive", "Lane"]
+PLACES = [("Springfield", "IL"), ("Riverside", "CA"), ("Franklin", "TN"), ("Greenville", "SC"),
+          ("Madison", "WI"), ("Salem", "OR"), ("Fairview", "TX"), ("Georgetown", "KY")]
+
+
+@dataclass(frozen=True)
+class InvalidRates:
+    """Fraction of rows in which each field is missing or malformed."""
+
+    name: float = 0.01
+    specialty: float = 0.05
+    npi: float = 0.10
+    phone: float = 0.05
+    address: float = 0.05
+
+    @classmethod
+    def parse(cls, specs: list[str]) -> InvalidRates:
+        """Build from ``field=rate`` strings, e.g. ``["npi=0.2", "phone=0"]``."""
+        known = {field.name for field in fields(cls)}
+        values: dict[str, float] = {}
+        for spec in specs:
+            name, _, rate = spec.partition("=")
+            if name not in known or not rate:
+                raise ValueError(f"Expected one of {sorted(known)} as field=rate, got {spec!r}.")
+            values[name] = float(rate)
+        return cls(**values)
+
+
+def npi_check_digit(prefix: str) -> str:
+    """Luhn check digit for a nine-digit NPI prefix (with the 80840 issuer code)."""
+    total = 0
+    for position, char in enumerate(reversed("80840" + prefix)):
+        digit = int(char)
+        if position % 2 == 0:
+            digit *= 2
+            if digit > 9:
+                digit -= 9
+        total += digit
+    return str((10 - total % 10) % 10)
+
+
+def providers(rows: int, seed: int = 7, invalid: InvalidRates | None = None) -> Iterator[dict[str, str]]:
+    """Yield ``rows`` provider rows keyed by :data:`COLUMNS`."""
+    invalid = invalid or InvalidRates()
+    rng = random.Random(seed)
+    for index in range(rows):
+        first, last = rng.choice(FIRST), rng.choice(LAST)
+        prefix = f"{1 + index % 2:d}{rng.randrange(10**8):08d}"
+        npi = prefix + npi_check_digit(prefix)
+        phone = f"({rng.randrange(200, 999)}) {rng.randrange(200, 999)}-{rng.randrange(10000):04d}"
+        address = f"{rng.randrange(1, 9999)} {rng.choice(STREETS)} {rng.choice(SUFFIXES)}"
+        city, state = rng.choice(PLACES)
+        row = {
+            "provider_name": f"Dr. {first} {last}",
+            "specialty": rng.choice(SPECIALTIES),
+            "npi": npi,
+            "phone": phone,
+            "address": address,
+            "city": city,
+            "state": state,
+            "zip": f"{rng.randrange(10000, 99999)}",
+        }
+        if rng.random() < invalid.name:
+            row["provider_name"] = rng.choice(["", last[:2]])
+        if rng.random() < invalid.specialty:
+            row["specialty"] = ""
+        if rng.random() < invalid.npi:
+            wrong = str((int(npi[-1]) + rng.randrange(1, 10)) % 10)
+            row["npi"] = rng.choice(["", npi[:-1] + wrong, npi[:7], f"NPI{npi[:6]}"])
+        if rng.random() < invalid.phone:
+            row["phone"] = rng.choice(["", phone[:9], "call office"])
+        if rng.random() < invalid.address:
+            row["address"] = rng.choice(["", f"PO Box {rng.randrange(1, 999)}", rng.choice(STREETS)])
+        yield row
+
+
+def csv_chunks(
+    rows: int, chunk_rows: int, seed: int = 7, invalid: InvalidRates | None = None
+) -> Iterator[bytes]:
+    """Yield the directory as CSV documents of at most ``chunk_rows`` rows, each with a header."""
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=COLUMNS)
+    pending = 0
+    for row in providers(rows, seed, invalid):
+        if pending == 0:
+            writer.writeheader()
+        writer.writerow(row)
+        pending += 1
+        if pending == chunk_rows:
+            yield buffer.getvalue().encode()
+            buffer.seek(0)
+            buffer.truncate()
+            pending = 0
+    if pending:
+        yield buffer.getvalue().encode()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=10_000)
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--invalid", action="append", default=[], metavar="FIELD=RATE")
+    parser.add_argument("-o", "--output", help="CSV path (default: stdout)")
+    args = parser.parse_args()
+
+    invalid = InvalidRates.parse(args.invalid)
+    out = open(args.output, "w", newline="") if args.output else sys.stdout
+    try:
+        writer = csv.DictWriter(out, fieldnames=COLUMNS)
+        writer.writeheader()
+        writer.writerows(providers(args.rows, args.seed, invalid))
+    finally:
+        if out is not sys.stdout:
+            out.close()
+
+
+if __name__ == "__main__":
+    main()
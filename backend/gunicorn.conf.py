@@ -0,0 +1,52 @@
+"""Gunicorn settings for the multi-process production server.
+
+Gunicorn reads this file from the working directory, so from ``backend/``::
+
+    gunicorn app.main:app
+
+The app is imported once in the master (``preload_app``). Before the first
+worker forks, the master also creates the schema, bootstraps the admin user
+and loads the NPI and postal indexes (``prepare_before_fork``). Workers then
+share all of it copy-on-write and do none of it themselves. That includes
+workers spawned later: a worker is recycled after ``APP_SERVER_MAX_REQUESTS``
+requests (plus jitter), and ``kill -HUP <master>`` replaces every worker.
+Old workers stop accepting connections and get ``APP_SERVER_GRACEFUL_TIMEOUT``
+seconds to finish in-flight requests such as CSV uploads. HUP re-reads this
+file but not the application code; deploying new code needs a new master
+(``USR2`` then ``QUIT`` the old one, or a rolling restart of the container).
+
+Metrics are not shared between workers: ``/metrics`` reports whichever
+worker answers the scrape.
+"""
+from __future__ import annotations
+
+import os
+from typing import Any
+
+from app.core.config import settings
+
+
+def _default_workers() -> int:
+    # The CPUs this process may run on, which respects container cpusets.
+    return len(os.sched_getaffinity(0)) if hasattr(os, "sched_getaffinity") else os.cpu_count() or 1
+
+
+bind = settings.server_bind
+workers = settings.server_workers or _default_workers()
+worker_class = "uvicorn_worker.UvicornWorker"
+preload_app = True
+max_requests = settings.server_max_requests
+max_requests_jitter = settings.server_max_requests_jitter
+timeout = settings.server_timeout
+graceful_timeout = settings.server_graceful_timeout
+# Gunicorn's 2s default closes idle connections that clients and load
+# balancers still consider open, and their next request fails.
+keepalive = settings.server_keepalive
+accesslog = "-"
+
+
+def when_ready(server: Any) -> None:
+    from app.main import prepare_before_fork
+
+    prepare_before_fork()
+    server.log.info("Schema, admin user and reference indexes ready; forking %s workers", server.cfg.workers)
@@ -0,0 +1,5 @@
+"""Python client for the Provider Operations API."""
+
+from provider_ops_client.client import ApiError, ProviderOpsClient
+
+__all__ = ["ApiError", "ProviderOpsClient"]
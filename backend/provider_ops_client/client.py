@@ -0,0 +1,241 @@
+from __future__ import annotations
+
+import asyncio
+import base64
+import json
+import os
+import time
+from collections.abc import AsyncIterator, Iterable
+from typing import IO, Any
+
+import httpx
+
+DEFAULT_BASE_URL = os.environ.get("PROVIDER_OPS_API_URL", "http://localhost:8000/api/v1")
+
+
+class ApiError(Exception):
+    def __init__(self, status_code: int, detail: str) -> None:
+        super().__init__(f"{status_code}: {detail}")
+        self.status_code = status_code
+        self.detail = detail
+
+
+def _token_expiry(token: str) -> float:
+    try:
+        payload_segment = token.split(".")[1]
+        padded = payload_segment + "=" * (-len(payload_segment) % 4)
+        return float(json.loads(base64.urlsafe_b64decode(padded))["exp"])
+    except (IndexError, KeyError, ValueError):
+        return 0.0
+
+
+class ProviderOpsClient:
+    def __init__(
+        self,
+        base_url: str = DEFAULT_BASE_URL,
+        email: str | None = None,
+        password: str | None = None,
+        *,
+        token: str | None = None,
+        timeout: float = 30.0,
+        max_connections: int = 20,
+        max_keepalive_connections: int = 10,
+        token_refresh_margin: float = 60.0,
+        login_retries: int = 3,
+        transport: httpx.AsyncBaseTransport | None = None,
+    ) -> None:
+        self.email = email
+        self.password = password
+        self.token_refresh_margin = token_refresh_margin
+        self.login_retries = login_retries
+        self._token = token
+        self._token_expires_at = _token_expiry(token) if token else 0.0
+        self._token_lock = asyncio.Lock()
+        self._http = httpx.AsyncClient(
+            base_url=base_url.rstrip("/"),
+            timeout=timeout,
+            limits=httpx.Limits(
+                max_connections=max_connections,
+                max_keepalive_connections=max_keepalive_connections,
+            ),
+            transport=transport,
+        )
+
+    async def __aenter__(self) -> ProviderOpsClient:
+        return self
+
+    async def __aexit__(self, *_: Any) -> None:
+        await self.aclose()
+
+    async def aclose(self) -> None:
+        await self._http.aclose()
+
+    @staticmethod
+    def _raise_for_status(response: httpx.Response) -> None:
+        if response.is_success:
+            return
+        detail = f"Request failed with status {response.status_code}"
+        try:
+            payload = response.json()
+        except ValueError:
+            payload = None
+        if isinstance(payload, dict) and isinstance(payload.get("detail"), str):
+            detail = payload["detail"]
+        raise ApiError(response.status_code, detail)
+
+    async def login(self, email: str | None = None, password: str | None = None) -> str:
+        self.email = email or self.email
+        self.password = password or self.password
+        if not self.email or not self.password:
+            raise ValueError("Email and password are required to log in.")
+
+        for attempt in range(self.login_retries + 1):
+            response = await self._http.post(
+                "/auth/login",
+                data={"username": self.email, "password": self.password},
+            )
+            if response.status_code != 503 or attempt == self.login_retries:
+                break
+            await asyncio.sleep(float(response.headers.get("Retry-After", "1")))
+        self._raise_for_status(response)
+
+        self._token = response.json()["access_token"]
+        self._token_expires_at = _token_expiry(self._token)
+        return self._token
+
+    async def _auth_headers(self, force_refresh: bool = False) -> dict[str, str]:
+        async with self._token_lock:
+            expiring = time.time() >= self._token_expires_at - self.token_refresh_margin
+            if force_refresh or not self._token or (expiring and self.password):
+                await self.login()
+        return {"Authorization": f"Bearer {self._token}"}
+
+    async def _request(self, method: str, path: str, **kwargs: Any) -> httpx.Response:
+        response = await self._http.request(method, path, headers=await self._auth_headers(), **kwargs)
+        if response.status_code == 401 and self.password and kwargs.get("files") is None:
+            response = await self._http.request(
+                method, path, headers=await self._auth_headers(force_refresh=True), **kwargs
+            )
+        self._raise_for_status(response)
+        return response
+
+    async def register(self, email: str, password: str) -> dict[str, Any]:
+        response = await self._http.post("/auth/register", json={"email": email, "password": password})
+        self._raise_for_status(response)
+        return response.json()
+
+    async def me(self) -> dict[str, Any]:
+        return (await self._request("GET", "/auth/me")).json()
+
+    async def summary(self) -> dict[str, Any]:
+        return (await self._request("GET", "/providers/summary")).json()
+
+    async def list_providers(
+        self,
+        page: int = 1,
+        page_size: int = 25,
+        search: str | None = None,
+        risk_level: str | None = None,
+        min_confidence: float | None = None,
+    ) -> dict[str, Any]:
+        params: dict[str, Any] = {"page": page, "page_size": page_size}
+        if search and search.strip():
+            params["search"] = search.strip()
+        if risk_level:
+            params["risk_level"] = risk_level
+        if min_confidence is not None:
+            params["min_confidence"] = min_confidence
+        return (await self._request("GET", "/providers", params=params)).json()
+
+    async def iter_providers(self, page_size: int = 100, **filters: Any) -> AsyncIterator[dict[str, Any]]:
+        page = 1
+        seen = 0
+        while True:
+            payload = await self.list_providers(page=page, page_size=page_size, **filters)
+            for item in payload["items"]:
+                yield item
+            seen += len(payload["items"])
+            if len(payload["items"]) < page_size or seen >= payload["total"]:
+                return
+            page += 1
+
+    async def list_duplicates(self, page: int = 1, page_size: int = 25) -> dict[str, Any]:
+        params = {"page": page, "page_size": page_size}
+        return (await self._request("GET", "/providers/duplicates", params=params)).json()
+
+    async def scan_duplicates(self) -> dict[str, Any]:
+        return (await self._request("POST", "/providers/duplicates/scan")).json()
+
+    async def get_provider(self, provider_id: str) -> dict[str, Any]:
+        return (await self._request("GET", f"/providers/{provider_id}")).json()
+
+    async def get_providers(self, provider_ids: Iterable[str], concurrency: int = 8) -> list[dict[str, Any]]:
+        limit = asyncio.Semaphore(concurrency)
+
+        async def fetch(provider_id: str) -> dict[str, Any]:
+            async with limit:
+                return await self.get_provider(provider_id)
+
+        return list(await asyncio.gather(*(fetch(provider_id) for provider_id in provider_ids)))
+
+    async def get_providers_batch(self, provider_ids: Iterable[str]) -> dict[str, Any]:
+        """Fetch up to the server's ``APP_BULK_MAX_IDS`` providers in one request."""
+        return (await self._request("POST", "/providers/bulk/get", json={"ids": list(provider_ids)})).json()
+
+    async def validate_providers(self, provider_ids: Iterable[str]) -> dict[str, Any]:
+        return (await self._request("POST", "/providers/bulk/validate", json={"ids": list(provider_ids)})).json()
+
+    async def set_validation_status(self, provider_ids: Iterable[str], validation_status: str) -> dict[str, Any]:
+        payload = {"ids": list(provider_ids), "validation_status": validation_status}
+        return (await self._request("POST", "/providers/bulk/status", json=payload)).json()
+
+    async def validate_provider(self, provider_id: str) -> dict[str, Any]:
+        return (await self._request("POST", f"/providers/{provider_id}/validate")).json()
+
+    async def validate_all(self) -> dict[str, Any]:
+        return (await self._request("POST", "/providers/validate-all")).json()
+
+    async def import_csv(self, file: str | os.PathLike[str] | IO[bytes], filename: str | None = None) -> dict[str, Any]:
+        # httpx streams file objects in chunks, so large directories are never held in memory.
+        if isinstance(file, (str, os.PathLike)):
+            with open(file, "rb") as handle:
+                return await self.import_csv(handle, filename or os.path.basename(os.fspath(file)))
+        name = filename or os.path.basename(getattr(file, "name", "providers.csv"))
+        response = await self._request("POST", "/providers/import-csv", files={"file": (name, file, "text/csv")})
+        return response.json()
+
+    async def export_csv(self, destination: str | os.PathLike[str] | None = None) -> bytes | None:
+        headers = await self._auth_headers()
+        async with self._http.stream("GET", "/providers/export/csv", headers=headers) as response:
+            if not response.is_success:
+                await response.aread()
+                self._raise_for_status(response)
+            if destination is None:
+                return await response.aread()
+            with open(destination, "wb") as handle:
+                async for chunk in response.aiter_bytes():
+                    handle.write(chunk)
+        return None
+
+    async def events(self) -> AsyncIterator[dict[str, Any]]:
+        """Yield change events from ``/providers/events`` until the server closes the stream.
+
+        The server ends each stream after a while with a ``reconnect`` event;
+        call again to keep listening.
+        """
+        headers = {**await self._auth_headers(), "Accept": "text/event-stream"}
+        timeout = httpx.Timeout(self._http.timeout.connect, read=None)
+        async with self._http.stream("GET", "/providers/events", headers=headers, timeout=timeout) as response:
+            if not response.is_success:
+                await response.aread()
+                self._raise_for_status(response)
+            kind, data = "message", []
+            async for line in response.aiter_lines():
+                if line.startswith("event:"):
+                    kind = line[6:].strip()
+                elif line.startswith("data:"):
+                    data.append(line[5:].lstrip())
+                elif not line:
+                    if data or kind in ("resync", "reconnect"):
+                        yield {"type": kind, **(json.loads("\n".join(data)) if data else {})}
+                    kind, data = "message", []
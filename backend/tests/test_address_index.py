@@ -0,0 +1,87 @@
+from pathlib import Path
+
+from app.models.provider import RiskLevel
+from app.services.address_index import (
+    PostalIndex,
+    main,
+    normalize_postal_code,
+    normalize_street,
+    street_is_incomplete,
+)
+from app.services.validation import evaluate_provider
+
+
+def _build(tmp_path: Path) -> PostalIndex:
+    geonames = tmp_path / "IN.txt"
+    geonames.write_text(
+        "IN\t560001\tBangalore G.P.O.\tKarnataka\t19\tBangalore\t583\n"
+        "IN\t411001\tPune City\tMaharashtra\t16\tPune\t521\n"
+    )
+    postal_csv = tmp_path / "us.csv"
+    postal_csv.write_text(
+        "postal_code,city,state,state_code\n"
+        "75201,Dallas,Texas,TX\n"
+        "90012,Los Angeles,California,CA\n"
+    )
+    index_path = tmp_path / "postal.json"
+    main(["build", str(geonames), str(postal_csv), "-o", str(index_path)])
+    return PostalIndex.load(index_path)
+
+
+def test_street_and_postal_code_normalization() -> None:
+    assert normalize_street("123 Main Street, Suite 4") == "123 MAIN ST STE 4"
+    assert normalize_street("45 north Linking road") == "45 N LINKING RD"
+    assert street_is_incomplete(normalize_street("1 A St"))
+    assert not street_is_incomplete(normalize_street("Old Station Road"))
+    assert normalize_postal_code("75201-1234") == "75201"
+    assert normalize_postal_code("560 001") == "560001"
+
+
+def test_postal_index_checks_city_and_state(tmp_path: Path) -> None:
+    index = _build(tmp_path)
+    assert len(index) == 4
+
+    dallas = index.check("75201-4321", "Dallas", "TX")
+    assert (dallas.postal_code_known, dallas.city_matches, dallas.state_matches) == (True, True, True)
+    assert index.check("75201", "Dallas", "Texas").state_matches
+
+    # Cities are compared whole, not as substrings.
+    assert not index.check("75201", "LA", "TX").city_matches
+    assert not index.check("90012", "Angeles", "CA").city_matches
+
+    # GeoNames districts count as city aliases.
+    bangalore = index.check("560001", "Bangalore", "Karnataka")
+    assert bangalore.city_matches and bangalore.state_matches
+    assert not index.check("560001", "Pune", "Maharashtra").city_matches
+    assert not index.check("999999", "Pune", "Maharashtra").postal_code_known
+
+
+def test_evaluate_provider_flags_postal_mismatches(tmp_path: Path) -> None:
+    index = _build(tmp_path)
+
+    def evaluate(zip_code: str, city: str, state: str):
+        return evaluate_provider(
+            "Dr. Jane Smith",
+            "Cardiology",
+            "1245319599",
+            "5551234567",
+            "123 Main Street",
+            city=city,
+            state=state,
+            zip_code=zip_code,
+            postal_index=index,
+        )
+
+    assert evaluate("75201", "Dallas", "TX").risk_level == RiskLevel.LOW
+    assert evaluate("00000", "Dallas", "TX").primary_issue == "ZIP code is not in the postal reference."
+    assert evaluate("75201", "Dallas", "CA").primary_issue == "State does not match the ZIP code."
+    assert evaluate("75201", "Austin", "TX").primary_issue == "City does not match the ZIP code."
+
+
+def test_empty_postal_index_is_still_used(tmp_path: Path) -> None:
+    empty = PostalIndex(places=[], states=[], postal={})
+    outcome = evaluate_provider(
+        "Dr. Jane Smith", "Cardiology", "1245319599", "5551234567", "123 Main Street",
+        city="Dallas", state="TX", zip_code="75201", postal_index=empty,
+    )
+    assert outcome.primary_issue == "ZIP code is not in the postal reference."
@@ -1,7 +1,13 @@
 from uuid import uuid4
 
 from fastapi.testclient import TestClient
+from sqlalchemy.orm import Session, sessionmaker
 
+import app.bootstrap as bootstrap
+from app.core.config import settings
+from app.crud.user import get_by_email
+from app.db.schema import ensure_schema
+from app.db.session import create_engines
 from app.main import app
 
 
@@ -25,3 +31,22 @@ def test_register_and_login() -> None:
         payload = login.json()
         assert "access_token" in payload
         assert payload["token_type"] == "bearer"
+
+
+def test_bootstrap_hashes_without_holding_the_writer(tmp_path, monkeypatch) -> None:
+    writer, reader = create_engines(f"sqlite:///{tmp_path / 'bootstrap.db'}")
+    ensure_schema(writer)
+    checked_out: list[int] = []
+    hash_password = bootstrap.create_password_hash
+
+    def recording_hash(password: str) -> str:
+        checked_out.append(writer.pool.checkedout())
+        return hash_password(password)
+
+    monkeypatch.setattr(bootstrap, "create_password_hash", recording_hash)
+    with sessionmaker(bind=writer, class_=Session)() as db:
+        bootstrap.bootstrap_admin_user(db)
+        assert get_by_email(db, settings.bootstrap_admin_email).is_superuser
+    assert checked_out == [0]
+    writer.dispose()
+    reader.dispose()
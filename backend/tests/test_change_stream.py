@@ -0,0 +1,244 @@
+import asyncio
+import json
+from uuid import uuid4
+
+import httpx
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import update
+from sqlalchemy.orm import Session, sessionmaker
+from starlette.types import Message
+
+from app.core.config import settings
+from app.crud.provider import SummaryDelta, create_provider_batch, revalidate_providers, summary
+from app.db.schema import ensure_schema
+from app.db.session import create_engines
+from app.main import app
+from app.models.provider import ProviderRecord, RiskLevel
+from app.services import change_stream
+from app.services.change_stream import RESYNC, ChangeBroker, DatabaseBackend, MemoryBackend
+
+CSV_HEADER = "provider_name,specialty,npi,phone,address\n"
+
+
+def test_database_backend_fans_out_across_processes(tmp_path) -> None:
+    writer, reader = create_engines(f"sqlite:///{tmp_path / 'events.db'}")
+    ensure_schema(writer)
+
+    def worker() -> tuple[ChangeBroker, DatabaseBackend]:
+        backend = DatabaseBackend(
+            sessionmaker(bind=writer, class_=Session), sessionmaker(bind=reader, class_=Session), 0.1, 300.0
+        )
+        return ChangeBroker(backend, queue_size=2), backend
+
+    async def scenario() -> None:
+        (first, first_backend), (second, second_backend) = worker(), worker()
+        first_backend.poll()
+        second_backend.poll()
+        watching = second.subscribe("owner-a")
+        other_owner = second.subscribe("owner-b")
+
+        first.publish("owner-a", {"type": "providers", "provider_ids": ["p1"]})
+        assert first_backend.poll() == 1
+        assert second_backend.poll() == 1
+        await asyncio.sleep(0)
+        assert watching.queue.get_nowait()["provider_ids"] == ["p1"]
+        assert other_owner.queue.empty()
+
+        # A stream that falls behind gets one resync instead of its backlog.
+        for index in range(3):
+            first.publish("owner-a", {"type": "providers", "provider_ids": [f"q{index}"]})
+        first_backend.poll()
+        second_backend.poll()
+        await asyncio.sleep(0)
+        assert watching.queue.get_nowait() == RESYNC
+        assert watching.queue.empty()
+
+        second.unsubscribe(watching)
+        second.unsubscribe(other_owner)
+        assert second.subscriber_count() == 0
+
+    asyncio.run(scenario())
+    writer.dispose()
+    reader.dispose()
+
+
+def _events(received: list[bytes]) -> list[tuple[str, dict]]:
+    events = []
+    for block in b"".join(received).decode().split("\n\n"):
+        fields = dict(line.split(": ", 1) for line in block.splitlines() if line.startswith(("event:", "data:")))
+        if "event" in fields:
+            events.append((fields["event"], json.loads(fields["data"])))
+    return events
+
+
+async def _read_events(path: str, token: str, received: list[bytes], done: asyncio.Event) -> None:
+    # httpx and Starlette's TestClient buffer whole responses, so the stream is
+    # driven through the ASGI interface and disconnected once `done` is set.
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "root_path": "",
+        "query_string": b"",
+        "headers": [(b"host", b"testserver"), (b"authorization", f"Bearer {token}".encode())],
+        "client": ("testclient", 50000),
+        "server": ("testserver", 80),
+    }
+
+    async def receive() -> Message:
+        await done.wait()
+        return {"type": "http.disconnect"}
+
+    async def send(message: Message) -> None:
+        if message["type"] == "http.response.body" and message.get("body"):
+            received.append(message["body"])
+
+    await app(scope, receive, send)
+
+
+def test_event_stream_pushes_summary_deltas_and_changed_ids(monkeypatch) -> None:
+    email = f"stream-{uuid4().hex}@example.com"
+    password = "StreamPass123!"
+    csv_payload = CSV_HEADER + "".join(
+        f"Dr. Stream {index},Cardiology,1234567890,5551234567,{index} Main Street\n" for index in range(3)
+    )
+
+    async def wait_for(received: list[bytes], marker: bytes) -> None:
+        for _ in range(200):
+            if marker in b"".join(received):
+                return
+            await asyncio.sleep(0.02)
+        raise AssertionError(f"{marker!r} not received: {b''.join(received)!r}")
+
+    async def scenario() -> None:
+        async with app.router.lifespan_context(app):
+            transport = httpx.ASGITransport(app=app)
+            async with httpx.AsyncClient(transport=transport, base_url="http://testserver") as client:
+                await client.post("/api/v1/auth/register", json={"email": email, "password": password})
+                login = await client.post(
+                    "/api/v1/auth/login",
+                    data={"username": email, "password": password},
+                    headers={"Content-Type": "application/x-www-form-urlencoded"},
+                )
+                token = login.json()["access_token"]
+                headers = {"Authorization": f"Bearer {token}"}
+
+                received: list[bytes] = []
+                done = asyncio.Event()
+                stream = asyncio.create_task(_read_events("/api/v1/providers/events", token, received, done))
+                await wait_for(received, b"event: ready")
+
+                files = {"file": ("providers.csv", csv_payload, "text/csv")}
+                imported = await client.post("/api/v1/providers/import-csv", files=files, headers=headers)
+                assert imported.status_code == 201
+                await wait_for(received, b"event: providers")
+                ids = [item["id"] for item in (await client.get("/api/v1/providers", headers=headers)).json()["items"]]
+                decision = {"ids": ids, "validation_status": "Validated"}
+                assert (await client.post("/api/v1/providers/bulk/status", json=decision, headers=headers)).is_success
+                await wait_for(received, b'"reason":"status"')
+                done.set()
+                await stream
+
+                # Streams end on their own so a worker that is shutting down can drain.
+                monkeypatch.setattr(settings, "change_stream_max_seconds", 0.05)
+                rotated: list[bytes] = []
+                await asyncio.wait_for(_read_events("/api/v1/providers/events", token, rotated, asyncio.Event()), 5)
+                assert [kind for kind, _ in _events(rotated)] == ["ready", "reconnect"]
+                assert _events(rotated)[0][1]["summary"]["total_providers"] == 3
+
+        (ready_kind, ready), (kind, event), (_, decided) = _events(received)
+        assert (ready_kind, kind) == ("ready", "providers")
+        assert ready["summary"]["total_providers"] == 0
+        assert event["reason"] == "import"
+        assert sorted(event["provider_ids"]) == sorted(ids)
+        assert event["summary"]["total_providers"] == 3
+        assert event["delta"]["total_providers"] == 3
+        # A review decision leaves risk and confidence alone.
+        assert decided["summary"] == event["summary"]
+        assert set(decided["delta"].values()) == {0}
+
+    asyncio.run(scenario())
+
+
+def test_memory_backend_delivers_only_to_local_subscribers() -> None:
+    async def scenario() -> None:
+        broker = ChangeBroker(MemoryBackend(), queue_size=10)
+        subscription = broker.subscribe("owner")
+        await asyncio.to_thread(broker.publish, "owner", {"type": "providers"})
+        assert (await asyncio.wait_for(subscription.queue.get(), 1)) == {"type": "providers"}
+
+    asyncio.run(scenario())
+
+
+def test_summary_delta_counts_only_the_rows_a_write_changed(tmp_path) -> None:
+    writer, reader = create_engines(f"sqlite:///{tmp_path / 'delta.db'}")
+    ensure_schema(writer)
+    rows = [
+        {"provider_name": "Dr. Jane Smith", "specialty": "Cardiology", "npi": "1234567893",
+         "phone": "5551234567", "address": "123 Main Street"},
+        {"provider_name": "Dr. John Doe", "specialty": "Pediatrics", "npi": "12345",
+         "phone": "55512345", "address": "1 A St"},
+    ]
+
+    with Session(writer) as db:
+        create_provider_batch(db, "owner", rows, "seed.csv")
+        before = summary(db, "owner")
+        imported = SummaryDelta()
+        records = create_provider_batch(db, "owner", rows, "more.csv", delta=imported)
+        after = summary(db, "owner")
+        assert imported.changes(after) == pytest.approx({key: after[key] - before[key] for key in after})
+
+        # A write that lands before the summary is read stays out of this delta.
+        create_provider_batch(db, "owner", rows, "concurrent.csv")
+        assert imported.changes(summary(db, "owner"))["total_providers"] == 2
+
+        db.execute(
+            update(ProviderRecord)
+            .where(ProviderRecord.id == records[0].id)
+            .values(risk_level=RiskLevel.HIGH, confidence_score=0.1)
+        )
+        db.commit()
+        before = summary(db, "owner")
+        revalidated = SummaryDelta()
+        revalidate_providers(db, "owner", [record.id for record in records], delta=revalidated)
+        after = summary(db, "owner")
+        changes = revalidated.changes(after)
+        assert changes == pytest.approx({key: after[key] - before[key] for key in after})
+        assert changes["total_providers"] == 0
+        assert changes["high_risk_count"] == -1
+    writer.dispose()
+    reader.dispose()
+
+
+def test_writes_skip_the_summary_when_nobody_is_listening(monkeypatch) -> None:
+    reads: list[str] = []
+
+    def current_summary(owner_id: str) -> dict:
+        reads.append(owner_id)
+        return {}
+
+    monkeypatch.setattr(change_stream, "current_summary", current_summary)
+    email = f"quiet-{uuid4().hex}@example.com"
+    csv_payload = CSV_HEADER + "Dr. Quiet,Cardiology,1234567890,5551234567,1 Main Street\n"
+
+    with TestClient(app) as client:
+        client.post("/api/v1/auth/register", json={"email": email, "password": "QuietPass123!"})
+        token = client.post(
+            "/api/v1/auth/login",
+            data={"username": email, "password": "QuietPass123!"},
+            headers={"Content-Type": "application/x-www-form-urlencoded"},
+        ).json()["access_token"]
+        headers = {"Authorization": f"Bearer {token}"}
+        files = {"file": ("providers.csv", csv_payload, "text/csv")}
+        assert client.post("/api/v1/providers/import-csv", files=files, headers=headers).status_code == 201
+        assert client.post("/api/v1/providers/validate-all", headers=headers).status_code == 200
+
+    assert reads == []
+    # Streams in other workers cannot be seen, so the database backend always publishes.
+    shared = ChangeBroker(DatabaseBackend(sessionmaker(), sessionmaker(), 1.0, 1.0), queue_size=1)
+    assert shared.has_listeners("anyone")
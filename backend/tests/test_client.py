@@ -0,0 +1,79 @@
+import asyncio
+from uuid import uuid4
+
+import httpx
+
+from app.main import app
+from provider_ops_client import ApiError, ProviderOpsClient
+
+
+def test_client_against_in_process_app(tmp_path) -> None:
+    email = f"sdk-{uuid4().hex}@example.com"
+    password = "ClientPass123!"
+    csv_path = tmp_path / "directory.csv"
+    csv_path.write_text(
+        "provider_name,specialty,npi,phone,address\n"
+        + "".join(
+            f"Dr. Client {index},Cardiology,123456789{index},5551234567,{index} Main Street\n"
+            for index in range(5)
+        )
+    )
+
+    async def scenario() -> None:
+        async with app.router.lifespan_context(app):
+            transport = httpx.ASGITransport(app=app)
+            async with ProviderOpsClient("http://testserver/api/v1", transport=transport) as anonymous:
+                await anonymous.register(email, password)
+                try:
+                    await anonymous.summary()
+                except ValueError:
+                    pass
+                else:
+                    raise AssertionError("expected a credentials error without a login")
+
+            async with ProviderOpsClient(
+                "http://testserver/api/v1", email, password, transport=transport
+            ) as client:
+                assert (await client.me())["email"] == email
+
+                imported = await client.import_csv(csv_path)
+                assert imported == {"imported": 5, "source_file": "directory.csv"}
+
+                providers = [item async for item in client.iter_providers(page_size=2)]
+                assert len(providers) == 5
+
+                ids = [item["id"] for item in providers]
+                fetched = await client.get_providers(ids, concurrency=2)
+                assert [item["id"] for item in fetched] == ids
+                batch = await client.get_providers_batch([*ids, "missing"])
+                assert [item["id"] for item in batch["items"]] == ids and batch["missing"] == ["missing"]
+                decided = await client.set_validation_status(ids[:2], "Needs Review")
+                assert decided == {"updated": 2, "missing": []}
+                assert (await client.validate_providers(ids))["updated"] == 5
+
+                logins = 0
+                original_login = client.login
+
+                async def counting_login(*args: str) -> str:
+                    nonlocal logins
+                    logins += 1
+                    return await original_login(*args)
+
+                client.login = counting_login  # type: ignore[method-assign]
+                assert (await client.summary())["total_providers"] == 5
+                assert logins == 0
+                client._token_expires_at = 0.0
+                assert (await client.summary())["total_providers"] == 5
+                assert logins == 1
+
+                exported = await client.export_csv()
+                assert exported is not None and exported.count(b"\n") == 6
+
+                try:
+                    await client.get_provider("missing")
+                except ApiError as exc:
+                    assert exc.status_code == 404
+                else:
+                    raise AssertionError("expected a 404 for an unknown provider")
+
+    asyncio.run(scenario())
@@ -0,0 +1,65 @@
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.services.duplicates import blocking_keys, features, is_duplicate, normalize_name
+from tests.test_providers import _auth_header
+
+HEADER = "provider_name,specialty,npi,phone,address,zip\n"
+
+
+def test_name_variants_share_a_band_and_are_confirmed() -> None:
+    jane = features("Dr. Jane Smith", None, "(555) 123-4567", "123 Main Street", "94110")
+    variant = features("Smith, Jane MD", None, "555.123.4567", "123 Main St", "94110")
+    colleague = features("Dr. Robert Jones", None, "5551234567", "123 Main Street", "94110")
+
+    assert normalize_name("Smith, Jane MD") == normalize_name("Dr. Jane Smith") == "JANE SMITH"
+    assert set(blocking_keys(jane)) & set(blocking_keys(variant))
+    assert is_duplicate(jane, variant)
+    # Same practice phone and street, different person.
+    assert not is_duplicate(jane, colleague)
+
+
+def test_different_npis_are_never_duplicates() -> None:
+    left = features("Dr. Jane Smith", "1245319599", None, "123 Main Street", "94110")
+    right = features("Dr. Jane Smith", "1234567893", None, "123 Main Street", "94110")
+    assert not is_duplicate(left, right)
+    assert is_duplicate(left, features("J. Smith", "1245319599", None, None, None))
+
+
+def test_imports_flag_duplicates_incrementally() -> None:
+    first = (
+        HEADER
+        + "Dr. Jane Smith,Cardiology,,5551234567,123 Main Street,94110\n"
+        + "Dr. Robert Jones,Cardiology,,5551234567,123 Main Street,94110\n"
+        + "Jane Smith MD,Cardiology,,5551234567,123 Main St,94110\n"
+    )
+    second = (
+        HEADER
+        + "\"Smith, Jane\",Cardiology,,555-123-4567,123 Main St.,94110\n"
+        + "Dr. Alice Wong,Pediatrics,,5559876543,9 Elm Road,10001\n"
+    )
+
+    with TestClient(app) as client:
+        headers = _auth_header(client)
+        for name, payload in (("first.csv", first), ("second.csv", second)):
+            files = {"file": (name, payload, "text/csv")}
+            assert client.post("/api/v1/providers/import-csv", files=files, headers=headers).status_code == 201
+
+        response = client.get("/api/v1/providers/duplicates", headers=headers)
+        assert response.status_code == 200
+        payload = response.json()
+        assert payload["total"] == 1
+        (cluster,) = payload["clusters"]
+        names = sorted(provider["provider_name"] for provider in cluster["providers"])
+        assert names == ["Dr. Jane Smith", "Jane Smith MD", "Smith, Jane"]
+        assert {provider["duplicate_cluster_id"] for provider in cluster["providers"]} == {cluster["cluster_id"]}
+        # The cluster is named after a member of the first import.
+        first_ids = {p["id"] for p in cluster["providers"] if p["provider_name"] != "Smith, Jane"}
+        assert cluster["cluster_id"] in first_ids
+
+        listed = client.get("/api/v1/providers", params={"search": "Wong"}, headers=headers).json()
+        assert listed["items"][0]["duplicate_cluster_id"] is None
+
+        # Everything was indexed on import, so a catch-up scan has nothing to do.
+        scan = client.post("/api/v1/providers/duplicates/scan", headers=headers)
+        assert scan.json() == {"indexed": 0}
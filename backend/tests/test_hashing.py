@@ -0,0 +1,86 @@
+import asyncio
+import threading
+
+from fastapi.testclient import TestClient
+
+from app.bootstrap import bootstrap_done
+from app.core.config import settings
+from app.core.hashing import PasswordHasherBusy, PasswordHashExecutor, password_hasher
+from app.db.session import read_engine
+from app.main import app
+
+
+def test_executor_rejects_when_saturated() -> None:
+    executor = PasswordHashExecutor(workers=1, queue_size=0, retry_after=3)
+    release = threading.Event()
+
+    async def scenario() -> None:
+        blocked = asyncio.ensure_future(executor.run(release.wait))
+        await asyncio.sleep(0.05)
+        try:
+            await executor.run(lambda: True)
+        except PasswordHasherBusy as exc:
+            assert exc.retry_after == 3
+        else:
+            raise AssertionError("expected the saturated executor to reject work")
+        assert executor.stats()["in_flight"] == 1
+        release.set()
+        await blocked
+
+    asyncio.run(scenario())
+    stats = executor.stats()
+    assert stats["rejected_total"] == 1
+    assert stats["completed_total"] == 1
+    executor.shutdown()
+
+
+def test_login_returns_503_when_hashing_saturated(monkeypatch) -> None:
+    with TestClient(app) as client:
+        assert bootstrap_done.wait(timeout=10)
+        monkeypatch.setattr(password_hasher, "capacity", 0)
+        response = client.post(
+            "/api/v1/auth/login",
+            data={"username": settings.bootstrap_admin_email, "password": "irrelevant"},
+            headers={"Content-Type": "application/x-www-form-urlencoded"},
+        )
+        assert response.status_code == 503
+        assert response.headers["Retry-After"] == str(settings.password_hash_retry_after_seconds)
+        monkeypatch.undo()
+
+        login = client.post(
+            "/api/v1/auth/login",
+            data={
+                "username": settings.bootstrap_admin_email,
+                "password": settings.bootstrap_admin_password,
+            },
+            headers={"Content-Type": "application/x-www-form-urlencoded"},
+        )
+        assert login.status_code == 200
+        headers = {"Authorization": f"Bearer {login.json()['access_token']}"}
+
+        stats = client.get("/api/v1/health/hashing", headers=headers)
+        assert stats.status_code == 200
+        assert stats.json()["completed_total"] >= 1
+
+
+def test_login_releases_its_reader_connection_before_hashing(monkeypatch) -> None:
+    checked_out: list[int] = []
+    run = password_hasher.run
+
+    async def recording_run(fn, *args):
+        checked_out.append(read_engine.pool.checkedout())
+        return await run(fn, *args)
+
+    with TestClient(app) as client:
+        assert bootstrap_done.wait(timeout=10)
+        monkeypatch.setattr(password_hasher, "run", recording_run)
+        login = client.post(
+            "/api/v1/auth/login",
+            data={
+                "username": settings.bootstrap_admin_email,
+                "password": settings.bootstrap_admin_password,
+            },
+            headers={"Content-Type": "application/x-www-form-urlencoded"},
+        )
+        assert login.status_code == 200
+    assert checked_out == [0]
@@ -0,0 +1,67 @@
+from fastapi.testclient import TestClient
+
+from app.core.metrics import (
+    Histogram,
+    http_request_db_statements,
+    http_request_duration,
+    provider_rows_imported_total,
+    provider_rows_validated_total,
+)
+from app.main import app
+from tests.test_providers import _auth_header
+
+SUMMARY = "/api/v1/providers/summary"
+
+
+def test_histogram_renders_cumulative_buckets() -> None:
+    histogram = Histogram("demo_seconds", "Demo.", ("route",), buckets=(0.1, 1.0))
+    for value in (0.05, 0.1, 0.5, 3.0):
+        histogram.observe(value, '/a/"{id}"')
+
+    lines = histogram.render()
+    assert lines[:3] == [
+        'demo_seconds_bucket{route="/a/\\"{id}\\"",le="0.1"} 2',
+        'demo_seconds_bucket{route="/a/\\"{id}\\"",le="1"} 3',
+        'demo_seconds_bucket{route="/a/\\"{id}\\"",le="+Inf"} 4',
+    ]
+    assert lines[-1] == 'demo_seconds_count{route="/a/\\"{id}\\""} 4'
+
+
+def test_metrics_report_routes_statements_and_rows() -> None:
+    csv_payload = (
+        "provider_name,specialty,npi,phone,address\n"
+        "Dr. Jane Smith,Cardiology,1234567893,5551234567,123 Main Street\n"
+        "Dr. John Doe,Pediatrics,12345,55512345,1 A St\n"
+    )
+    imported_before = provider_rows_imported_total.value()
+    revalidated_before = provider_rows_validated_total.value("revalidate")
+    summaries_before = http_request_duration.count("GET", SUMMARY, "200")
+    statements_before = http_request_db_statements.sum("GET", SUMMARY)
+
+    with TestClient(app) as client:
+        headers = _auth_header(client)
+        files = {"file": ("providers.csv", csv_payload, "text/csv")}
+        assert client.post("/api/v1/providers/import-csv", files=files, headers=headers).status_code == 201
+        assert client.post("/api/v1/providers/validate-all", headers=headers).status_code == 200
+        assert client.get(SUMMARY, headers=headers).status_code == 200
+        providers = client.get("/api/v1/providers", headers=headers).json()["items"]
+        assert client.get(f"/api/v1/providers/{providers[0]['id']}", headers=headers).status_code == 200
+        assert client.get("/no/such/path").status_code == 404
+
+        response = client.get("/metrics")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+    body = response.text
+    assert provider_rows_imported_total.value() == imported_before + 2
+    assert provider_rows_validated_total.value("revalidate") == revalidated_before + 2
+    assert http_request_duration.count("GET", SUMMARY, "200") == summaries_before + 1
+    # The summary runs its count and average queries in the threadpool.
+    assert http_request_db_statements.sum("GET", SUMMARY) >= statements_before + 4
+    # Paths are labelled by template, never by provider id.
+    assert 'route="/api/v1/providers/{provider_id}"' in body
+    assert providers[0]["id"] not in body
+    assert 'route="<unmatched>",status="404"' in body
+    assert 'db_statements_total{engine="primary"}' in body
+    assert 'db_pool_checked_out{pool="primary"}' in body
+    assert "http_requests_in_flight " in body
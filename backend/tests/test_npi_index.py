@@ -0,0 +1,74 @@
+from pathlib import Path
+
+from app.models.provider import RiskLevel
+from app.services.npi_index import NpiIndex, main, write_index
+from app.services.validation import evaluate_provider, npi_checksum_valid
+
+NPPES_HEADER = (
+    "NPI,Entity Type Code,NPI Deactivation Date,NPI Reactivation Date,"
+    "Healthcare Provider Taxonomy Code_1,Healthcare Provider Primary Taxonomy Switch_1,"
+    "Healthcare Provider Taxonomy Code_2,Healthcare Provider Primary Taxonomy Switch_2\n"
+)
+
+
+def test_npi_checksum() -> None:
+    assert npi_checksum_valid("1234567893")
+    assert npi_checksum_valid("1245319599")
+    assert not npi_checksum_valid("1234567890")
+    assert not npi_checksum_valid("1245319598")
+
+
+def test_build_and_lookup_from_nppes_export(tmp_path: Path) -> None:
+    nppes = tmp_path / "npidata.csv"
+    nppes.write_text(
+        NPPES_HEADER
+        + "1245319599,1,,,207Q00000X,N,207RC0000X,Y\n"
+        + "1234567893,1,,,208000000X,Y,,\n"
+        + "1003000126,1,2019-01-01,,207Q00000X,Y,,\n"
+        + "bogus,1,,,207Q00000X,Y,,\n"
+    )
+    taxonomy = tmp_path / "nucc.csv"
+    taxonomy.write_text(
+        "Code,Classification,Specialization,Display Name\n"
+        "207RC0000X,Internal Medicine,Cardiovascular Disease,Cardiovascular Disease Physician\n"
+        "208000000X,Pediatrics,,Pediatrics Physician\n"
+    )
+    index_path = tmp_path / "npi.idx"
+    main(["build", str(nppes), str(index_path), "--taxonomy", str(taxonomy)])
+
+    index = NpiIndex(index_path)
+    assert len(index) == 2
+    assert "1245319599" in index
+    assert "1003000126" not in index  # deactivated
+    assert "9999999999" not in index
+    entry = index.lookup("1245319599")
+    assert entry is not None
+    assert (entry.taxonomy_code, entry.specialty) == ("207RC0000X", "Cardiovascular Disease Physician")
+    assert index.lookup("1234567893").specialty == "Pediatrics Physician"
+
+
+def test_evaluate_provider_flags_unknown_and_fake_npis(tmp_path: Path) -> None:
+    index_path = tmp_path / "npi.idx"
+    write_index(index_path, [(1245319599, "207RC0000X")])
+    index = NpiIndex(index_path)
+
+    def evaluate(npi: str):
+        return evaluate_provider(
+            "Dr. Jane Smith", "Cardiology", npi, "5551234567", "123 Main Street", npi_index=index
+        )
+
+    assert evaluate("1245319599").risk_level == RiskLevel.LOW
+    assert evaluate("1234567890").primary_issue == "NPI check digit is invalid."
+    assert evaluate("1234567893").primary_issue == "NPI is not in the NPPES registry."
+
+
+def test_evaluate_provider_uses_an_empty_index(tmp_path: Path) -> None:
+    index_path = tmp_path / "npi.idx"
+    write_index(index_path, [])
+    index = NpiIndex(index_path)
+    assert len(index) == 0
+
+    outcome = evaluate_provider(
+        "Dr. Jane Smith", "Cardiology", "1245319599", "5551234567", "123 Main Street", npi_index=index
+    )
+    assert outcome.primary_issue == "NPI is not in the NPPES registry."
@@ -0,0 +1,78 @@
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy import exc as sa_exc
+
+from app.bootstrap import bootstrap_done
+from app.core.config import settings
+from app.db.pool import PoolMetrics, instrumented_queue_pool
+from app.db.session import engine, read_engine
+from app.main import app, create_app
+
+
+def test_pool_metrics_record_overflow_and_timeouts(tmp_path) -> None:
+    metrics = PoolMetrics("test")
+    engine = create_engine(
+        f"sqlite:///{tmp_path / 'pool.db'}",
+        poolclass=instrumented_queue_pool(metrics),
+        pool_size=1,
+        max_overflow=1,
+        pool_timeout=0.05,
+    )
+    metrics.attach(engine)
+
+    first = engine.connect()
+    second = engine.connect()
+    with pytest.raises(sa_exc.TimeoutError):
+        engine.connect()
+
+    snapshot = metrics.snapshot(engine.pool)
+    assert snapshot["checked_out"] == 2
+    assert snapshot["overflow"] == 1
+    assert snapshot["overflow_total"] == 1
+    assert snapshot["timeouts_total"] == 1
+
+    first.close()
+    second.close()
+    assert metrics.snapshot(engine.pool)["checked_out"] == 0
+    engine.dispose()
+
+
+def test_pool_endpoint_requires_admin() -> None:
+    with TestClient(app) as client:
+        assert bootstrap_done.wait(timeout=10)
+        assert client.get("/api/v1/ready/pool").status_code == 401
+
+        login = client.post(
+            "/api/v1/auth/login",
+            data={
+                "username": settings.bootstrap_admin_email,
+                "password": settings.bootstrap_admin_password,
+            },
+            headers={"Content-Type": "application/x-www-form-urlencoded"},
+        )
+        headers = {"Authorization": f"Bearer {login.json()['access_token']}"}
+        response = client.get("/api/v1/ready/pool", headers=headers)
+        assert response.status_code == 200
+        pools = {item["name"]: item for item in response.json()}
+        assert pools["primary"]["checkouts_total"] >= 1
+        if read_engine is engine:
+            assert pools["primary"]["pool_size"] == settings.db_pool_size
+            assert "sqlite-reader" not in pools
+        else:
+            # Tuned SQLite: one serialised writer plus the read-only pool.
+            assert pools["primary"]["pool_size"] == 1
+            assert pools["sqlite-reader"]["pool_size"] == settings.sqlite_read_pool_size
+
+
+def test_pool_timeout_is_a_retryable_503() -> None:
+    test_app = create_app()
+
+    @test_app.get("/busy")
+    def busy() -> None:
+        raise sa_exc.TimeoutError("QueuePool limit of size 1 overflow 0 reached")
+
+    with TestClient(test_app) as client:
+        response = client.get("/busy")
+    assert response.status_code == 503
+    assert response.headers["Retry-After"] == str(settings.db_pool_retry_after_seconds)
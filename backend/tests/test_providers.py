@@ -1,7 +1,10 @@
 from uuid import uuid4
 
 from fastapi.testclient import TestClient
+from sqlalchemy import event
 
+from app.core.config import settings
+from app.db.session import engine
 from app.main import app
 
 
@@ -46,3 +49,60 @@ def test_provider_import_and_summary() -> None:
         summary = client.get("/api/v1/providers/summary", headers=headers)
         assert summary.status_code == 200
         assert summary.json()["total_providers"] >= 2
+
+
+def test_bulk_endpoints_are_owner_scoped_and_set_based(monkeypatch) -> None:
+    csv_payload = (
+        "provider_name,specialty,npi,phone,address\n"
+        "Dr. Jane Smith,Cardiology,1234567890,5551234567,123 Main Street\n"
+        "Dr. John Doe,Pediatrics,12345,55512345,1 A St\n"
+        "Dr. Ann Lee,Dermatology,1234567893,5559876543,9 Elm Street\n"
+    )
+    updates: list[str] = []
+
+    def count_updates(_conn, _cursor, statement, _parameters, _context, _many) -> None:
+        if statement.startswith("UPDATE provider_records"):
+            updates.append(statement)
+            assert "updated_at" in statement
+
+    with TestClient(app) as client:
+        headers = _auth_header(client)
+        files = {"file": ("providers.csv", csv_payload, "text/csv")}
+        assert client.post("/api/v1/providers/import-csv", files=files, headers=headers).status_code == 201
+        ids = [item["id"] for item in client.get("/api/v1/providers", headers=headers).json()["items"]]
+        other = _auth_header(client)
+
+        fetched = client.post("/api/v1/providers/bulk/get", json={"ids": [*ids, ids[0], "missing"]}, headers=headers)
+        assert fetched.status_code == 200
+        assert [item["id"] for item in fetched.json()["items"]] == ids
+        assert fetched.json()["missing"] == ["missing"]
+        assert client.post("/api/v1/providers/bulk/get", json={"ids": ids}, headers=other).json() == {
+            "items": [],
+            "missing": ids,
+        }
+
+        decision = {"ids": ids, "validation_status": "Validated"}
+        assert client.post("/api/v1/providers/bulk/status", json=decision, headers=other).json() == {
+            "updated": 0,
+            "missing": ids,
+        }
+        event.listen(engine, "before_cursor_execute", count_updates)
+        try:
+            decided = client.post("/api/v1/providers/bulk/status", json=decision, headers=headers)
+            revalidated = client.post("/api/v1/providers/bulk/validate", json={"ids": ids}, headers=headers)
+        finally:
+            event.remove(engine, "before_cursor_execute", count_updates)
+        assert decided.json() == {"updated": 3, "missing": []}
+        assert revalidated.json() == {"updated": 3, "missing": []}
+        assert len(updates) == 2
+
+        statuses = {
+            item["provider_name"]: item["validation_status"]
+            for item in client.post("/api/v1/providers/bulk/get", json={"ids": ids}, headers=headers).json()["items"]
+        }
+        assert statuses["Dr. John Doe"] == "Needs Review"
+
+        pending = {"ids": ids, "validation_status": "Pending"}
+        assert client.post("/api/v1/providers/bulk/status", json=pending, headers=headers).status_code == 422
+        monkeypatch.setattr(settings, "bulk_max_ids", 2)
+        assert client.post("/api/v1/providers/bulk/validate", json={"ids": ids}, headers=headers).status_code == 422
@@ -0,0 +1,64 @@
+import shutil
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session, sessionmaker
+
+from app.db.base import Base
+from app.db.routing import ReplicaRouter
+from app.models.user import User
+
+
+def test_router_honours_lag_and_read_your_writes(tmp_path) -> None:
+    primary_path, replica_path = tmp_path / "primary.db", tmp_path / "replica.db"
+    primary_engine = create_engine(f"sqlite:///{primary_path}")
+    Base.metadata.create_all(bind=primary_engine)
+    Primary = sessionmaker(bind=primary_engine, class_=Session)
+    with Primary() as db:
+        user = User(email="replica@example.com", hashed_password="x")
+        db.add(user)
+        db.commit()
+        owner_id = user.id
+
+    shutil.copy(primary_path, replica_path)
+    replica_engine = create_engine(f"sqlite:///{replica_path}")
+    Replica = sessionmaker(bind=replica_engine, class_=Session)
+    now = [1_000.0]
+    router = ReplicaRouter(
+        primary=Primary,
+        replica=Replica,
+        read_your_writes_seconds=60.0,
+        max_lag_seconds=30.0,
+        lag_check_seconds=0.0,
+        clock=lambda: now[0],
+    )
+
+    # No heartbeat has replicated yet, so the lag is unknown.
+    assert router.replica_lag(force=True) is None
+    assert router.session_factory(owner_id) is Primary
+
+    router.beat()
+    primary_engine.dispose()
+    shutil.copy(primary_path, replica_path)
+    replica_engine.dispose()
+    assert router.replica_lag(force=True) == 0.0
+    assert router.session_factory(owner_id) is Replica
+
+    # The primary keeps beating but the replica stops applying changes.
+    now[0] += 45.0
+    router.beat()
+    assert router.replica_lag(force=True) == 45.0
+    assert router.session_factory(owner_id) is Primary
+
+    primary_engine.dispose()
+    shutil.copy(primary_path, replica_path)
+    replica_engine.dispose()
+    assert router.replica_lag(force=True) == 0.0
+
+    router.record_write(owner_id)
+    assert router.session_factory(owner_id) is Primary
+    assert router.session_factory("someone-else") is Replica
+    assert router.stats()["routed"] == {
+        "replica": 2,
+        "primary_read_your_writes": 1,
+        "primary_lagging": 2,
+    }
@@ -0,0 +1,69 @@
+import asyncio
+import threading
+import time
+
+from fastapi.testclient import TestClient
+
+from app.core import sampler
+from app.core.config import settings
+from app.main import create_app
+from tests.test_providers import _auth_header
+from tests.test_sql_profiler import _admin_header
+
+
+def _spin_until_profiled(stop: threading.Event) -> None:
+    while not stop.is_set():
+        sum(range(1_000))
+
+
+def test_sampler_sees_busy_threads_and_rejects_overlap() -> None:
+    stop = threading.Event()
+    worker = threading.Thread(target=_spin_until_profiled, args=(stop,), name="busy-worker")
+    worker.start()
+
+    async def collect() -> tuple[sampler.StackProfile, bool]:
+        task = asyncio.create_task(sampler.sample_stacks(0.3, 0.005, 0.5))
+        await asyncio.sleep(0.05)
+        try:
+            await sampler.sample_stacks(0.1, 0.005, 0.5)
+        except sampler.SamplerBusy:
+            busy = True
+        else:
+            busy = False
+        return await task, busy
+
+    try:
+        profile, busy = asyncio.run(collect())
+    finally:
+        stop.set()
+        worker.join()
+
+    assert busy
+    assert profile.samples > 10
+    assert 0 < profile.overhead < 1
+    busy_lines = [line for line in profile.collapsed().splitlines() if line.startswith("busy-worker;")]
+    assert busy_lines and all("_spin_until_profiled (tests/test_sampler.py" in line for line in busy_lines)
+
+
+def test_cpu_profile_endpoint_is_admin_only_and_capped(monkeypatch) -> None:
+    monkeypatch.setattr(settings, "profiler_max_seconds", 1.0)
+
+    with TestClient(create_app()) as client:
+        assert client.get("/api/v1/profiling/cpu?seconds=0.1", headers=_auth_header(client)).status_code == 403
+        admin = _admin_header(client)
+        assert client.get("/api/v1/profiling/cpu?seconds=5", headers=admin).status_code == 422
+        started = time.perf_counter()
+        response = client.get("/api/v1/profiling/cpu?seconds=0.2&format=speedscope&include_idle=true", headers=admin)
+        elapsed = time.perf_counter() - started
+
+    assert response.status_code == 200
+    assert elapsed < 2
+    assert "profile.speedscope.json" in response.headers["content-disposition"]
+    assert int(response.headers["x-profile-samples"]) > 0
+    document = response.json()
+    frames = document["shared"]["frames"]
+    assert document["profiles"]
+    for profile in document["profiles"]:
+        assert profile["type"] == "sampled"
+        assert len(profile["samples"]) == len(profile["weights"])
+        assert all(0 <= index < len(frames) for stack in profile["samples"] for index in stack)
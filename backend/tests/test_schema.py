@@ -0,0 +1,31 @@
+from sqlalchemy import create_engine, inspect
+
+from app.db.schema import ensure_schema, schema_fingerprint, stored_schema_version
+from app.db.session import create_engines
+
+
+def test_ensure_schema_skips_ddl_when_version_is_current(tmp_path) -> None:
+    engine = create_engine(f"sqlite:///{tmp_path / 'schema.db'}")
+    assert stored_schema_version(engine) is None
+
+    assert ensure_schema(engine) is True
+    assert {"users", "provider_records"} <= set(inspect(engine).get_table_names())
+    assert stored_schema_version(engine) == schema_fingerprint()
+
+    assert ensure_schema(engine) is False
+    engine.dispose()
+
+
+def test_ensure_schema_adds_new_nullable_columns_to_existing_tables(tmp_path) -> None:
+    # The app's writer engine: with the tuned SQLite profile it has one connection.
+    engine, reader = create_engines(f"sqlite:///{tmp_path / 'old.db'}")
+    with engine.begin() as connection:
+        connection.exec_driver_sql(
+            "CREATE TABLE provider_records (id VARCHAR(36) PRIMARY KEY, provider_name VARCHAR(255) NOT NULL)"
+        )
+
+    assert ensure_schema(engine) is True
+    columns = {column["name"] for column in inspect(engine).get_columns("provider_records")}
+    assert {"address", "city", "state", "zip_code"} <= columns
+    engine.dispose()
+    reader.dispose()
@@ -0,0 +1,27 @@
+import gc
+
+from fastapi.testclient import TestClient
+
+from app import main
+from app.bootstrap import bootstrap_done
+from app.db.pool import _registry
+
+
+def test_prepare_before_fork_runs_startup_once_for_all_workers(monkeypatch) -> None:
+    monkeypatch.setattr(main, "_prepared_before_fork", False)
+    try:
+        main.prepare_before_fork()
+        assert bootstrap_done.is_set()
+        assert all(engine.pool.checkedin() == 0 for engine, _ in _registry.values())
+        assert gc.get_freeze_count() > 0
+    finally:
+        gc.unfreeze()
+
+    def fail(*_args: object) -> None:
+        raise AssertionError("a forked worker repeated the master's startup work")
+
+    monkeypatch.setattr(main, "ensure_schema", fail)
+    monkeypatch.setattr(main, "start_bootstrap", fail)
+    monkeypatch.setattr(main, "bootstrap_admin_user", fail)
+    with TestClient(main.create_app()) as client:
+        assert client.get("/api/v1/health").status_code == 200
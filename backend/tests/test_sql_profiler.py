@@ -0,0 +1,71 @@
+import logging
+
+from fastapi.testclient import TestClient
+
+from app.bootstrap import bootstrap_done
+from app.core.config import settings
+from app.db import profiler
+from app.db.session import engine, read_engine
+from app.main import create_app
+from tests.test_providers import _auth_header
+
+
+def _admin_header(client: TestClient) -> dict[str, str]:
+    assert bootstrap_done.wait(timeout=10)
+    login = client.post(
+        "/api/v1/auth/login",
+        data={"username": settings.bootstrap_admin_email, "password": settings.bootstrap_admin_password},
+        headers={"Content-Type": "application/x-www-form-urlencoded"},
+    )
+    return {"Authorization": f"Bearer {login.json()['access_token']}"}
+
+
+def test_analyze_separates_n_plus_one_from_exact_repeats() -> None:
+    def statement(sql: str, fingerprint: int) -> profiler.StatementRecord:
+        return profiler.StatementRecord(sql, ["str[3]"], 1, 1.0, 1, "primary", fingerprint=fingerprint)
+
+    statements = [statement("SELECT * FROM t WHERE id = ?", index) for index in range(5)]
+    statements += [statement("SELECT * FROM users WHERE email = ?", 7)] * 2
+    findings = {(finding.kind, finding.sql): finding.count for finding in profiler.analyze(statements, 5, 50.0)}
+    assert findings == {
+        ("n_plus_one", "SELECT * FROM t WHERE id = ?"): 5,
+        ("repeated", "SELECT * FROM users WHERE email = ?"): 2,
+    }
+
+
+def test_profiles_are_redacted_explained_and_admin_only(monkeypatch, caplog) -> None:
+    monkeypatch.setattr(settings, "sql_profiling_enabled", True)
+    monkeypatch.setattr(settings, "sql_profile_slow_ms", 0.0)
+    monkeypatch.setattr(settings, "sql_profile_n_plus_one_threshold", 3)
+    profiler.instrument_engine(engine, "primary")
+    profiler.instrument_engine(read_engine, "sqlite-reader")
+    csv_payload = "provider_name,specialty,npi,phone,address\n" + "".join(
+        f"Dr. Secret Name{index},Cardiology,,5551234567,{index} Main Street\n" for index in range(4)
+    )
+
+    with TestClient(create_app()) as client, caplog.at_level(logging.WARNING, logger="app.db.profiler"):
+        headers = _auth_header(client)
+        files = {"file": ("providers.csv", csv_payload, "text/csv")}
+        imported = client.post(
+            "/api/v1/providers/import-csv", files=files, headers={**headers, "X-Request-ID": "import-1"}
+        )
+        assert imported.status_code == 201
+        assert imported.headers["x-request-id"] == "import-1"
+
+        assert client.get("/api/v1/profiling/sql/import-1", headers=headers).status_code == 403
+        admin = _admin_header(client)
+        response = client.get("/api/v1/profiling/sql/import-1", headers=admin)
+        recent = client.get("/api/v1/profiling/sql", headers=admin).json()
+
+    assert response.status_code == 200
+    profile = response.json()
+    assert profile["route"] == "/api/v1/providers/import-csv"
+    assert profile["statement_count"] == len(profile["statements"]) > 0
+    assert "Secret" not in response.text
+    assert any("str[" in parameter for statement in profile["statements"] for parameter in statement["parameters"])
+    selects = [statement for statement in profile["statements"] if statement["sql"].startswith("SELECT")]
+    assert selects and all(statement["plan"] for statement in selects)
+    # create_provider_batch refreshes each imported row with its own SELECT.
+    assert any(finding["kind"] == "n_plus_one" and finding["count"] >= 4 for finding in profile["findings"])
+    assert "import-1" in {item["request_id"] for item in recent}
+    assert any("import-1" in record.getMessage() for record in caplog.records)
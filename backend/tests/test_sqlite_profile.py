@@ -0,0 +1,18 @@
+import pytest
+from sqlalchemy import exc as sa_exc
+from sqlalchemy import text
+
+from app.db.session import engine, read_engine
+
+
+@pytest.mark.skipif(engine is read_engine, reason="tuned SQLite profile is not active")
+def test_sqlite_writer_uses_wal_and_readers_are_read_only() -> None:
+    with engine.connect() as connection:
+        assert connection.execute(text("PRAGMA journal_mode")).scalar() == "wal"
+        assert connection.execute(text("PRAGMA synchronous")).scalar() == 1
+
+    assert engine.pool.size() == 1
+    with read_engine.connect() as connection:
+        assert connection.execute(text("PRAGMA query_only")).scalar() == 1
+        with pytest.raises(sa_exc.OperationalError):
+            connection.execute(text("CREATE TABLE read_only_probe (id INTEGER)"))
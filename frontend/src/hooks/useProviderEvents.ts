@@ -0,0 +1,108 @@
+import { useEffect, useState } from "react";
+import { useQueryClient } from "@tanstack/react-query";
+import { StreamError, streamProviderEvents } from "../lib/api";
+import type { ProviderListResponse, ProviderStreamEvent } from "../types";
+
+const MAX_RETRY_MS = 30_000;
+
+// Keeps the summary and provider list queries current from the server's
+// change stream. Returns whether the stream is connected; while it is not,
+// callers should refetch after their own writes as before.
+export function useProviderEvents(token: string | null): boolean {
+  const queryClient = useQueryClient();
+  const [connected, setConnected] = useState(false);
+
+  useEffect(() => {
+    if (!token) {
+      return;
+    }
+    const controller = new AbortController();
+    let retryTimer: number | undefined;
+    let attempts = 0;
+    let rotated = false;
+
+    const refetchAll = () =>
+      Promise.all([
+        queryClient.invalidateQueries({ queryKey: ["summary", token] }),
+        queryClient.invalidateQueries({ queryKey: ["providers", token] })
+      ]);
+
+    const onEvent = (event: ProviderStreamEvent) => {
+      if (event.type === "resync") {
+        void refetchAll();
+        return;
+      }
+      if (event.type === "reconnect") {
+        // The server ends streams periodically; reopen without backing off.
+        rotated = true;
+        return;
+      }
+      if (event.type === "ready") {
+        queryClient.setQueryData(["summary", token], event.summary);
+        return;
+      }
+      queryClient.setQueryData(["summary", token], event.summary);
+      const changed = event.provider_ids === null ? null : new Set(event.provider_ids);
+      void queryClient.invalidateQueries({
+        queryKey: ["providers", token],
+        predicate: (query) => {
+          // Imports add rows to every page; unknown changes may touch any page.
+          if (changed === null || event.reason === "import") {
+            return true;
+          }
+          // ["providers", token, page, search, riskFilter]: a risk-filtered
+          // page can gain or lose rows whose risk level changed.
+          if (query.queryKey[4] !== "All") {
+            return true;
+          }
+          const data = query.state.data as ProviderListResponse | undefined;
+          return data === undefined || data.items.some((item) => changed.has(item.id));
+        }
+      });
+    };
+
+    const connect = async () => {
+      try {
+        await streamProviderEvents(
+          token,
+          onEvent,
+          () => {
+            // Changes made while disconnected were not pushed.
+            if (attempts > 0) {
+              void refetchAll();
+            }
+            attempts = 0;
+            setConnected(true);
+          },
+          controller.signal
+        );
+      } catch (error) {
+        if (controller.signal.aborted) {
+          return;
+        }
+        // Expired credentials or a disabled stream will not recover by retrying.
+        if (error instanceof StreamError && [401, 403, 404].includes(error.status)) {
+          setConnected(false);
+          return;
+        }
+      }
+      if (rotated && !controller.signal.aborted) {
+        rotated = false;
+        void connect();
+        return;
+      }
+      setConnected(false);
+      attempts += 1;
+      retryTimer = window.setTimeout(connect, Math.min(MAX_RETRY_MS, 1000 * 2 ** attempts));
+    };
+
+    void connect();
+    return () => {
+      controller.abort();
+      window.clearTimeout(retryTimer);
+      setConnected(false);
+    };
+  }, [queryClient, token]);
+
+  return connected;
+}
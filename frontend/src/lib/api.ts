@@ -1,6 +1,7 @@
 import type {
   ProviderListResponse,
   ProviderRecord,
+  ProviderStreamEvent,
   ProviderSummary,
   RiskLevel,
   User
@@ -131,3 +132,59 @@ export async function downloadProvidersCsv(token: string): Promise<Blob> {
   }
   return response.blob();
 }
+
+export class StreamError extends Error {
+  constructor(readonly status: number) {
+    super(`Event stream failed with status ${status}`);
+  }
+}
+
+// EventSource cannot send an Authorization header, so the server-sent events
+// are read from a fetch body instead. Resolves when the server closes the
+// stream; rejects on HTTP errors and when `signal` aborts.
+export async function streamProviderEvents(
+  token: string,
+  onEvent: (event: ProviderStreamEvent) => void,
+  onOpen: () => void,
+  signal: AbortSignal
+): Promise<void> {
+  const response = await fetch(`${API_BASE_URL}/providers/events`, {
+    headers: { Accept: "text/event-stream", Authorization: `Bearer ${token}` },
+    signal
+  });
+  if (!response.ok || !response.body) {
+    throw new StreamError(response.status);
+  }
+  onOpen();
+
+  const reader = response.body.pipeThrough(new TextDecoderStream()).getReader();
+  let buffer = "";
+  for (;;) {
+    const { value, done } = await reader.read();
+    if (done) {
+      return;
+    }
+    buffer += value;
+    let boundary = buffer.indexOf("\n\n");
+    while (boundary !== -1) {
+      const block = buffer.slice(0, boundary);
+      buffer = buffer.slice(boundary + 2);
+      boundary = buffer.indexOf("\n\n");
+
+      let type = "message";
+      const data: string[] = [];
+      for (const line of block.split("\n")) {
+        if (line.startsWith("event:")) {
+          type = line.slice(6).trim();
+        } else if (line.startsWith("data:")) {
+          data.push(line.slice(5).trimStart());
+        }
+      }
+      if ((type === "providers" || type === "ready") && data.length > 0) {
+        onEvent({ type, ...JSON.parse(data.join("\n")) });
+      } else if (type === "resync" || type === "reconnect") {
+        onEvent({ type });
+      }
+    }
+  }
+}
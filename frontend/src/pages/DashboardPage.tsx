@@ -3,6 +3,7 @@ import { useMutation, useQuery, useQueryClient } from "@tanstack/react-query";
 import { KpiCard } from "../components/KpiCard";
 import { ProviderTable } from "../components/ProviderTable";
 import { useAuth } from "../hooks/useAuth";
+import { useProviderEvents } from "../hooks/useProviderEvents";
 import {
   downloadProvidersCsv,
   fetchProviderSummary,
@@ -22,6 +23,7 @@ export function DashboardPage(): JSX.Element {
   const [riskFilter, setRiskFilter] = useState<RiskLevel | "All">("All");
   const [page, setPage] = useState(1);
   const [flash, setFlash] = useState<string | null>(null);
+  const liveUpdates = useProviderEvents(token);
 
   const summaryQuery = useQuery({
     queryKey: ["summary", token],
@@ -42,6 +44,10 @@ export function DashboardPage(): JSX.Element {
   });
 
   const refreshData = async () => {
+    // Connected dashboards are updated by the change stream instead.
+    if (liveUpdates) {
+      return;
+    }
     await Promise.all([
       queryClient.invalidateQueries({ queryKey: ["summary", token] }),
       queryClient.invalidateQueries({ queryKey: ["providers", token] })
@@ -118,7 +124,10 @@ export function DashboardPage(): JSX.Element {
         <div>
           <p className="eyebrow">Operations Console</p>
           <h1>Provider Validation Pipeline</h1>
-          <p className="muted">Signed in as {user?.email}</p>
+          <p className="muted">
+            Signed in as {user?.email}
+            {liveUpdates ? " · Live updates" : ""}
+          </p>
         </div>
         <div className="header-actions">
           <label className="btn btn-ghost file-upload">
@@ -16,11 +16,15 @@ export type ProviderRecord = {
   npi: string | null;
   phone: string | null;
   address: string | null;
+  city: string | null;
+  state: string | null;
+  zip_code: string | null;
   risk_level: RiskLevel;
   validation_status: ValidationStatus;
   confidence_score: number;
   primary_issue: string | null;
   source_file: string | null;
+  duplicate_cluster_id: string | null;
   created_at: string;
   updated_at: string;
 };
@@ -33,6 +37,21 @@ export type ProviderSummary = {
   requires_review: number;
 };
 
+export type ProviderChangeEvent = {
+  type: "providers";
+  reason: "import" | "validate" | "validate_all" | "status";
+  provider_ids: string[] | null;
+  summary: ProviderSummary;
+  delta: ProviderSummary;
+  at: number;
+};
+
+export type ProviderStreamEvent =
+  | ProviderChangeEvent
+  | { type: "ready"; summary: ProviderSummary }
+  | { type: "resync" }
+  | { type: "reconnect" };
+
 export type ProviderListResponse = {
   items: ProviderRecord[];
   total: number;